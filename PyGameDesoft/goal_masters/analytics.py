@@ -0,0 +1,293 @@
+"""
+Goal Masters - Per-shot analytics database.
+
+Every kick is recorded (character, placement, aim, contact offsets, power, outcome,
+coins and goal-line crossing point) into an embedded SQLite database. Game code only
+appends to an in-memory queue; a writer thread inserts the queued shots in batched
+transactions, so the frame loop never waits on the disk.
+
+Aggregates are kept incrementally in a small `shot_stats` table (one row per
+character and distance band), so leaderboards, conversion by distance and
+per-character stats stay in the millisecond range however many shots are stored.
+
+Usage (from the PyGameDesoft directory):
+    python -m goal_masters.analytics shots.db
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+
+BATCH_SIZE = 256       # Shots per insert transaction (at most)
+FLUSH_INTERVAL = 1.0   # Seconds a queued shot may wait before being written
+
+# Outcomes of a kick
+OUTCOME_GOAL = "goal"
+OUTCOME_SAVE = "save"
+OUTCOME_MISS = "miss"    # Crossed the goal line outside the goal
+OUTCOME_SHORT = "short"  # Reset before reaching the goal line (stopped, deflected away...)
+
+# Distance bands match the coin rewards in Game.update(): kicks from beyond
+# Y=40m pay 40 coins, beyond Y=30m pay 20, anything else pays 10.
+DISTANCE_BANDS = ((40.0, 40), (30.0, 20))
+DEFAULT_DISTANCE_BAND = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shots (
+    id            INTEGER PRIMARY KEY,
+    recorded_at   REAL NOT NULL,
+    character     TEXT NOT NULL,
+    ball_x        REAL NOT NULL,
+    ball_y        REAL NOT NULL,
+    aim_deg       REAL NOT NULL,
+    contact_x     REAL NOT NULL,
+    contact_z     REAL NOT NULL,
+    power         REAL NOT NULL,
+    outcome       TEXT NOT NULL,
+    coins         INTEGER NOT NULL,
+    cross_x       REAL,
+    cross_z       REAL,
+    distance_band INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_shots_character ON shots (character, outcome);
+CREATE INDEX IF NOT EXISTS idx_shots_outcome ON shots (outcome, ball_y);
+CREATE INDEX IF NOT EXISTS idx_shots_distance_band ON shots (distance_band, outcome);
+
+CREATE TABLE IF NOT EXISTS shot_stats (
+    character     TEXT NOT NULL,
+    distance_band INTEGER NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    goals         INTEGER NOT NULL DEFAULT 0,
+    saves         INTEGER NOT NULL DEFAULT 0,
+    misses        INTEGER NOT NULL DEFAULT 0,
+    coins         INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (character, distance_band)
+);
+"""
+
+INSERT_SHOT = """
+INSERT INTO shots (recorded_at, character, ball_x, ball_y, aim_deg, contact_x, contact_z,
+                   power, outcome, coins, cross_x, cross_z, distance_band)
+VALUES (:recorded_at, :character, :ball_x, :ball_y, :aim_deg, :contact_x, :contact_z,
+        :power, :outcome, :coins, :cross_x, :cross_z, :distance_band)
+"""
+
+UPSERT_STATS = """
+INSERT INTO shot_stats (character, distance_band, attempts, goals, saves, misses, coins)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (character, distance_band) DO UPDATE SET
+    attempts = attempts + excluded.attempts,
+    goals = goals + excluded.goals,
+    saves = saves + excluded.saves,
+    misses = misses + excluded.misses,
+    coins = coins + excluded.coins
+"""
+
+
+def distance_band(kick_y):
+    """Returns the coin band (10, 20 or 40) of a kick taken from world Y = kick_y."""
+    for min_y, band in DISTANCE_BANDS:
+        if kick_y > min_y:
+            return band
+    return DEFAULT_DISTANCE_BAND
+
+
+class ShotAnalytics:
+    def __init__(self, db_path, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.pending = []
+        self.queued_count = 0    # Shots handed to record_shot()
+        self.written_count = 0   # Shots committed to the database
+        self.dropped_count = 0   # Shots lost to a failed insert transaction
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.flushed = threading.Condition(self.lock)
+        self.flush_requested = False
+        self.closing = False
+
+        # Schema is created up front so queries work before the first write
+        connection = self._connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        # Read connection for the query API (WAL lets it read while the writer commits)
+        self.reader = self._connect(check_same_thread=False)
+        self.reader_lock = threading.Lock()
+
+        self.writer = threading.Thread(target=self._writer_loop, name="ShotAnalyticsWriter", daemon=True)
+        self.writer.start()
+
+    def _connect(self, check_same_thread=True):
+        connection = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # ----- Recording (called from the frame loop) -----
+
+    def record_shot(self, character, ball_x, ball_y, aim_deg, contact_x, contact_z, power,
+                    outcome, coins=0, cross_x=None, cross_z=None):
+        """Queues one shot for insertion. Never touches the disk."""
+        shot = {
+            'recorded_at': time.time(),
+            'character': character,
+            'ball_x': ball_x,
+            'ball_y': ball_y,
+            'aim_deg': aim_deg,
+            'contact_x': contact_x,
+            'contact_z': contact_z,
+            'power': power,
+            'outcome': outcome,
+            'coins': coins,
+            'cross_x': cross_x,
+            'cross_z': cross_z,
+            'distance_band': distance_band(ball_y),
+        }
+        with self.lock:
+            self.pending.append(shot)
+            self.queued_count += 1
+            if len(self.pending) >= self.batch_size:
+                self.wakeup.notify()
+
+    def flush(self, timeout=None):
+        """
+        Blocks until every shot queued so far is committed or dropped. Returns True only if
+        they were all committed (False on timeout or if a batch failed meanwhile).
+        """
+        with self.lock:
+            target = self.queued_count
+            dropped_before = self.dropped_count
+            self.flush_requested = True
+            self.wakeup.notify()
+            done = self.flushed.wait_for(lambda: self.written_count + self.dropped_count >= target, timeout)
+            return done and self.dropped_count == dropped_before
+
+    def close(self):
+        """Writes the remaining shots and closes the database."""
+        with self.lock:
+            if self.closing:
+                return
+            self.closing = True
+            self.wakeup.notify()
+        self.writer.join()
+        with self.reader_lock:
+            self.reader.close()
+        if self.dropped_count:
+            print(f"ShotAnalytics: {self.dropped_count} shot(s) could not be written")
+        print("ShotAnalytics: Closed")
+
+    # ----- Writer thread -----
+
+    def _writer_loop(self):
+        connection = self._connect()
+        while True:
+            with self.lock:
+                self.wakeup.wait_for(
+                    lambda: self.closing or self.flush_requested or len(self.pending) >= self.batch_size,
+                    self.flush_interval)
+                self.flush_requested = False
+                batch = self.pending[:self.batch_size]
+                del self.pending[:self.batch_size]
+                more = bool(self.pending)
+                closing = self.closing
+            if batch:
+                self._write_batch(connection, batch)
+                if more:
+                    with self.lock:
+                        self.flush_requested = True  # Drain the backlog without waiting
+            if closing and not batch:
+                break
+        connection.close()
+
+    def _write_batch(self, connection, batch):
+        # Fold the batch into per-(character, band) deltas for the summary table
+        deltas = {}
+        for shot in batch:
+            key = (shot['character'], shot['distance_band'])
+            delta = deltas.setdefault(key, [0, 0, 0, 0, 0])
+            delta[0] += 1
+            delta[1] += shot['outcome'] == OUTCOME_GOAL
+            delta[2] += shot['outcome'] == OUTCOME_SAVE
+            delta[3] += shot['outcome'] == OUTCOME_MISS
+            delta[4] += shot['coins']
+        try:
+            with connection:  # One transaction per batch
+                connection.executemany(INSERT_SHOT, batch)
+                connection.executemany(UPSERT_STATS, [key + tuple(delta) for key, delta in deltas.items()])
+        except sqlite3.Error as e:
+            print(f"ShotAnalytics: Failed to write {len(batch)} shot(s): {e}")
+            with self.lock:
+                self.dropped_count += len(batch)
+                self.flushed.notify_all()
+            return
+        with self.lock:
+            self.written_count += len(batch)
+            self.flushed.notify_all()
+
+    # ----- Queries -----
+
+    def _query(self, sql, params=()):
+        with self.reader_lock:
+            return self.reader.execute(sql, params).fetchall()
+
+    def leaderboard(self, limit=10):
+        """Characters ranked by goals scored: list of dicts with goals, attempts, coins and conversion."""
+        rows = self._query("""
+            SELECT character, SUM(goals) AS goals, SUM(attempts) AS attempts, SUM(coins) AS coins
+            FROM shot_stats GROUP BY character
+            ORDER BY goals DESC, coins DESC LIMIT ?""", (limit,))
+        return [{'character': character, 'goals': goals, 'attempts': attempts, 'coins': coins,
+                 'conversion': goals / attempts if attempts else 0.0}
+                for character, goals, attempts, coins in rows]
+
+    def longest_goals(self, limit=10):
+        """The goals scored from furthest out (uses the outcome/ball_y index)."""
+        rows = self._query("""
+            SELECT character, ball_x, ball_y, aim_deg, power, coins, recorded_at
+            FROM shots WHERE outcome = ? ORDER BY ball_y DESC LIMIT ?""", (OUTCOME_GOAL, limit))
+        return [{'character': row[0], 'ball_x': row[1], 'ball_y': row[2], 'aim_deg': row[3],
+                 'power': row[4], 'coins': row[5], 'recorded_at': row[6]} for row in rows]
+
+    def conversion_by_distance(self, character=None):
+        """Goals/attempts per distance band (10, 20 and 40 coin bands), optionally for one character."""
+        sql = "SELECT distance_band, SUM(attempts), SUM(goals) FROM shot_stats"
+        params = ()
+        if character is not None:
+            sql += " WHERE character = ?"
+            params = (character,)
+        sql += " GROUP BY distance_band ORDER BY distance_band"
+        return [{'distance_band': band, 'attempts': attempts, 'goals': goals,
+                 'conversion': goals / attempts if attempts else 0.0}
+                for band, attempts, goals in self._query(sql, params)]
+
+    def character_stats(self, character):
+        """Totals for one character: attempts, goals, saves, misses, coins and conversion."""
+        row = self._query("""
+            SELECT SUM(attempts), SUM(goals), SUM(saves), SUM(misses), SUM(coins)
+            FROM shot_stats WHERE character = ?""", (character,))[0]
+        attempts, goals, saves, misses, coins = (value or 0 for value in row)
+        return {'character': character, 'attempts': attempts, 'goals': goals, 'saves': saves,
+                'misses': misses, 'coins': coins,
+                'conversion': goals / attempts if attempts else 0.0}
+
+
+if __name__ == '__main__':
+    # Prints a short report for an existing database, e.g. `python -m goal_masters.analytics shots.db`
+    db_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "..", "shots.db")
+    analytics = ShotAnalytics(db_path)
+    start = time.perf_counter()
+    print("Leaderboard:")
+    for entry in analytics.leaderboard():
+        print(f"  {entry['character']:<22} goals={entry['goals']:<6} attempts={entry['attempts']:<6} "
+              f"coins={entry['coins']:<7} conversion={entry['conversion']:.1%}")
+    print("Conversion by distance band:")
+    for entry in analytics.conversion_by_distance():
+        print(f"  {entry['distance_band']:>2} coins: {entry['goals']}/{entry['attempts']} ({entry['conversion']:.1%})")
+    print(f"Queries took {(time.perf_counter() - start) * 1000:.2f} ms")
+    analytics.close()
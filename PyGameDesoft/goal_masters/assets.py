@@ -0,0 +1,53 @@
+"""
+Goal Masters - Shared image and sound assets.
+
+Every Game started from the menu used to load the crowd panorama (18 MB
+decoded), the goalkeeper sprite and both sounds again. These loaders decode
+each file once per process and hand every caller the same object, registered
+with the memory registry under the "assets" owner. Callers must treat the
+returned surfaces as read-only (blit or scale them, never draw on them).
+"""
+
+import os
+import pygame
+from .memory_registry import memory_registry
+from .metrics import CacheCounter, frame_metrics
+
+_images = {}  # (path, convert_alpha) -> Surface
+_sounds = {}  # path -> Sound
+image_stats = frame_metrics.register_cache("images", CacheCounter())
+sound_stats = frame_metrics.register_cache("sounds", CacheCounter())
+
+
+def load_image(path, convert_alpha=False):
+    """
+    The decoded image at `path`, loaded on first use. convert_alpha converts it to the
+    display format when a video mode is set (the converted copy is cached separately).
+    Raises pygame.error / FileNotFoundError like pygame.image.load.
+    """
+    path = os.path.normpath(path)
+    convert_alpha = convert_alpha and pygame.display.get_surface() is not None
+    key = (path, convert_alpha)
+    image = _images.get(key)
+    if image is not None:
+        image_stats.hit_count += 1
+    else:
+        image_stats.load_count += 1
+        image = pygame.image.load(path)
+        if convert_alpha:
+            image = image.convert_alpha()
+        _images[key] = memory_registry.track(image, "assets", os.path.basename(path))
+    return image
+
+
+def load_sound(path):
+    """The mixer Sound for `path`, loaded on first use. Raises pygame.error like pygame.mixer.Sound."""
+    path = os.path.normpath(path)
+    sound = _sounds.get(path)
+    if sound is not None:
+        sound_stats.hit_count += 1
+    else:
+        sound_stats.load_count += 1
+        sound = _sounds[path] = memory_registry.track(pygame.mixer.Sound(path), "assets", os.path.basename(path))
+    return sound
+
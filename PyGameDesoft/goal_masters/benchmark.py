@@ -0,0 +1,419 @@
+"""
+Goal Masters - Headless benchmark suite.
+
+Runs the hot paths of the game under SDL's dummy video driver and reports
+throughput (operations per second). Results can be saved as a JSON baseline
+and later runs compared against it to flag regressions.
+
+Usage (from the PyGameDesoft directory):
+    python -m goal_masters.benchmark                     # run and print results
+    python -m goal_masters.benchmark --save              # run and write the baseline
+    python -m goal_masters.benchmark --compare           # run and compare with the baseline
+    python -m goal_masters.benchmark --compare --threshold 0.15 --only ball_update
+    python -m goal_masters.benchmark --allocations --only ball_update  # also memory allocated per operation
+"""
+
+import os
+
+# The dummy drivers must be selected before pygame initialises the display/audio.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from . import constants
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.10  # A result more than 10% slower than the baseline is a regression
+DEFAULT_DURATION = 0.5    # Seconds per measurement round
+DEFAULT_ROUNDS = 5        # Measurement rounds per benchmark (the best round is kept)
+ALLOCATION_SAMPLES = 2000 # Operations traced when measuring allocations
+
+SIMULATION_DT = 1.0 / 60.0
+
+# name -> (setup function, unit). A setup function returns a zero-argument callable
+# that performs exactly one operation of the benchmark.
+BENCHMARKS = {}
+
+
+def benchmark(name, unit):
+    """Registers a benchmark setup function under `name`."""
+    def decorator(setup):
+        BENCHMARKS[name] = (setup, unit)
+        return setup
+    return decorator
+
+
+@benchmark("camera_world_to_screen", unit="calls")
+def setup_camera_world_to_screen():
+    from .camera import Camera
+    camera = Camera()
+    # A spread of points covering the pitch, the goal frame and the crowd plane
+    points = [(x, y, z) for x in (-20.0, -4.0, 0.0, 4.0, 20.0)
+              for y in (-5.0, 0.0, 16.5, 30.0, 45.0)
+              for z in (0.0, constants.BALL_RADIUS, constants.CROSSBAR_Z)]
+    point_count = len(points)
+    index = [0]
+
+    def step():
+        i = index[0]
+        camera.world_to_screen(*points[i])
+        index[0] = (i + 1) % point_count
+    return step
+
+
+@benchmark("camera_screen_to_world_on_ground", unit="calls")
+def setup_camera_screen_to_world():
+    from .camera import Camera
+    camera = Camera()
+    points = [(x, y) for x in range(0, constants.SCREEN_WIDTH, 160)
+              for y in range(0, constants.SCREEN_HEIGHT, 90)]
+    point_count = len(points)
+    index = [0]
+
+    def step():
+        i = index[0]
+        camera.screen_to_world_on_ground(*points[i])
+        index[0] = (i + 1) % point_count
+    return step
+
+
+@benchmark("ball_update", unit="steps")
+def setup_ball_update():
+    from .entities.ball import Ball
+    ball = Ball()
+
+    def kick():
+        ball.spawn()
+        ball.kick(power_fraction=0.5, horizontal_aim_deg=5.0,
+                  pointer_x_offset=0.05, pointer_z_offset=-0.03)
+
+    kick()
+
+    def step():
+        ball.update(SIMULATION_DT)
+        # Re-kick once the ball has stopped or left the pitch so every step does real work
+        if not ball.is_kicked or ball.world_pos.y < -10:
+            kick()
+    return step
+
+
+@benchmark("goalkeeper_update_check_save", unit="steps")
+def setup_goalkeeper_update():
+    from .entities.ball import Ball
+    from .entities.goalkeeper import Goalkeeper
+    ball = Ball()
+    goalkeeper = Goalkeeper()
+    # Ball arriving at the goal line, so check_save runs its full rectangle test
+    ball.world_pos.xyz = (1.5, 0.3, 1.0)
+    ball.velocity.xyz = (2.0, -20.0, 0.5)
+    ball.is_kicked = True
+
+    def step():
+        goalkeeper.update(SIMULATION_DT, ball)
+        goalkeeper.check_save(ball)
+    return step
+
+
+@benchmark("game_render", unit="frames")
+def setup_game_render():
+    from .main import Game
+    game = Game()
+    game.game_state = "ready_to_kick"
+    game.aim_angle = 6.0
+    game.kick_angle_rad = math.radians(game.aim_angle)
+
+    def step():
+        game.render()
+    return step
+
+
+@benchmark("game_render_half_scale", unit="frames")
+def setup_game_render_half_scale():
+    from .main import Game
+    game = Game()
+    game.game_state = "ready_to_kick"
+    game.render_target.scale = 0.5 # World at 640x360, upscaled once; HUD at native resolution
+
+    def step():
+        game.render()
+    return step
+
+
+@benchmark("game_render_moving_camera", unit="frames")
+def setup_game_render_moving_camera():
+    from .main import Game
+    game = Game()
+    game.game_state = "ready_to_kick"
+    base_x, base_y, base_z = game.camera.base_position
+    # A new camera pose every frame, as while the follow camera tracks a kick
+    poses = [(base_x + 0.05 * i, base_y - 0.2 * i, base_z) for i in range(120)]
+    index = [0]
+
+    def step():
+        i = index[0]
+        game.camera.set_pose(*poses[i])
+        game.render()
+        index[0] = (i + 1) % len(poses)
+    return step
+
+
+@benchmark("game_render_placing_ball", unit="frames")
+def setup_game_render_placing_ball():
+    from .main import Game
+    game = Game()
+    # Mouse over the pitch, so the semi-transparent placement preview ball is drawn
+    game.mouse_pos = game.camera.world_to_screen(2.0, 25.0, constants.BALL_RADIUS)
+
+    def step():
+        game.render()
+    return step
+
+
+@benchmark("hud_widgets_draw", unit="frames")
+def setup_hud_widgets_draw():
+    from .ui.powerbar import PowerBar
+    from .ui.contact_selector import ContactSelector
+    screen = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
+    power_bar = PowerBar(540, 670, 200, 30)
+    contact_selector = ContactSelector(1210, 70, 50, constants.BALL_RADIUS)
+    # A one-second charge at 60 fps followed by a second at full charge: the bar
+    # changes on every charging frame and stays the same while it is full
+    frame_times = [i / 60.0 for i in range(120)]
+    index = [0]
+
+    def step():
+        i = index[0]
+        if i == 0:
+            power_bar.reset()
+            power_bar.start_charging(0.0)
+        power_bar.update(frame_times[i])
+        contact_selector.draw(screen)
+        power_bar.draw(screen)
+        index[0] = (i + 1) % len(frame_times)
+    return step
+
+
+@benchmark("perspective_background_bake", unit="bakes")
+def setup_perspective_background_bake():
+    from .camera import Camera
+    from .perspective import PerspectiveBackground
+    camera = Camera()
+    background = PerspectiveBackground(pygame.Surface((400, 100)))
+    size = (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+
+    def step():
+        background.bake(camera, size) # Uncached: the cost paid once per camera change
+    return step
+
+
+@benchmark("trajectory_preview_rebuild", unit="rebuilds")
+def setup_trajectory_preview():
+    from .camera import Camera
+    from .entities.ball import Ball
+    from .ui.trajectory_preview import TrajectoryPreview
+    camera = Camera()
+    ball = Ball()
+    preview = TrajectoryPreview(ball)
+    # A new aim angle every call, so every step misses the cache and recomputes the path
+    aims = [-10.0 + 0.5 * i for i in range(41)]
+    index = [0]
+
+    def step():
+        i = index[0]
+        preview.update(camera, 0.75, aims[i], -0.05, -0.06)
+        index[0] = (i + 1) % len(aims)
+    return step
+
+
+@benchmark("barrage_frame_200_balls", unit="frames")
+def setup_barrage_frame():
+    from .main import Game
+    from .entities.ball_store import BallStore
+    game = Game()
+    game.barrage = BallStore(200, seed=1234)
+    game.game_state = "barrage"
+
+    def step():
+        game.update(SIMULATION_DT)
+        game.render()
+    return step
+
+
+@benchmark("menu_frame", unit="frames")
+def setup_menu_frame():
+    # The menu module lives next to the goal_masters package
+    menu_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if menu_dir not in sys.path:
+        sys.path.insert(0, menu_dir)
+    import imagem_inicial
+
+    def step():
+        imagem_inicial.draw_main_menu(imagem_inicial.window)
+        pygame.display.update()
+    return step
+
+
+def measure(step, duration, rounds):
+    """Returns the best operations-per-second rate over `rounds` rounds of `duration` seconds."""
+    step()  # Warm-up call (lazy imports, first-use caches)
+    best_rate = 0.0
+    for _ in range(rounds):
+        operations = 0
+        start = time.perf_counter()
+        deadline = start + duration
+        now = start
+        while now < deadline:
+            # Run in small batches so reading the clock does not dominate cheap operations
+            for _ in range(32):
+                step()
+            operations += 32
+            now = time.perf_counter()
+        best_rate = max(best_rate, operations / (now - start))
+    return best_rate
+
+
+def measure_allocations(step, samples=ALLOCATION_SAMPLES):
+    """
+    Traces `samples` operations with tracemalloc and returns (temporary bytes, retained
+    bytes) per operation. Temporary bytes are the peak memory above the starting point
+    during each operation: zero for an allocation-free step (Python floats come from a
+    free list and do not count), and the size of e.g. a Vector3 for a step that builds one.
+    """
+    step()  # Warm-up call, outside the trace
+    tracemalloc.start()
+    try:
+        temporary = 0
+        start_current = tracemalloc.get_traced_memory()[0]
+        for _ in range(samples):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            step()
+            temporary += tracemalloc.get_traced_memory()[1] - before
+        retained = tracemalloc.get_traced_memory()[0] - start_current
+    finally:
+        tracemalloc.stop()
+    return temporary / samples, retained / samples
+
+
+def run_benchmarks(names=None, duration=DEFAULT_DURATION, rounds=DEFAULT_ROUNDS, seed=1234, allocations=False):
+    """
+    Runs the selected benchmarks (all by default) and returns a results document.
+    allocations: also trace the memory each operation allocates (a separate, slower pass).
+    """
+    pygame.init()
+    selected = names or list(BENCHMARKS)
+    results = {}
+    for name in selected:
+        setup, unit = BENCHMARKS[name]
+        random.seed(seed)  # Ball knuckleball uses `random`; keep runs comparable
+        # The game prints a lot of state changes; keep them out of the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            step = setup()
+            rate = measure(step, duration, rounds)
+            if allocations:
+                temporary, retained = measure_allocations(step)
+        results[name] = {"ops_per_sec": rate, "unit": unit}
+        line = f"{name:<36} {rate:>14,.1f} {unit}/s"
+        if allocations:
+            results[name].update(temporary_bytes_per_op=temporary, retained_bytes_per_op=retained)
+            line += f"   {temporary:>10,.1f} B temporary, {retained:>8,.1f} B retained per op"
+        print(line)
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "duration": duration,
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def save_baseline(document, path):
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"Baseline written to {path}")
+
+
+def load_baseline(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares two results documents. Returns a list of regressed benchmark names.
+    A benchmark regresses when its rate falls below baseline * (1 - threshold).
+    """
+    regressions = []
+    print(f"\n{'benchmark':<36} {'baseline':>14} {'current':>14} {'change':>9}")
+    for name, current_entry in current["results"].items():
+        baseline_entry = baseline.get("results", {}).get(name)
+        if baseline_entry is None:
+            print(f"{name:<36} {'-':>14} {current_entry['ops_per_sec']:>14,.1f} {'new':>9}")
+            continue
+        old_rate = baseline_entry["ops_per_sec"]
+        new_rate = current_entry["ops_per_sec"]
+        change = (new_rate - old_rate) / old_rate if old_rate else 0.0
+        if new_rate < old_rate * (1.0 - threshold):
+            status = "REGRESSION"
+            regressions.append(name)
+        elif new_rate > old_rate * (1.0 + threshold):
+            status = "faster"
+        else:
+            status = ""
+        print(f"{name:<36} {old_rate:>14,.1f} {new_rate:>14,.1f} {change:>+8.1%} {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Goal Masters headless benchmark suite")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Path of the JSON baseline file")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare the results with the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression (default 0.10)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="Seconds per measurement round")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Measurement rounds per benchmark")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--allocations", action="store_true",
+                        help="Also report the memory allocated per operation (traced with tracemalloc)")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.only, duration=args.duration, rounds=args.rounds, allocations=args.allocations)
+
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"Error: baseline file {args.baseline} not found. Run with --save first.")
+            exit_code = 2
+        else:
+            regressions = compare_results(current, load_baseline(args.baseline), args.threshold)
+            if regressions:
+                print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+                exit_code = 1
+            else:
+                print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    if args.save:
+        save_baseline(current, args.baseline)
+
+    pygame.quit()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
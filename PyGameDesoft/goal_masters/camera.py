@@ -2,9 +2,18 @@ from . import constants
 import math
 from .config import config_manager
 
+try:
+    import numpy as np # Only needed for batched projection (world_to_screen_many)
+except ImportError:
+    np = None
+
 # Minimum effective depth for perspective scaling to avoid division by zero or extreme scaling.
 MIN_PERSPECTIVE_DEPTH = 0.1  # metres (reduced from 1.0 for closer interaction, must be > 0)
 
+# Settings that affect the projection; the camera only recomputes when one of these changes
+CAMERA_SETTING_KEYS = ('camera_position_x', 'camera_position_y', 'camera_height',
+                       'camera_fov_degrees', 'camera_downlook_degrees')
+
 class Camera:
     def __init__(self):
         # These will serve as defaults if config is missing specific entries
@@ -18,8 +27,26 @@ class Camera:
         self.downlook_radians = 0.0
         self.cos_downlook = 1.0
         self.sin_downlook = 0.0
+        # Incremented whenever the projection changes, so cached layers know when to rebuild
+        self.version = 0
+        # Size of the surface the camera projects onto (the world render target, see RenderTarget)
+        self.viewport_width = constants.SCREEN_WIDTH
+        self.viewport_height = constants.SCREEN_HEIGHT
         
         self.reload_config() # Load initial configuration values
+        config_manager.subscribe(self.on_config_changed, CAMERA_SETTING_KEYS)
+
+    def set_viewport(self, width, height):
+        """Projects onto a width x height surface; the focal length follows the width."""
+        self.viewport_width = width
+        self.viewport_height = height
+        self.update_focal_length()
+        self.version += 1
+
+    def on_config_changed(self, changed_keys):
+        """Config hot reload: called only when camera settings changed."""
+        print(f"Camera settings changed: {sorted(changed_keys)}")
+        self.reload_config()
 
     def reload_config(self):
         """Reloads camera parameters from the configuration manager."""
@@ -35,6 +62,7 @@ class Camera:
         configured_height = config_manager.get_setting('camera_height', default=cam_height_default)
         
         self.position = [configured_pos_x, configured_pos_y, configured_height]
+        self.base_position = list(self.position) # The configured view; the follow camera eases back to it
 
         self.camera_fov_degrees = config_manager.get_setting('camera_fov_degrees', default=fov_default)
         
@@ -45,22 +73,49 @@ class Camera:
             print(f"Warning: camera_fov_degrees {self.camera_fov_degrees} out of range, clamped to {safe_fov_degrees}.")
             self.camera_fov_degrees = safe_fov_degrees
             
-        fov_radians = math.radians(self.camera_fov_degrees)
-        
-        # Calculate focal length in pixels based on FOV and screen width
-        # focal_length = (screenWidth / 2) / tan(FOV / 2)
-        if math.tan(fov_radians / 2) == 0: # Should be caught by FOV clamping
-            self.focal_length_pixels = float('inf') 
-        else:
-            self.focal_length_pixels = (constants.SCREEN_WIDTH / 2) / math.tan(fov_radians / 2)
+        self.update_focal_length()
         
         self.downlook_degrees = config_manager.get_setting('camera_downlook_degrees', default=downlook_default)
+        self.base_downlook_degrees = self.downlook_degrees
         self.downlook_radians = math.radians(self.downlook_degrees)
         self.cos_downlook = math.cos(self.downlook_radians)
         self.sin_downlook = math.sin(self.downlook_radians)
+        self.version += 1
         
         print(f"Camera config loaded/reloaded: Position={self.position}, FOV={self.camera_fov_degrees}deg, Downlook={self.downlook_degrees}deg, FocalLengthPixels={self.focal_length_pixels:.2f}px")
 
+    def set_pose(self, x, y, z, downlook_degrees=None):
+        """
+        Moves the camera without touching the configured view (see FollowCamera). Only
+        what changed is recomputed: the downlook trigonometry only when a new angle is
+        given, the focal length never. Returns True if the camera actually moved.
+        """
+        moved = False
+        if downlook_degrees is not None and downlook_degrees != self.downlook_degrees:
+            self.downlook_degrees = downlook_degrees
+            self.downlook_radians = math.radians(downlook_degrees)
+            self.cos_downlook = math.cos(self.downlook_radians)
+            self.sin_downlook = math.sin(self.downlook_radians)
+            moved = True
+        if self.position[0] != x or self.position[1] != y or self.position[2] != z:
+            self.position[0] = x
+            self.position[1] = y
+            self.position[2] = z
+            moved = True
+        if moved:
+            self.version += 1
+        return moved
+
+    def update_focal_length(self):
+        fov_radians = math.radians(self.camera_fov_degrees)
+        
+        # Calculate focal length in pixels based on FOV and viewport width
+        # focal_length = (viewportWidth / 2) / tan(FOV / 2)
+        if math.tan(fov_radians / 2) == 0: # Should be caught by FOV clamping
+            self.focal_length_pixels = float('inf') 
+        else:
+            self.focal_length_pixels = (self.viewport_width / 2) / math.tan(fov_radians / 2)
+
     def _get_view_space_coords(self, world_x, world_y, world_z):
         """Transforms world coords to camera view space and calculates depth."""
         rel_x = world_x - self.position[0]
@@ -99,11 +154,35 @@ class Camera:
         screen_x_displace = view_x * self.focal_length_pixels / depth
         screen_y_displace = view_y * self.focal_length_pixels / depth 
 
-        screen_x = constants.SCREEN_WIDTH / 2 + screen_x_displace
-        screen_y = constants.SCREEN_HEIGHT / 2 - screen_y_displace # Positive view_y is up
+        screen_x = self.viewport_width / 2 + screen_x_displace
+        screen_y = self.viewport_height / 2 - screen_y_displace # Positive view_y is up
 
         return round(screen_x), round(screen_y)
 
+    def world_to_screen_many(self, world_points):
+        """
+        Batched world_to_screen for an (N, 3) NumPy array of world points.
+        Returns (screen_xy, depth): an (N, 2) int array of screen positions and the (N,) view depths.
+        Points with depth < MIN_PERSPECTIVE_DEPTH get (-9999, -9999), like world_to_screen.
+        """
+        rel = world_points - np.asarray(self.position, dtype=float)
+        depth = rel[:, 1] * (-self.cos_downlook) + rel[:, 2] * (-self.sin_downlook)
+        view_y = rel[:, 1] * self.sin_downlook + rel[:, 2] * self.cos_downlook
+        visible = depth >= MIN_PERSPECTIVE_DEPTH
+        scale = np.divide(self.focal_length_pixels, depth, out=np.zeros_like(depth), where=visible)
+
+        screen_xy = np.full((len(world_points), 2), -9999, dtype=int)
+        screen_xy[visible, 0] = np.round(self.viewport_width / 2 + rel[visible, 0] * scale[visible])
+        screen_xy[visible, 1] = np.round(self.viewport_height / 2 - view_y[visible] * scale[visible])
+        return screen_xy, depth
+
+    def world_to_screen_list(self, world_points):
+        """world_to_screen() for a sequence of (x, y, z) points, batched through NumPy when it is installed."""
+        if np is None:
+            return [self.world_to_screen(*point) for point in world_points]
+        screen_xy, _depth = self.world_to_screen_many(np.asarray(world_points, dtype=float))
+        return [tuple(point) for point in screen_xy.tolist()]
+
     def get_sprite_display_size(self, base_width, base_height, world_x, world_y, world_z):
         """
         Calculates the display size (width, height) of a sprite based on its world Y-coordinate.
@@ -137,8 +216,8 @@ class Camera:
         # Screen-derived terms (normalized and scaled by focal length)
         # S_x = (screen_x_displace) / focal_length
         # S_y = (screen_y_displace) / focal_length
-        s_x_f = (screen_x - constants.SCREEN_WIDTH / 2) / self.focal_length_pixels
-        s_y_f = (constants.SCREEN_HEIGHT / 2 - screen_y) / self.focal_length_pixels # screen_y_displace for world_to_screen
+        s_x_f = (screen_x - self.viewport_width / 2) / self.focal_length_pixels
+        s_y_f = (self.viewport_height / 2 - screen_y) / self.focal_length_pixels # screen_y_displace for world_to_screen
 
         # Relative Z of ground to camera
         g_z_rel = ground_z - self.position[2]
@@ -0,0 +1,151 @@
+"""
+Goal Masters - Live frame capture.
+
+The frame loop only copies the finished frame into a bounded in-memory queue
+(pygame.image.tobytes); a background thread compresses each frame to PNG (zlib
+releases the GIL while it works) and writes it to disk, so capture never makes the
+game wait on compression or file I/O. When the queue is full, frames are dropped
+and counted instead of stalling the frame.
+
+Frames are grouped into clips (e.g. one per goal): <out_dir>/clip_NNNN/frame_NNNNN.png.
+"""
+
+import collections
+import os
+import struct
+import threading
+import time
+import zlib
+
+import pygame
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _png_chunk(kind, data):
+    return struct.pack('!I', len(data)) + kind + data + struct.pack('!I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def encode_png(rgb_bytes, width, height, compression=1):
+    """PNG file bytes for tightly packed 8-bit RGB pixels (filter type 0 on every row)."""
+    stride = width * 3
+    raw = b''.join(b'\0' + rgb_bytes[y * stride:(y + 1) * stride] for y in range(height))
+    header = struct.pack('!IIBBBBB', width, height, 8, 2, 0, 0, 0) # 8-bit truecolour
+    return (PNG_SIGNATURE + _png_chunk(b'IHDR', header) +
+            _png_chunk(b'IDAT', zlib.compress(raw, compression)) + _png_chunk(b'IEND', b''))
+
+
+class FrameCapture:
+    def __init__(self, out_dir, max_queue_bytes=96 * 1024 * 1024, frame_step=1, compression=1):
+        """
+        out_dir: directory for the clips (created on demand).
+        max_queue_bytes: memory the queued raw frames may use; frames beyond it are dropped.
+        frame_step: keep one frame in `frame_step` (2 = 30 FPS clips from a 60 FPS game).
+        compression: zlib level for the PNGs (1 is fastest).
+        """
+        self.out_dir = out_dir
+        self.max_queue_bytes = max_queue_bytes
+        self.frame_step = max(1, int(frame_step))
+        self.compression = compression
+
+        self.pending = collections.deque() # (clip, frame, width, height, rgb bytes)
+        self.pending_bytes = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.closing = False
+
+        self.clip = 0
+        self.clip_frames = 0      # Frames offered to the current clip (before frame_step)
+        self.captured = 0         # Frames queued for encoding
+        self.dropped = 0          # Frames lost because the queue was full
+        self.encoded = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.encode_seconds = 0.0
+
+        self.writer = threading.Thread(target=self._writer_loop, name="FrameCaptureEncoder", daemon=True)
+        self.writer.start()
+
+    # ----- Frame loop side -----
+
+    def start_clip(self):
+        """Frames submitted from now on go to a new clip directory."""
+        self.clip += 1
+        self.clip_frames = 0
+
+    def submit(self, surface):
+        """Queues a copy of `surface` for encoding. Returns False if the frame was dropped."""
+        if self.clip == 0:
+            self.start_clip()
+        frame = self.clip_frames
+        self.clip_frames += 1
+        if frame % self.frame_step:
+            return True # Skipped by frame_step, not a drop
+        width, height = surface.get_size()
+        size = width * height * 3
+        with self.lock:
+            if self.pending_bytes + size > self.max_queue_bytes:
+                self.dropped += 1
+                return False
+        data = pygame.image.tobytes(surface, "RGB") # The only per-frame cost on the game thread
+        with self.lock:
+            self.pending.append((self.clip, frame // self.frame_step, width, height, data))
+            self.pending_bytes += size
+            self.captured += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self.pending))
+            self.wakeup.notify()
+        return True
+
+    def stats(self):
+        with self.lock:
+            return {
+                'clips': self.clip,
+                'captured': self.captured,
+                'dropped': self.dropped,
+                'encoded': self.encoded,
+                'failed': self.failed,
+                'queue_depth': len(self.pending),
+                'queue_bytes': self.pending_bytes,
+                'max_queue_depth': self.max_queue_depth,
+                'encode_ms': self.encode_seconds / self.encoded * 1000.0 if self.encoded else 0.0,
+            }
+
+    def close(self):
+        """Encodes the frames still queued, then stops the encoder thread."""
+        with self.lock:
+            if self.closing:
+                return
+            self.closing = True
+            self.wakeup.notify()
+        self.writer.join()
+        stats = self.stats()
+        print(f"FrameCapture: {stats['encoded']} frame(s) in {stats['clips']} clip(s) written to {self.out_dir}, "
+              f"{stats['dropped']} dropped, max queue depth {stats['max_queue_depth']}, "
+              f"{stats['encode_ms']:.1f} ms per frame")
+
+    # ----- Encoder thread -----
+
+    def _writer_loop(self):
+        while True:
+            with self.lock:
+                self.wakeup.wait_for(lambda: self.closing or self.pending)
+                if not self.pending:
+                    break # Closing and drained
+                clip, frame, width, height, data = self.pending[0]
+            start = time.perf_counter()
+            try:
+                clip_dir = os.path.join(self.out_dir, f"clip_{clip:04d}")
+                os.makedirs(clip_dir, exist_ok=True)
+                with open(os.path.join(clip_dir, f"frame_{frame:05d}.png"), 'wb') as f:
+                    f.write(encode_png(data, width, height, self.compression))
+                ok = True
+            except OSError as e:
+                print(f"FrameCapture: Failed to write frame {frame} of clip {clip}: {e}")
+                ok = False
+            with self.lock:
+                # Freed only once encoded, so the memory bound covers the frame being compressed too
+                self.pending.popleft()
+                self.pending_bytes -= width * height * 3
+                self.encoded += ok
+                self.failed += not ok
+                self.encode_seconds += time.perf_counter() - start
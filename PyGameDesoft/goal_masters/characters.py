@@ -0,0 +1,49 @@
+"""
+Goal Masters - Character registry.
+
+Every playable character is an entry in player.json (kick stats, price and an
+optional "portrait" image file in imagens/). The registry keeps them in file order
+and hands out pages of them for the store grid; portraits are not loaded here, the
+store loads them on demand through PortraitCache.
+"""
+
+import json
+import math
+import os
+
+IMAGES_DIR = os.path.join(os.path.dirname(__file__), "..", "imagens")
+
+
+class Character:
+    def __init__(self, name, stats):
+        self.name = name
+        self.stats = stats  # The player.json entry (kick strengths, curve, price...)
+        self.price = stats.get('price', 0)
+        # Portrait file in imagens/, "<name>.png" unless player.json says otherwise
+        self.portrait_path = os.path.join(IMAGES_DIR, stats.get('portrait', f"{name}.png"))
+
+
+class CharacterRegistry:
+    def __init__(self, player_config):
+        """`player_config` is the parsed player.json: {name: stats}."""
+        self.characters = [Character(name, stats) for name, stats in player_config.items()]
+        self.by_name = {character.name: character for character in self.characters}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.characters)
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def page_count(self, page_size):
+        return max(1, math.ceil(len(self.characters) / page_size))
+
+    def page(self, page_index, page_size):
+        """The characters shown on one page of the store grid."""
+        start = page_index * page_size
+        return self.characters[start:start + page_size]
@@ -0,0 +1,72 @@
+import math
+
+try:
+    import numpy as np # Only needed for batched queries (query_many)
+except ImportError:
+    np = None
+
+class UniformGrid:
+    """
+    Uniform-grid broad phase on the ground plane (world X/Y).
+
+    Obstacles are inserted with their XY bounds (already expanded by whatever margin
+    the narrow phase needs) into every cell they overlap. A query looks up the single
+    cell under a point and returns only the obstacles registered there, so the cost per
+    ball does not grow with the total number of obstacles.
+    """
+
+    def __init__(self, cell_size=1.0):
+        self.cell_size = cell_size
+        self.cells = {} # (cell_x, cell_y) -> list of obstacle ids
+        self.obstacle_count = 0
+        self._dense = None # Padded NumPy table for query_many, built lazily
+
+    def cell_of(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, obstacle_id, min_x, min_y, max_x, max_y):
+        min_cell_x, min_cell_y = self.cell_of(min_x, min_y)
+        max_cell_x, max_cell_y = self.cell_of(max_x, max_y)
+        for cell_x in range(min_cell_x, max_cell_x + 1):
+            for cell_y in range(min_cell_y, max_cell_y + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(obstacle_id)
+        self.obstacle_count = max(self.obstacle_count, obstacle_id + 1)
+        self._dense = None
+
+    def clear(self):
+        self.cells.clear()
+        self.obstacle_count = 0
+        self._dense = None
+
+    def query(self, x, y):
+        """Obstacle ids that may contain the point (x, y)."""
+        return self.cells.get(self.cell_of(x, y), ())
+
+    def _build_dense(self):
+        """Packs the cells into a dense (cells_x, cells_y, max_per_cell) table padded with -1."""
+        cell_xs = [cell[0] for cell in self.cells]
+        cell_ys = [cell[1] for cell in self.cells]
+        origin = (min(cell_xs), min(cell_ys))
+        shape = (max(cell_xs) - origin[0] + 1, max(cell_ys) - origin[1] + 1)
+        max_per_cell = max(len(ids) for ids in self.cells.values())
+        table = np.full(shape + (max_per_cell,), -1, dtype=np.int32)
+        for (cell_x, cell_y), ids in self.cells.items():
+            table[cell_x - origin[0], cell_y - origin[1], :len(ids)] = ids
+        self._dense = (origin, table)
+
+    def query_many(self, xs, ys):
+        """
+        Batched query for NumPy arrays of points.
+        Returns an (N, max_per_cell) int array of candidate obstacle ids, padded with -1.
+        """
+        if not self.cells:
+            return np.full((len(xs), 0), -1, dtype=np.int32)
+        if self._dense is None:
+            self._build_dense()
+        (origin_x, origin_y), table = self._dense
+        cell_x = np.floor(xs / self.cell_size).astype(np.int64) - origin_x
+        cell_y = np.floor(ys / self.cell_size).astype(np.int64) - origin_y
+        inside = (cell_x >= 0) & (cell_x < table.shape[0]) & (cell_y >= 0) & (cell_y < table.shape[1])
+        candidates = np.full((len(xs), table.shape[2]), -1, dtype=np.int32)
+        candidates[inside] = table[cell_x[inside], cell_y[inside]]
+        return candidates
@@ -1,23 +1,39 @@
 import json
 import os
+import time
+import weakref
 
 CONFIG_FILE_PATH = os.path.join(os.path.dirname(__file__), "config.json")
+POLL_INTERVAL = 0.5 # Seconds between mtime checks of watched files
+
+def _callback_ref(callback):
+    """Weak reference for bound methods (so subscribers can be garbage collected), strong otherwise."""
+    if hasattr(callback, '__self__'):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
 
 class ConfigManager:
     def __init__(self):
-        self.settings = {}
+        self.settings = {}       # Effective settings: file settings with overrides on top
+        self.file_settings = {}  # As read from config.json
+        self.overrides = {}      # Runtime values (e.g. the selected player's stats)
+        self.subscribers = []    # (callback reference, set of keys or None for any key)
+        self.watched_files = {}  # path -> [last mtime, callback reference]
+        self.poll_interval = POLL_INTERVAL
+        self.next_poll_time = 0.0
         self.load_config()
+        self.watch_file(CONFIG_FILE_PATH, self._on_config_file_changed)
 
     def load_config(self):
         """Loads configuration from the JSON file."""
         try:
             with open(CONFIG_FILE_PATH, 'r') as f:
-                self.settings = json.load(f)
+                self.file_settings = json.load(f)
             print(f"Configuration loaded from {CONFIG_FILE_PATH}")
         except FileNotFoundError:
             print(f"Error: Configuration file {CONFIG_FILE_PATH} not found.")
             # You might want to fall back to default values or raise an exception
-            self.settings = { # Default values as a fallback
+            self.file_settings = { # Default values as a fallback
                 "min_kick_strength": 15.0,
                 "max_kick_strength": 35.0,
                 "max_kick_curve":    3.0
@@ -25,11 +41,12 @@ class ConfigManager:
         except json.JSONDecodeError:
             print(f"Error: Could not decode JSON from {CONFIG_FILE_PATH}.")
             # Fallback or error handling
-            self.settings = {
+            self.file_settings = {
                 "min_kick_strength": 15.0,
                 "max_kick_strength": 35.0,
                 "max_kick_curve":    3.0
             }
+        self._rebuild_settings()
 
 
     def get_setting(self, key, default=None):
@@ -41,6 +58,89 @@ class ConfigManager:
         print("Reloading configuration...")
         self.load_config()
 
+    def set_overrides(self, overrides):
+        """Replaces the runtime overrides (kept across config.json reloads)."""
+        self.overrides = dict(overrides)
+        self._rebuild_settings()
+
+    def _rebuild_settings(self):
+        """Merges file settings and overrides, then notifies subscribers of the keys that changed."""
+        old_settings = self.settings
+        new_settings = dict(self.file_settings)
+        new_settings.update(self.overrides)
+        changed_keys = {key for key in old_settings.keys() | new_settings.keys()
+                        if old_settings.get(key) != new_settings.get(key)}
+        self.settings = new_settings
+        if changed_keys:
+            self._notify(changed_keys)
+
+    # ----- Change notification -----
+
+    def subscribe(self, callback, keys=None):
+        """
+        Calls callback(changed_keys) whenever one of `keys` changes (any key if None).
+        Bound methods are held weakly, so subscribing objects can still be garbage collected.
+        """
+        # Drop collected subscribers here too: without a notification (no setting changes while
+        # the kiosk runs) every Game's camera, ball and keeper would otherwise leave an entry behind
+        self.subscribers = [(ref, subscribed) for ref, subscribed in self.subscribers if ref() is not None]
+        self.subscribers.append((_callback_ref(callback), set(keys) if keys is not None else None))
+
+    def _notify(self, changed_keys):
+        alive = []
+        for callback_ref, keys in self.subscribers:
+            callback = callback_ref()
+            if callback is None:
+                continue # Subscriber was garbage collected
+            alive.append((callback_ref, keys))
+            if keys is None or keys & changed_keys:
+                callback(changed_keys if keys is None else keys & changed_keys)
+        self.subscribers = alive
+
+    # ----- File watching -----
+
+    def watch_file(self, path, callback):
+        """Calls callback(path) when the file's mtime changes (checked by check_for_changes())."""
+        self.watched_files[path] = [self._get_mtime(path), _callback_ref(callback)]
+
+    def _get_mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def check_for_changes(self, now=None):
+        """
+        Cheap per-frame poll: stats the watched files at most every poll_interval seconds
+        and dispatches the callbacks of files whose mtime changed.
+        """
+        now = time.monotonic() if now is None else now
+        if now < self.next_poll_time:
+            return
+        self.next_poll_time = now + self.poll_interval
+        for path, entry in list(self.watched_files.items()):
+            mtime = self._get_mtime(path)
+            if mtime == entry[0]:
+                continue
+            entry[0] = mtime
+            callback = entry[1]()
+            if callback is None:
+                del self.watched_files[path] # Watcher was garbage collected
+            elif mtime is not None:
+                callback(path)
+
+    def _on_config_file_changed(self, path):
+        try:
+            with open(path, 'r') as f:
+                new_file_settings = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # Probably caught mid-save; keep the current settings until the next change
+            print(f"Config hot reload skipped ({e}); keeping current settings.")
+            return
+        print(f"Config file changed, applying {path}")
+        self.file_settings = new_file_settings
+        self._rebuild_settings()
+
 # Global instance
 config_manager = ConfigManager()
 
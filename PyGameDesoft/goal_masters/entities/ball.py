@@ -6,8 +6,25 @@ import random
 
 from .. import constants
 from ..config import config_manager
+from .ball_sprites import get_ball_sprite_atlas, spin_rate_deg
+
+# Settings read by Ball.update, cached on the ball and refreshed when they change
+BALL_SETTING_KEYS = ('knuckleball_threshold_speed', 'knuckleball_min_acceleration', 'knuckleball_max_acceleration',
+                     'knuckleball_min_change_interval', 'knuckleball_max_change_interval',
+                     'ball_bounce_z_restitution', 'ball_friction_xy_retention')
+
+KNUCKLE_SIGNS = (-1, 1)
 
 class Ball:
+    # Fixed attribute layout: no per-instance dict, and update() integrates the
+    # vectors in place so a simulation step allocates nothing
+    __slots__ = ('radius', 'world_pos', 'velocity', 'is_kicked', 'is_on_ground', 'lateral_acceleration_x',
+                 'knuckle_acceleration', 'knuckle_change_timer', 'current_knuckle_interval',
+                 'spin_angle', 'spin_factor', 'base_sprite_radius_world_units', 'color',
+                 'knuckle_threshold_speed', 'knuckle_min_accel', 'knuckle_max_accel',
+                 'knuckle_min_interval', 'knuckle_max_interval', 'z_restitution', 'xy_retention',
+                 '__weakref__') # Config subscriptions hold the ball weakly
+
     def __init__(self, initial_position=None):
         self.radius = constants.BALL_RADIUS
         self.world_pos = pygame.math.Vector3(0, 0, 0)
@@ -21,16 +38,37 @@ class Ball:
         self.knuckle_change_timer = 0.0
         self.current_knuckle_interval = 0.0 # Stores the randomly chosen interval duration
 
+        # Sprite spin: angle on screen, and signed spin per unit of rolling rate set by the contact point
+        self.spin_angle = 0.0
+        self.spin_factor = 0.0
+
         # Sprite placeholder (a simple circle)
         # In a real game, this would be an image, and its base size might be in world units or pixels at a reference depth
         self.base_sprite_radius_world_units = self.radius 
         self.color = constants.WHITE
 
+        self.reload_config()
+        config_manager.subscribe(self.on_config_changed, BALL_SETTING_KEYS)
+
         if initial_position:
             self.world_pos.xyz = initial_position
         else:
             self.spawn()
 
+    def on_config_changed(self, changed_keys):
+        self.reload_config()
+
+    def reload_config(self):
+        # Knuckleball parameters
+        self.knuckle_threshold_speed = config_manager.get_setting('knuckleball_threshold_speed', 25.0)
+        self.knuckle_min_accel = config_manager.get_setting('knuckleball_min_acceleration', 0.0)
+        self.knuckle_max_accel = config_manager.get_setting('knuckleball_max_acceleration', 2.0)
+        self.knuckle_min_interval = config_manager.get_setting('knuckleball_min_change_interval', 0.0)
+        self.knuckle_max_interval = config_manager.get_setting('knuckleball_max_change_interval', 1.0)
+        # Bounce and friction parameters
+        self.z_restitution = config_manager.get_setting('ball_bounce_z_restitution', default=0.5)
+        self.xy_retention = config_manager.get_setting('ball_friction_xy_retention', default=0.5)
+
     def spawn(self):
         """Resets the ball to a random spawn position on the ground."""
         # Get spawn position from config or use defaults if not found
@@ -48,13 +86,13 @@ class Ball:
         self.knuckle_acceleration.xyz = (0, 0, 0)
         self.knuckle_change_timer = 0.0
         self.current_knuckle_interval = 0.0 # Initialize with 0, will be set on first knuckle effect
+        self.spin_factor = 0.0
         print(f"Ball spawned at {self.world_pos}")
 
-    def kick(self, power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset):
+    def launch_parameters(self, power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset):
         """
-        Calculates initial velocity and acceleration based on kick parameters.
-        pointer_x_offset: Horizontal striking offset on ball front face, right = +, left = −. Range ± r.
-        pointer_z_offset: Vertical striking offset, up = +, down = -. Range ± r (used for vertical angle).
+        Launch velocity (vx, vy, vz), lateral curve acceleration and vertical angle for a kick.
+        Shared by kick() and the trajectory preview so both use the same model.
         """
         min_strength = config_manager.get_setting('min_kick_strength')
         max_strength = config_manager.get_setting('max_kick_strength')
@@ -84,15 +122,32 @@ class Ball:
         # Vx = V_horz · sin θx
         # Vy = − V_horz · cos θx (negative because +Y is midfield, aim is towards goal in -Y)
         # Vz = V_horz · tan θz
-        self.velocity.x = v_horz * math.sin(theta_x_rad)
-        self.velocity.y = -v_horz * math.cos(theta_x_rad) 
-        self.velocity.z = v_horz * math.tan(theta_z_rad)
+        velocity = (v_horz * math.sin(theta_x_rad),
+                    -v_horz * math.cos(theta_x_rad),
+                    v_horz * math.tan(theta_z_rad))
 
         # Curve Dynamics
         # a_x = − (pointer_x_offset / r) × max_kick_curve
         # Clamp pointer_x_offset to [-radius, radius]
         clamped_pointer_x_offset = max(-self.radius, min(self.radius, pointer_x_offset))
-        self.lateral_acceleration_x = -(clamped_pointer_x_offset / self.radius) * max_curve_accel
+        lateral_acceleration_x = -(clamped_pointer_x_offset / self.radius) * max_curve_accel
+        return velocity, lateral_acceleration_x, clamped_vertical_angle_deg
+
+    def kick(self, power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset):
+        """
+        Calculates initial velocity and acceleration based on kick parameters.
+        pointer_x_offset: Horizontal striking offset on ball front face, right = +, left = −. Range ± r.
+        pointer_z_offset: Vertical striking offset, up = +, down = -. Range ± r (used for vertical angle).
+        """
+        velocity, lateral_acceleration_x, clamped_vertical_angle_deg = self.launch_parameters(
+            power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset)
+        self.velocity.xyz = velocity
+        self.lateral_acceleration_x = lateral_acceleration_x
+
+        # Off-centre strikes spin the ball more; a dead-centre strike (knuckleball) barely spins.
+        # Striking right of centre curves the ball left and turns the sprite counterclockwise.
+        off_centre = min(1.0, math.hypot(pointer_x_offset, pointer_z_offset) / self.radius)
+        self.spin_factor = (0.2 + 0.8 * off_centre) * (1 if pointer_x_offset >= 0 else -1)
         
         self.is_kicked = True
         self.is_on_ground = False # Ball is now airborne
@@ -107,78 +162,83 @@ class Ball:
 
 
     def update(self, dt):
+        """
+        Advances the flight by dt. Works on scalar copies of the vectors and writes the
+        components back in place, so a step builds no Vector3 (the results are the same,
+        bit for bit, as the vector arithmetic).
+        """
         if not self.is_kicked:
             return
+        pos = self.world_pos
+        vel = self.velocity
+        knuckle = self.knuckle_acceleration
+        radius = self.radius
+        vx, vy, vz = vel.x, vel.y, vel.z
 
-        # Knuckleball parameters from config
-        knuckle_threshold_speed = config_manager.get_setting('knuckleball_threshold_speed', 25.0)
-        knuckle_min_accel = config_manager.get_setting('knuckleball_min_acceleration', 0.0)
-        knuckle_max_accel = config_manager.get_setting('knuckleball_max_acceleration', 2.0)
-        knuckle_min_interval = config_manager.get_setting('knuckleball_min_change_interval', 0.0)
-        knuckle_max_interval = config_manager.get_setting('knuckleball_max_change_interval', 1.0)
-
-        current_speed = self.velocity.length()
+        current_speed = math.sqrt(vx * vx + vy * vy + vz * vz)
 
-        if current_speed > knuckle_threshold_speed and self.world_pos.z > self.radius:
+        if current_speed > self.knuckle_threshold_speed and pos.z > radius:
             self.knuckle_change_timer += dt
             if self.knuckle_change_timer >= self.current_knuckle_interval:
                 self.knuckle_change_timer = 0.0 # Reset timer
-                self.current_knuckle_interval = random.uniform(knuckle_min_interval, knuckle_max_interval)
+                self.current_knuckle_interval = random.uniform(self.knuckle_min_interval, self.knuckle_max_interval)
                 
-                kn_accel_x = random.uniform(knuckle_min_accel, knuckle_max_accel) * random.choice([-1, 1])
+                kn_accel_x = random.uniform(self.knuckle_min_accel, self.knuckle_max_accel) * random.choice(KNUCKLE_SIGNS)
                 # Knuckle effect on Z could be similar, or perhaps biased if desired (e.g. more often down?)
                 # For now, symmetrical like X.
-                kn_accel_z = random.uniform(knuckle_min_accel, knuckle_max_accel) * random.choice([-1, 1])
-                self.knuckle_acceleration.xyz = (kn_accel_x, 0, kn_accel_z)
+                kn_accel_z = random.uniform(self.knuckle_min_accel, self.knuckle_max_accel) * random.choice(KNUCKLE_SIGNS)
+                knuckle.xyz = (kn_accel_x, 0, kn_accel_z)
         else:
             # If speed drops or ball is on ground, reset knuckle effect
-            self.knuckle_acceleration.xyz = (0, 0, 0)
+            knuckle.x = knuckle.z = 0.0
             self.knuckle_change_timer = 0.0 # Reset timer for next potential activation
             # Optionally, could also reset self.current_knuckle_interval here or let it persist
 
         # Apply gravity and Z-component of knuckleball acceleration
-        self.velocity.z += (self.knuckle_acceleration.z - constants.GRAVITY) * dt
+        vz += (knuckle.z - constants.GRAVITY) * dt
 
         # Apply curve dynamics and X-component of knuckleball acceleration if ball is in the air
-        if self.world_pos.z > self.radius: # Apply only while Z > r
-            self.velocity.x += (self.lateral_acceleration_x + self.knuckle_acceleration.x) * dt
-        else:
-            # If it was curving but now on ground, curve effect might stop or change.
-            # Knuckle effect is already handled above to stop if on ground or too slow.
-            # For MVP, let's assume curve accel stops if Z condition not met.
-            pass # lateral_acceleration_x will not be applied if this else branch is taken next tick and world_pos.z <= radius
+        if pos.z > radius: # Apply only while Z > r
+            vx += (self.lateral_acceleration_x + knuckle.x) * dt
+        # Otherwise the curve effect stops while the ball is on the ground (MVP)
 
         # Update position (Y velocity is not affected by curve or knuckle)
-        self.world_pos += self.velocity * dt
+        x = pos.x + vx * dt
+        y = pos.y + vy * dt
+        z = pos.z + vz * dt
+        self.spin_angle = (self.spin_angle + spin_rate_deg(current_speed, self.spin_factor) * dt) % 360.0
         
         # Check for ground collision
-        if self.world_pos.z <= self.radius and self.velocity.z < 0:
-            self.world_pos.z = self.radius
-            
-            # Get bounce and friction parameters from config
-            z_restitution = config_manager.get_setting('ball_bounce_z_restitution', default=0.5)
-            xy_retention = config_manager.get_setting('ball_friction_xy_retention', default=0.5)
-            
-            self.velocity.z *= -z_restitution # Bounce with configured Z restitution
+        bounced = z <= radius and vz < 0
+        if bounced:
+            z = radius
+            vz *= -self.z_restitution # Bounce with configured Z restitution
             self.is_on_ground = True
             
             # Apply configured XY friction (speed retention)
-            self.velocity.x *= xy_retention 
-            self.velocity.y *= xy_retention
+            vx *= self.xy_retention
+            vy *= self.xy_retention
 
             # If vertical bounce is very small, effectively stop vertical motion to prevent micro-bounces
-            if abs(self.velocity.z) < 0.1: # Threshold for stopping vertical bounce
-                self.velocity.z = 0
+            if abs(vz) < 0.1: # Threshold for stopping vertical bounce
+                vz = 0.0
 
             # If overall speed is very low after bounce and friction, consider the ball stopped
-            if self.velocity.length_squared() < 0.1: # Threshold for stopping
+            if vx * vx + vy * vy + vz * vz < 0.1: # Threshold for stopping
                  self.is_kicked = False # Ball is no longer considered in active play
-                 self.velocity.xyz = (0,0,0) # Come to a full stop
-            
-            print(f"Ball hit ground at {self.world_pos}, bounced with Vz={self.velocity.z:.2f}")
-        elif self.world_pos.z > self.radius:
+                 vx = vy = vz = 0.0 # Come to a full stop
+        elif z > radius:
             self.is_on_ground = False # Explicitly set is_on_ground to false if airborne
 
+        pos.x = x
+        pos.y = y
+        pos.z = z
+        vel.x = vx
+        vel.y = vy
+        vel.z = vz
+        if bounced:
+            print(f"Ball hit ground at {pos}, bounced with Vz={vz:.2f}")
+
 
     def draw(self, screen, camera):
         # Get screen coordinates and size from camera
@@ -192,14 +252,8 @@ class Ball:
             base_diameter_world, # Assuming square aspect ratio for the ball sprite
             self.world_pos.x, self.world_pos.y, self.world_pos.z # Pass full world coordinates
         )
-        # For a circle, we need radius. 
-        # Ensure it's at least 1 pixel.
-        display_radius = max(1, int(scaled_diameter_pixels_w / 2))
-
-
-        # Draw a simple circle as a placeholder sprite
-        if display_radius > 0 : # Only draw if visible
-            pygame.draw.circle(screen, self.color, (screen_x, screen_y), display_radius)
+        # Spinning bola.png sprite from the shared pre-scaled, pre-rotated atlas
+        get_ball_sprite_atlas().draw(screen, (screen_x, screen_y), scaled_diameter_pixels_w, self.spin_angle)
 
     def reset(self):
         self.spawn()
@@ -0,0 +1,102 @@
+import math
+import os
+import pygame
+from .. import constants
+from ..memory_registry import memory_registry
+from ..metrics import frame_metrics
+
+# Rotation frames per full turn (11.25 degrees apart) and display size quantization
+ROTATION_STEPS = 32
+SIZE_STEP = 2          # Display diameters are rounded to even pixel counts
+MIN_DIAMETER = 2
+MAX_DIAMETER = 96      # Larger balls are drawn at this size (only when the ball is very close)
+
+# Visual spin: a fraction of the true rolling rate (speed / radius), which would be
+# tens of turns per second and just alias at 60 FPS
+SPIN_VISUAL_SCALE = 0.05
+
+BALL_IMAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "imagens", "bola.png")
+
+class BallSpriteAtlas:
+    """
+    Lazily filled atlas of the ball sprite (imagens/bola.png) at ROTATION_STEPS angles
+    and quantized display sizes.
+
+    The 1024x1024 source is cropped and scaled down to MAX_DIAMETER once at load, so the
+    full-size image is never kept or rotated. Each (size, angle) frame is generated with
+    rotozoom the first time it is drawn and reused afterwards; the grid of sizes and
+    angles bounds the atlas to at most (MAX_DIAMETER / SIZE_STEP) * ROTATION_STEPS frames.
+    """
+
+    def __init__(self, image_path=BALL_IMAGE_PATH):
+        self.master = self.load_master(image_path)
+        self.base_by_size = {}   # diameter -> unrotated sprite
+        self.frames = {}         # (diameter, angle step) -> rotated sprite
+        self.hit_count = 0
+        self.load_count = 0      # Frames generated
+        frame_metrics.register_cache("ball_sprites", self)
+
+    def load_master(self, image_path):
+        try:
+            image = pygame.image.load(image_path)
+            # Crop the transparent margin so the ball fills the sprite, then scale down once
+            image = image.subsurface(image.get_bounding_rect())
+            master = pygame.transform.smoothscale(image, (MAX_DIAMETER, MAX_DIAMETER))
+            print(f"Ball sprite loaded from: {image_path}")
+        except Exception as e:
+            print(f"Failed to load ball sprite: {e}")
+            # Fall back to the plain white circle the game drew before
+            master = pygame.Surface((MAX_DIAMETER, MAX_DIAMETER), pygame.SRCALPHA)
+            pygame.draw.circle(master, constants.WHITE, (MAX_DIAMETER // 2, MAX_DIAMETER // 2), MAX_DIAMETER // 2)
+        return memory_registry.track(master, "ball_sprites", "master")
+
+    def quantize_diameter(self, diameter_pixels):
+        diameter = int(round(diameter_pixels / SIZE_STEP)) * SIZE_STEP
+        return max(MIN_DIAMETER, min(MAX_DIAMETER, diameter))
+
+    def get_frame(self, diameter_pixels, angle_deg):
+        """Sprite of the ball at (about) the given display diameter and rotation."""
+        diameter = self.quantize_diameter(diameter_pixels)
+        step = int(round(angle_deg * ROTATION_STEPS / 360.0)) % ROTATION_STEPS
+        frame = self.frames.get((diameter, step))
+        if frame is not None:
+            self.hit_count += 1
+        else:
+            self.load_count += 1
+            base = self.base_by_size.get(diameter)
+            if base is None:
+                base = pygame.transform.smoothscale(self.master, (diameter, diameter))
+                self.base_by_size[diameter] = memory_registry.track(base, "ball_sprites", f"{diameter}px")
+            frame = pygame.transform.rotozoom(base, step * 360.0 / ROTATION_STEPS, 1.0)
+            if pygame.display.get_surface() is not None: # convert_alpha needs a video mode
+                frame = frame.convert_alpha()
+            self.frames[(diameter, step)] = memory_registry.track(frame, "ball_sprites", f"{diameter}px #{step}")
+        return frame
+
+    def fill(self):
+        """Generates every frame of the grid up front (the soak test does this so the atlas filling up is not taken for a leak)."""
+        for diameter in range(MIN_DIAMETER, MAX_DIAMETER + 1, SIZE_STEP):
+            for step in range(ROTATION_STEPS):
+                self.get_frame(diameter, step * 360.0 / ROTATION_STEPS)
+
+    def draw(self, screen, center, diameter_pixels, angle_deg):
+        frame = self.get_frame(diameter_pixels, angle_deg)
+        screen.blit(frame, frame.get_rect(center=center))
+
+    def memory_bytes(self):
+        """Approximate pixel memory held by the atlas."""
+        surfaces = [self.master, *self.base_by_size.values(), *self.frames.values()]
+        return sum(surface.get_width() * surface.get_height() * surface.get_bytesize() for surface in surfaces)
+
+_atlas = None
+
+def get_ball_sprite_atlas():
+    """The shared atlas, loaded on first use (after pygame is initialised)."""
+    global _atlas
+    if _atlas is None:
+        _atlas = BallSpriteAtlas()
+    return _atlas
+
+def spin_rate_deg(speed, spin_factor, radius=constants.BALL_RADIUS):
+    """On-screen spin rate in degrees per second for a ball moving at `speed`."""
+    return math.degrees(speed / radius) * SPIN_VISUAL_SCALE * spin_factor
@@ -0,0 +1,255 @@
+import types
+
+import numpy as np
+import pygame
+
+from .. import constants
+from ..config import config_manager
+from ..camera import MIN_PERSPECTIVE_DEPTH
+from .ball_sprites import get_ball_sprite_atlas, SPIN_VISUAL_SCALE
+from .ball import BALL_SETTING_KEYS
+
+# Where barrage balls are (re)spawned and when they are considered out of play
+BARRAGE_SPAWN_X_RANGE = (-15.0, 15.0)
+BARRAGE_SPAWN_Y_RANGE = (constants.SPAWN_Y_MIN, 45.0)
+BARRAGE_AIM_SPREAD_DEG = 10.0
+BARRAGE_OUT_OF_PLAY_Y = 70.0
+BARRAGE_OUT_OF_PLAY_X = 40.0
+
+# Ball's physics settings plus the kick strengths, cached like Ball does and refreshed on hot reload
+BALL_STORE_SETTING_KEYS = BALL_SETTING_KEYS + ('min_kick_strength', 'max_kick_strength', 'max_kick_curve')
+
+# Per-ball outcome codes (reset when the ball is re-kicked)
+OUTCOME_NONE = 0
+OUTCOME_SAVED = 1
+
+class BallStore:
+    """
+    Struct-of-arrays store for many balls in flight (training "barrage" mode).
+
+    Each ball is a row in a set of preallocated NumPy arrays instead of a Ball object,
+    so kick, update, bounce, goalkeeper and goal tests run as whole-array operations.
+    The rules are the same as Ball.kick(), Ball.update(), Goalkeeper.check_save()/
+    save_ball() and the goal test in Game.update(). Finished balls are re-kicked
+    from a random spot straight away, so the barrage keeps `capacity` balls busy.
+    """
+
+    def __init__(self, capacity, seed=None):
+        self.capacity = capacity
+        self.radius = constants.BALL_RADIUS
+        self.rng = np.random.default_rng(seed)
+
+        self.position = np.zeros((capacity, 3))
+        self.velocity = np.zeros((capacity, 3))
+        self.lateral_acceleration_x = np.zeros(capacity)
+        self.knuckle_acceleration = np.zeros((capacity, 3))
+        self.knuckle_change_timer = np.zeros(capacity)
+        self.current_knuckle_interval = np.zeros(capacity)
+        self.is_kicked = np.zeros(capacity, dtype=bool)
+        self.outcome = np.zeros(capacity, dtype=np.int8)
+        self.spin_angle = np.zeros(capacity)
+        self.spin_factor = np.zeros(capacity)
+
+        # Session totals
+        self.shots = 0
+        self.goals = 0
+        self.saves = 0
+        self.misses = 0
+        self.blocks = 0 # Deflected by a defensive wall
+
+        # Stand-in with Ball's attributes, so Goalkeeper.update() can track one barrage ball
+        self.tracked_ball = types.SimpleNamespace(world_pos=pygame.math.Vector3(), velocity=pygame.math.Vector3())
+
+        # Pre-rendered spinning ball sprites, shared with Ball.draw()
+        self.sprite_atlas = get_ball_sprite_atlas()
+
+        self.reload_config()
+        config_manager.subscribe(self.on_config_changed, BALL_STORE_SETTING_KEYS)
+
+        self.kick_random(np.arange(capacity))
+
+    def on_config_changed(self, changed_keys):
+        self.reload_config()
+
+    def reload_config(self):
+        # Same settings and defaults as Ball.reload_config() and Ball.kick()
+        self.knuckle_threshold_speed = config_manager.get_setting('knuckleball_threshold_speed', 25.0)
+        self.knuckle_min_accel = config_manager.get_setting('knuckleball_min_acceleration', 0.0)
+        self.knuckle_max_accel = config_manager.get_setting('knuckleball_max_acceleration', 2.0)
+        self.knuckle_min_interval = config_manager.get_setting('knuckleball_min_change_interval', 0.0)
+        self.knuckle_max_interval = config_manager.get_setting('knuckleball_max_change_interval', 1.0)
+        self.z_restitution = config_manager.get_setting('ball_bounce_z_restitution', default=0.5)
+        self.xy_retention = config_manager.get_setting('ball_friction_xy_retention', default=0.5)
+        self.min_strength = config_manager.get_setting('min_kick_strength')
+        self.max_strength = config_manager.get_setting('max_kick_strength')
+        self.max_curve_accel = config_manager.get_setting('max_kick_curve')
+
+    def kick_random(self, indices):
+        """Places the given balls at random spots and kicks them at the goal with random aim/contact/power."""
+        count = len(indices)
+        if count == 0:
+            return
+        rng = self.rng
+        x = rng.uniform(*BARRAGE_SPAWN_X_RANGE, count)
+        y = rng.uniform(*BARRAGE_SPAWN_Y_RANGE, count)
+        self.position[indices] = np.column_stack((x, y, np.full(count, constants.BALL_REST_Z)))
+        # Aim roughly at the goal centre from the spot, with some spread
+        aim_deg = np.degrees(np.arctan2(-x, y)) + rng.uniform(-BARRAGE_AIM_SPREAD_DEG, BARRAGE_AIM_SPREAD_DEG, count)
+        self.kick(indices, rng.uniform(0.0, 1.0, count), aim_deg,
+                  rng.uniform(-self.radius, self.radius, count), rng.uniform(-self.radius, self.radius, count))
+
+    def kick(self, indices, power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset):
+        """Vectorized Ball.kick(): every argument is an array with one entry per index."""
+        min_strength, max_strength = self.min_strength, self.max_strength
+        max_curve_accel = self.max_curve_accel
+        min_interval, max_interval = self.knuckle_min_interval, self.knuckle_max_interval
+
+        power_fraction = np.clip(power_fraction, 0.0, 1.0)
+        v_horz = min_strength + power_fraction * (max_strength - min_strength)
+        theta_x_rad = np.radians(horizontal_aim_deg)
+        pointer_z = np.clip(pointer_z_offset, -self.radius, self.radius)
+        theta_z_rad = np.radians(np.clip(-pointer_z / self.radius * 45.0, -45.0, 45.0))
+
+        self.velocity[indices, 0] = v_horz * np.sin(theta_x_rad)
+        self.velocity[indices, 1] = -v_horz * np.cos(theta_x_rad)
+        self.velocity[indices, 2] = v_horz * np.tan(theta_z_rad)
+
+        pointer_x = np.clip(pointer_x_offset, -self.radius, self.radius)
+        self.lateral_acceleration_x[indices] = -(pointer_x / self.radius) * max_curve_accel
+        # Same sprite spin rule as Ball.kick()
+        off_centre = np.minimum(1.0, np.hypot(pointer_x_offset, pointer_z_offset) / self.radius)
+        self.spin_factor[indices] = (0.2 + 0.8 * off_centre) * np.where(np.asarray(pointer_x_offset) >= 0, 1.0, -1.0)
+
+        self.is_kicked[indices] = True
+        self.outcome[indices] = OUTCOME_NONE
+        self.current_knuckle_interval[indices] = self.rng.uniform(min_interval, max_interval, len(indices))
+        self.knuckle_change_timer[indices] = 0.0
+        self.knuckle_acceleration[indices] = 0.0
+        self.shots += len(indices)
+
+    def update(self, dt, goalkeeper=None, wall=None):
+        """Vectorized Ball.update() for every ball, then the wall, goalkeeper and goal-line tests."""
+        knuckle_threshold_speed = self.knuckle_threshold_speed
+        knuckle_min_accel, knuckle_max_accel = self.knuckle_min_accel, self.knuckle_max_accel
+        knuckle_min_interval, knuckle_max_interval = self.knuckle_min_interval, self.knuckle_max_interval
+        z_restitution = self.z_restitution
+        xy_retention = self.xy_retention
+
+        kicked = self.is_kicked
+        pos = self.position
+        vel = self.velocity
+        airborne = kicked & (pos[:, 2] > self.radius)
+
+        # Knuckleball: random lateral/vertical pushes above the threshold speed while airborne
+        speed_sq = np.einsum('ij,ij->i', vel, vel)
+        knuckling = airborne & (speed_sq > knuckle_threshold_speed * knuckle_threshold_speed)
+        self.knuckle_change_timer[knuckling] += dt
+        change = knuckling & (self.knuckle_change_timer >= self.current_knuckle_interval)
+        change_count = int(np.count_nonzero(change))
+        if change_count:
+            rng = self.rng
+            self.knuckle_change_timer[change] = 0.0
+            self.current_knuckle_interval[change] = rng.uniform(knuckle_min_interval, knuckle_max_interval, change_count)
+            signs = rng.choice((-1.0, 1.0), (change_count, 2))
+            magnitudes = rng.uniform(knuckle_min_accel, knuckle_max_accel, (change_count, 2))
+            self.knuckle_acceleration[change, 0] = magnitudes[:, 0] * signs[:, 0]
+            self.knuckle_acceleration[change, 2] = magnitudes[:, 1] * signs[:, 1]
+        calm = kicked & ~knuckling
+        self.knuckle_acceleration[calm] = 0.0
+        self.knuckle_change_timer[calm] = 0.0
+
+        # Gravity (+ knuckle Z) always; curve (+ knuckle X) only while airborne
+        vel[kicked, 2] += (self.knuckle_acceleration[kicked, 2] - constants.GRAVITY) * dt
+        vel[airborne, 0] += (self.lateral_acceleration_x[airborne] + self.knuckle_acceleration[airborne, 0]) * dt
+
+        pos[kicked] += vel[kicked] * dt
+        self.spin_angle[kicked] += np.degrees(np.sqrt(speed_sq[kicked]) / self.radius) * \
+            SPIN_VISUAL_SCALE * self.spin_factor[kicked] * dt
+
+        # Ground bounce with restitution and XY friction
+        hit = kicked & (pos[:, 2] <= self.radius) & (vel[:, 2] < 0)
+        if hit.any():
+            pos[hit, 2] = self.radius
+            vel[hit, 2] *= -z_restitution
+            vel[hit, 0:2] *= xy_retention
+            vel[hit & (np.abs(vel[:, 2]) < 0.1), 2] = 0.0
+            stopped = hit & (np.einsum('ij,ij->i', vel, vel) < 0.1)
+            vel[stopped] = 0.0
+            self.is_kicked[stopped] = False
+
+        if wall is not None:
+            self.blocks += int(np.count_nonzero(wall.deflect_many(pos, vel, self.is_kicked, dt)))
+
+        if goalkeeper is not None:
+            self.update_goalkeeper(dt, goalkeeper)
+
+        # Goal line: scored or missed balls are resolved and re-kicked
+        crossed = self.is_kicked & (pos[:, 1] <= 0) & (self.outcome == OUTCOME_NONE)
+        if crossed.any():
+            goal = crossed & (pos[:, 0] >= constants.GOAL_MIN_X) & (pos[:, 0] <= constants.GOAL_MAX_X) & \
+                   (pos[:, 2] >= constants.BALL_RADIUS) & (pos[:, 2] <= constants.CROSSBAR_Z)
+            goal_count = int(np.count_nonzero(goal))
+            self.goals += goal_count
+            self.misses += int(np.count_nonzero(crossed)) - goal_count
+
+        # Finished balls: crossed the line, stopped, or left the pitch after a save
+        finished = crossed | ~self.is_kicked | (pos[:, 1] > BARRAGE_OUT_OF_PLAY_Y) | \
+                   (np.abs(pos[:, 0]) > BARRAGE_OUT_OF_PLAY_X)
+        self.kick_random(np.flatnonzero(finished))
+
+    def update_goalkeeper(self, dt, goalkeeper):
+        """Moves the keeper towards the incoming ball nearest the line, then applies saves to all balls."""
+        pos = self.position
+        vel = self.velocity
+        incoming = np.flatnonzero(self.is_kicked & (vel[:, 1] < 0) & (pos[:, 1] > 0))
+        if len(incoming):
+            nearest = incoming[np.argmin(pos[incoming, 1])]
+            self.tracked_ball.world_pos.xyz = pos[nearest]
+            self.tracked_ball.velocity.xyz = vel[nearest]
+        else:
+            self.tracked_ball.velocity.xyz = (0, 0, 0)
+        goalkeeper.update(dt, self.tracked_ball)
+
+        # Goalkeeper.check_save() rectangle test for every ball at once
+        tolerance = 0.15
+        keeper = goalkeeper.world_pos
+        save = self.is_kicked & (pos[:, 1] <= 0.5) & (vel[:, 1] < 0) & \
+               (pos[:, 0] >= keeper.x - goalkeeper.width / 2 - tolerance) & \
+               (pos[:, 0] <= keeper.x + goalkeeper.width / 2 + tolerance) & \
+               (pos[:, 2] >= keeper.z - goalkeeper.height / 2 - tolerance) & \
+               (pos[:, 2] <= keeper.z + goalkeeper.height / 2 + tolerance)
+        if save.any():
+            # Goalkeeper.save_ball() deflection
+            vel[save, 1] = np.abs(vel[save, 1]) * 0.8
+            vel[save, 0] += (pos[save, 0] - keeper.x) * 2.0
+            vel[save, 2] += 1.0
+            pos[save & (pos[:, 1] <= 0), 1] = 0.1
+            self.outcome[save] = OUTCOME_SAVED
+            self.saves += int(np.count_nonzero(save))
+
+    def draw(self, screen, camera, occluders=()):
+        """
+        Projects every ball in one batch and draws them far-to-near with one Surface.blits
+        call per layer. `occluders` (goalkeeper, defenders) must be sorted far-to-near
+        (ascending world Y); each is drawn over the balls behind it.
+        """
+        screen_xy, depth = camera.world_to_screen_many(self.position)
+        remaining = depth >= MIN_PERSPECTIVE_DEPTH
+        for occluder in occluders:
+            behind = remaining & (self.position[:, 1] < occluder.world_pos.y)
+            self._blit_balls(screen, camera, screen_xy, depth, behind)
+            remaining &= ~behind
+            occluder.draw(screen, camera)
+        self._blit_balls(screen, camera, screen_xy, depth, remaining)
+
+    def _blit_balls(self, screen, camera, screen_xy, depth, mask):
+        indices = np.flatnonzero(mask)
+        if len(indices) == 0:
+            return
+        indices = indices[np.argsort(-depth[indices])] # Far to near
+        diameters = 2.0 * self.radius * camera.focal_length_pixels / depth[indices]
+        get_frame = self.sprite_atlas.get_frame
+        frames = [get_frame(d, a) for d, a in zip(diameters.tolist(), self.spin_angle[indices].tolist())]
+        screen.blits([(frame, (x - frame.get_width() // 2, y - frame.get_height() // 2))
+                      for frame, x, y in zip(frames, screen_xy[indices, 0].tolist(), screen_xy[indices, 1].tolist())],
+                     doreturn=False)
@@ -3,8 +3,15 @@ import math
 import os
 from .. import constants
 from ..config import config_manager
+from .. import assets
+
+# Settings read by Goalkeeper.update, cached on the keeper and refreshed when they change
+GOALKEEPER_SETTING_KEYS = ('goalkeeper_max_speed', 'goalkeeper_max_acceleration')
 
 class Goalkeeper:
+    __slots__ = ('width', 'height', 'world_pos', 'velocity_x', 'target_x', 'color', 'sprite', 'has_sprite',
+                 'max_speed', 'max_acceleration', '__weakref__')
+
     def __init__(self):
         # Goalkeeper dimensions (2m tall, 1.5m wide)
         self.width = 1.5
@@ -23,33 +30,54 @@ class Goalkeeper:
         # Load goalkeeper sprite
         try:
             sprite_path = os.path.join(os.path.dirname(__file__), "..", "..", "imagens", "Yashin Sprite Request May 28 2025.png")
-            self.sprite = pygame.image.load(sprite_path)
+            self.sprite = assets.load_image(sprite_path) # Shared by every keeper (never drawn on)
             self.has_sprite = True
             print(f"Goalkeeper sprite loaded from: {sprite_path}")
         except Exception as e:
             print(f"Failed to load goalkeeper sprite: {e}")
             self.sprite = None
             self.has_sprite = False
+
+        self.reload_config()
+        config_manager.subscribe(self.on_config_changed, GOALKEEPER_SETTING_KEYS)
         
         print(f"Goalkeeper spawned at {self.world_pos}")
 
-    def update(self, dt, ball):
-        """Update goalkeeper position based on ball location"""
-        # Get configuration parameters
-        max_speed = config_manager.get_setting('goalkeeper_max_speed', default=5.0)
-        max_acceleration = config_manager.get_setting('goalkeeper_max_acceleration', default=8.0)
+    def on_config_changed(self, changed_keys):
+        self.reload_config()
+
+    def reload_config(self):
+        self.max_speed = config_manager.get_setting('goalkeeper_max_speed', default=5.0)
+        self.max_acceleration = config_manager.get_setting('goalkeeper_max_acceleration', default=8.0)
+
+    def update(self, dt, ball, control=None):
+        """
+        Update goalkeeper position based on ball location.
+        control: None for the AI keeper, or -1/0/+1 to move left/stop/right (human keeper).
+        """
+        max_speed = self.max_speed
+        max_acceleration = self.max_acceleration
         
         # Set target x position based on ball's x position if ball is moving
-        if ball.velocity.length_squared() > 0.1:
+        # (squared speed from the components: Vector3.length_squared() allocates)
+        velocity = ball.velocity
+        if control is None and velocity.x * velocity.x + velocity.y * velocity.y + velocity.z * velocity.z > 0.1:
             self.target_x = ball.world_pos.x
         
         # Calculate desired velocity to reach target
         distance_to_target = self.target_x - self.world_pos.x
         desired_velocity = 0.0
         
-        if abs(distance_to_target) > 0.01:  # Small threshold to avoid jitter
-            # Calculate desired velocity (with speed limit)
-            desired_speed = min(abs(distance_to_target) * 5.0, max_speed)  # Proportional with max speed
+        if control is not None:
+            # Human keeper: full speed in the pressed direction, same acceleration limits
+            desired_velocity = control * max_speed
+            self.target_x = self.world_pos.x
+        elif abs(distance_to_target) > 0.01:  # Small threshold to avoid jitter
+            # Calculate desired velocity, proportional with max speed
+            # (comparisons rather than min()/max(), which allocate an argument tuple)
+            desired_speed = abs(distance_to_target) * 5.0
+            if desired_speed > max_speed:
+                desired_speed = max_speed
             desired_velocity = desired_speed if distance_to_target > 0 else -desired_speed
         
         # Apply acceleration limits
@@ -66,7 +94,10 @@ class Goalkeeper:
         
         # Keep goalkeeper within reasonable bounds (goal area)
         goalkeeper_bounds = 6.0  # Allow some movement beyond goal posts
-        self.world_pos.x = max(-goalkeeper_bounds, min(goalkeeper_bounds, self.world_pos.x))
+        if self.world_pos.x > goalkeeper_bounds:
+            self.world_pos.x = goalkeeper_bounds
+        elif self.world_pos.x < -goalkeeper_bounds:
+            self.world_pos.x = -goalkeeper_bounds
 
     def check_save(self, ball):
         """Check if goalkeeper saves the ball (ball at y=0 and contacts goalkeeper)"""
@@ -0,0 +1,150 @@
+import math
+import pygame
+from .. import constants
+from ..config import config_manager
+from ..collision import UniformGrid
+
+try:
+    import numpy as np # Only needed for barrage mode (deflect_many)
+except ImportError:
+    np = None
+
+# Collision tolerance around each defender, as in Goalkeeper.check_save()
+DEFENDER_TOLERANCE = 0.15
+# How far past a defender's plane a ball can travel in one step and still be caught
+# (the grid cells extend this far towards the goal so the broad phase finds it)
+WALL_SWEEP_MARGIN = 1.5
+GRID_CELL_SIZE = 1.0
+
+class Defender:
+    def __init__(self, x, y, width, height):
+        self.width = width
+        self.height = height
+        # Position (center of the rectangle), bottom touching the ground
+        self.world_pos = pygame.math.Vector3(x, y, height / 2)
+        self.color = constants.RED
+        self.update_bounds()
+
+    def update_bounds(self):
+        half_width = self.width / 2 + DEFENDER_TOLERANCE
+        half_height = self.height / 2 + DEFENDER_TOLERANCE
+        self.left_bound = self.world_pos.x - half_width
+        self.right_bound = self.world_pos.x + half_width
+        self.bottom_bound = self.world_pos.z - half_height
+        self.top_bound = self.world_pos.z + half_height
+
+    def draw(self, screen, camera):
+        """Draw the defender as a projected rectangle (like the Goalkeeper fallback)"""
+        half_width = self.width / 2
+        half_height = self.height / 2
+        x, y, z = self.world_pos.x, self.world_pos.y, self.world_pos.z
+        corners_screen = [
+            camera.world_to_screen(x - half_width, y, z - half_height),
+            camera.world_to_screen(x + half_width, y, z - half_height),
+            camera.world_to_screen(x + half_width, y, z + half_height),
+            camera.world_to_screen(x - half_width, y, z + half_height),
+        ]
+        pygame.draw.polygon(screen, self.color, corners_screen)
+        pygame.draw.polygon(screen, constants.BLACK, corners_screen, 2)
+
+class DefensiveWall:
+    """
+    A free-kick wall: a line of defenders `distance` metres from the ball, across the
+    line from the ball to the goal centre. Ball-vs-defender tests go through a uniform
+    grid broad phase, then the Goalkeeper.check_save() rectangle test (swept along the
+    ball's step so fast balls cannot tunnel through), and hits use the
+    Goalkeeper.save_ball() deflection rule.
+    """
+
+    def __init__(self, ball_x, ball_y):
+        self.defender_count = int(config_manager.get_setting('wall_defender_count', default=4))
+        self.distance = config_manager.get_setting('wall_distance', default=9.15)
+        defender_width = config_manager.get_setting('wall_defender_width', default=0.6)
+        defender_height = config_manager.get_setting('wall_defender_height', default=1.85)
+
+        # Unit vector from the ball towards the goal centre, and the wall's direction across it
+        to_goal_length = math.hypot(ball_x, ball_y)
+        dir_x, dir_y = -ball_x / to_goal_length, -ball_y / to_goal_length
+        across_x, across_y = -dir_y, dir_x
+        center_x = ball_x + dir_x * self.distance
+        center_y = ball_y + dir_y * self.distance
+
+        self.defenders = []
+        for i in range(self.defender_count):
+            offset = (i - (self.defender_count - 1) / 2) * defender_width
+            self.defenders.append(Defender(center_x + across_x * offset, center_y + across_y * offset,
+                                           defender_width, defender_height))
+
+        self.grid = UniformGrid(GRID_CELL_SIZE)
+        for defender_id, defender in enumerate(self.defenders):
+            self.grid.insert(defender_id, defender.left_bound, defender.world_pos.y - WALL_SWEEP_MARGIN,
+                             defender.right_bound, defender.world_pos.y + DEFENDER_TOLERANCE)
+        self._arrays = None # NumPy copies of the defender bounds for deflect_many
+        print(f"Defensive wall of {self.defender_count} at ({center_x:.1f}, {center_y:.1f})")
+
+    def find_hit(self, ball, dt):
+        """Returns the defender the ball hit during the last step of length dt, or None."""
+        if ball.velocity.y >= 0: # Only balls moving towards the goal, as for the goalkeeper
+            return None
+        x, y, z = ball.world_pos.x, ball.world_pos.y, ball.world_pos.z
+        prev_y = y - ball.velocity.y * dt
+        for defender_id in self.grid.query(x, y):
+            defender = self.defenders[defender_id]
+            plane_y = defender.world_pos.y
+            # Ball is at the defender now, or crossed its plane during this step
+            if not (abs(y - plane_y) <= DEFENDER_TOLERANCE or prev_y >= plane_y >= y):
+                continue
+            if defender.left_bound <= x <= defender.right_bound and defender.bottom_bound <= z <= defender.top_bound:
+                return defender
+        return None
+
+    def deflect(self, ball, defender):
+        """Goalkeeper.save_ball() deflection, relative to the defender that was hit"""
+        ball.velocity.y = abs(ball.velocity.y) * 0.8
+        ball.velocity.x += (ball.world_pos.x - defender.world_pos.x) * 2.0
+        ball.velocity.z += 1.0
+        # Keep the ball on the kicker's side of the wall
+        ball.world_pos.y = max(ball.world_pos.y, defender.world_pos.y + DEFENDER_TOLERANCE)
+        print(f"BLOCKED! Wall deflected ball at x={ball.world_pos.x:.2f}")
+
+    def check_and_deflect(self, ball, dt):
+        defender = self.find_hit(ball, dt)
+        if defender is None:
+            return False
+        self.deflect(ball, defender)
+        return True
+
+    def deflect_many(self, position, velocity, active, dt):
+        """
+        Barrage version of check_and_deflect for (N, 3) NumPy position/velocity arrays.
+        Returns the boolean mask of balls that were deflected.
+        """
+        if self._arrays is None:
+            self._arrays = tuple(np.array([getattr(d, name) for d in self.defenders]) for name in
+                                 ('left_bound', 'right_bound', 'bottom_bound', 'top_bound'))
+            self._plane_y = np.array([d.world_pos.y for d in self.defenders])
+            self._center_x = np.array([d.world_pos.x for d in self.defenders])
+        left, right, bottom, top = self._arrays
+
+        x, y, z = position[:, 0], position[:, 1], position[:, 2]
+        prev_y = y - velocity[:, 1] * dt
+        candidates = self.grid.query_many(x, y) # (N, K), -1 padded
+        ids = np.maximum(candidates, 0)
+        plane_y = self._plane_y[ids]
+        hit = (candidates >= 0) & (active & (velocity[:, 1] < 0))[:, None] & \
+              ((np.abs(y[:, None] - plane_y) <= DEFENDER_TOLERANCE) |
+               ((prev_y[:, None] >= plane_y) & (plane_y >= y[:, None]))) & \
+              (left[ids] <= x[:, None]) & (x[:, None] <= right[ids]) & \
+              (bottom[ids] <= z[:, None]) & (z[:, None] <= top[ids])
+        blocked = hit.any(axis=1)
+        if blocked.any():
+            first = ids[blocked, np.argmax(hit[blocked], axis=1)]
+            velocity[blocked, 1] = np.abs(velocity[blocked, 1]) * 0.8
+            velocity[blocked, 0] += (x[blocked] - self._center_x[first]) * 2.0
+            velocity[blocked, 2] += 1.0
+            position[blocked, 1] = np.maximum(y[blocked], self._plane_y[first] + DEFENDER_TOLERANCE)
+        return blocked
+
+    def draw(self, screen, camera):
+        for defender in self.defenders:
+            defender.draw(screen, camera)
@@ -0,0 +1,63 @@
+import math
+from .config import config_manager
+
+# Settings of the broadcast-style follow camera
+FOLLOW_CAMERA_SETTING_KEYS = ('follow_camera_enabled', 'follow_camera_pan', 'follow_camera_distance',
+                              'follow_camera_min_y', 'follow_camera_track_time', 'follow_camera_return_time')
+
+MIN_SPEED = 1.5 # Metres per second; the end of an ease is linear, so the camera settles in finite time
+
+class FollowCamera:
+    """
+    Broadcast-style camera work on top of Camera: while the ball is in flight the camera
+    pans towards it and dollies in behind it (never closer to the goal than
+    follow_camera_min_y), and afterwards it eases back to the configured view. Both
+    moves are exponential easing with the given time constants (frame rate independent),
+    finishing at MIN_SPEED so the camera comes to rest exactly on its target and the
+    cached background for that view can be used again. Only the position moves; the
+    downlook and field of view stay.
+    """
+
+    def __init__(self, camera, allowed=True):
+        self.camera = camera
+        self.allowed = allowed # False keeps the configured view whatever follow_camera_enabled says
+        self.moved = False # Whether the last update moved the camera (cached layers are then stale)
+        self.reload_config()
+        config_manager.subscribe(self.on_config_changed, FOLLOW_CAMERA_SETTING_KEYS)
+
+    def on_config_changed(self, changed_keys):
+        self.reload_config()
+
+    def reload_config(self):
+        self.enabled = self.allowed and config_manager.get_setting('follow_camera_enabled', default=True)
+        self.pan = config_manager.get_setting('follow_camera_pan', default=0.5)           # Share of the ball's x to follow
+        self.distance = config_manager.get_setting('follow_camera_distance', default=25.0) # Metres behind the ball
+        self.min_y = config_manager.get_setting('follow_camera_min_y', default=35.0)
+        self.track_time = config_manager.get_setting('follow_camera_track_time', default=0.35)
+        self.return_time = config_manager.get_setting('follow_camera_return_time', default=0.6)
+
+    def target_position(self, ball, tracking):
+        base_x, base_y, base_z = self.camera.base_position
+        if not (tracking and self.enabled):
+            return base_x, base_y, base_z
+        x = base_x + (ball.world_pos.x - base_x) * self.pan
+        y = min(base_y, max(self.min_y, ball.world_pos.y + self.distance))
+        return x, y, base_z
+
+    def update(self, dt, ball, tracking):
+        """Eases the camera towards the ball (tracking) or back to the configured view."""
+        target = self.target_position(ball, tracking)
+        time_constant = self.track_time if tracking else self.return_time
+        blend = 1.0 - math.exp(-dt / time_constant) if time_constant > 0 else 1.0
+        distance = math.dist(self.camera.position, target)
+        step = max(distance * blend, MIN_SPEED * dt)
+        if step >= distance:
+            position = target
+        else:
+            position = [p + (t - p) * (step / distance) for p, t in zip(self.camera.position, target)]
+        self.moved = self.camera.set_pose(*position)
+
+    def reset(self):
+        """Jumps straight to the configured view (e.g. before replaying a recorded kick)."""
+        self.camera.set_pose(*self.camera.base_position, downlook_degrees=self.camera.base_downlook_degrees)
+        self.moved = False # A cut, not a camera move: the new view is baked in full
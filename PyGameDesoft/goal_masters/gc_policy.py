@@ -0,0 +1,131 @@
+"""
+Goal Masters - Garbage collection policy and hitch detection for the frame loops.
+
+Python's cyclic garbage collector runs whenever enough container objects have
+been allocated, which can be in the middle of a kick and cost several
+milliseconds. With the "managed" policy (gc_policy in config.json) a loop:
+
+- collects once and then freezes everything loaded so far (gc.freeze()), so the
+  assets and long-lived objects are never scanned again;
+- turns automatic collection off, and runs the collections itself: during idle
+  frames (ball placement, aiming, celebrations, menus) at most one generation
+  per frame, when that generation is due; during active play (ball in flight)
+  only an emergency young collection if garbage piles up.
+
+The "default" policy leaves Python's automatic collection alone. Either way the
+GC callbacks time every collection, so the HitchDetector can report how much of
+a slow frame was spent collecting.
+"""
+
+import gc
+import time
+from .config import config_manager
+
+POLICY_MANAGED = "managed"
+POLICY_DEFAULT = "default"
+
+PLAY_YOUNG_LIMIT = 20000 # Objects allocated during active play before a young collection is forced anyway
+HITCH_SUMMARY_EVERY = 600 # Frames between the "hitches so far" summary lines
+
+
+class GCPolicy:
+    def __init__(self, mode=None):
+        self.mode = mode or config_manager.get_setting('gc_policy', default=POLICY_MANAGED)
+        self.thresholds = gc.get_threshold() # Generation thresholds used to decide when a collection is due
+        self.was_enabled = None
+        self.frozen_before = 0 # Objects an enclosing loop (e.g. the menu around a game) had frozen
+        self.collection_start = None
+        # Collector activity during the current frame
+        self.frame_gc_seconds = 0.0
+        self.frame_collections = [0, 0, 0]
+
+    @property
+    def managed(self):
+        return self.mode == POLICY_MANAGED
+
+    def start(self):
+        """Call once the loop's assets are loaded."""
+        gc.callbacks.append(self.on_collection)
+        if self.managed:
+            self.frozen_before = gc.get_freeze_count()
+            gc.collect()
+            gc.freeze() # Everything alive now (assets, caches, the game itself) stays out of future scans
+            self.was_enabled = gc.isenabled()
+            gc.disable()
+            print(f"GC policy: managed ({gc.get_freeze_count()} objects frozen)")
+
+    def stop(self):
+        if self.on_collection in gc.callbacks:
+            gc.callbacks.remove(self.on_collection)
+        if self.managed:
+            # Frozen objects are never collected: release what this loop froze (a finished game is
+            # garbage now), then freeze again whatever an enclosing loop still holds
+            gc.unfreeze()
+            gc.collect()
+            if self.frozen_before:
+                gc.freeze()
+            if self.was_enabled:
+                gc.enable() # Back to whatever the enclosing loop had
+
+    def on_collection(self, phase, info):
+        if phase == "start":
+            self.collection_start = time.perf_counter()
+        elif self.collection_start is not None:
+            self.frame_gc_seconds += time.perf_counter() - self.collection_start
+            self.frame_collections[info["generation"]] += 1
+            self.collection_start = None
+
+    def begin_frame(self):
+        self.frame_gc_seconds = 0.0
+        self.frame_collections[:] = (0, 0, 0)
+
+    def end_frame(self, idle):
+        """Runs the collections the managed policy does itself (nothing under the default policy)."""
+        if not self.managed:
+            return
+        counts = gc.get_count()
+        if not idle:
+            if counts[0] > PLAY_YOUNG_LIMIT:
+                gc.collect(0)
+            return
+        # Like the automatic collector's thresholds, but only in idle frames and one generation per frame
+        for generation in (2, 1, 0):
+            if counts[generation] >= self.thresholds[generation]:
+                gc.collect(generation)
+                return
+
+
+class HitchDetector:
+    """Logs frames whose busy time exceeds the frame budget, with what the collector did in them."""
+
+    def __init__(self, gc_policy, budget_seconds=None):
+        self.gc_policy = gc_policy
+        if budget_seconds is None:
+            budget_ms = config_manager.get_setting('hitch_budget_ms', default=None)
+            if budget_ms is None:
+                budget_ms = 1000.0 / config_manager.get_setting('render_target_fps', default=60)
+            budget_seconds = budget_ms / 1000.0
+        self.budget = budget_seconds
+        self.enabled = config_manager.get_setting('hitch_log', default=True)
+        self.frames = 0
+        self.hitches = 0
+        self.gc_hitches = 0 # Hitches in which a collection ran
+
+    def record_frame(self, busy_seconds, state):
+        self.frames += 1
+        if busy_seconds > self.budget:
+            self.hitches += 1
+            policy = self.gc_policy
+            if policy.frame_gc_seconds > 0:
+                self.gc_hitches += 1
+            if self.enabled:
+                gen0, gen1, gen2 = policy.frame_collections
+                print(f"Hitch: {busy_seconds * 1000:.1f} ms frame (budget {self.budget * 1000:.1f} ms) in {state}; "
+                      f"GC {policy.frame_gc_seconds * 1000:.1f} ms, collections gen0/1/2 {gen0}/{gen1}/{gen2}, "
+                      f"counts {gc.get_count()}, frozen {gc.get_freeze_count()}")
+        if self.enabled and self.frames % HITCH_SUMMARY_EVERY == 0 and self.hitches:
+            print(self.summary())
+
+    def summary(self):
+        return (f"Hitches: {self.hitches} of {self.frames} frames over {self.budget * 1000:.1f} ms "
+                f"({self.gc_hitches} with a garbage collection)")
@@ -0,0 +1,212 @@
+"""
+Goal Masters - Scripted input for headless simulation.
+
+Each helper is a generator that yields one list of pygame events per simulated
+frame, so helpers can be chained with `yield from` into a full session script:
+
+    def script(game):
+        yield from place_ball(game, 2.0, 28.0)
+        yield from aim(game, 6.0)
+        yield from move_contact(game, dx_steps=-3, dz_steps=-2)
+        yield from hold_space(game, 0.6)
+        yield from wait_for_state(game, "placing_ball")
+
+    result = Game(headless=True).run_headless(script)
+
+Usage as a soak test (from the PyGameDesoft directory):
+    python -m goal_masters.headless --kicks 500 --render
+    python -m goal_masters.headless --check-kick-timing
+"""
+
+import os
+
+# Select the dummy drivers before pygame initialises (no effect if already initialised)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import json
+import math
+import random
+import sys
+
+import pygame
+
+from . import constants
+
+FRAME_DT = 1.0 / 60.0
+PLAYER_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "player.json")
+
+
+def key_down(key):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+
+def key_up(key):
+    return pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0)
+
+
+def mouse_click(pos, button=1):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button)
+
+
+def mouse_move(pos):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+
+
+def idle(frames=1):
+    """Yields `frames` frames without input."""
+    for _ in range(frames):
+        yield []
+
+
+def wait(seconds, dt=FRAME_DT):
+    """Yields empty frames for the given simulated duration."""
+    yield from idle(max(1, round(seconds / dt)))
+
+
+def press(key):
+    """Presses and releases a key within one frame."""
+    yield [key_down(key), key_up(key)]
+
+
+def place_ball(game, world_x, world_y, confirm=True):
+    """Clicks the pitch where (world_x, world_y) projects on screen, then confirms with Enter."""
+    screen_pos = game.render_target.to_window(game.camera.world_to_screen(world_x, world_y, constants.BALL_RADIUS))
+    yield [mouse_move(screen_pos), mouse_click(screen_pos)]
+    if confirm:
+        yield from press(pygame.K_RETURN)
+
+
+def aim(game, target_deg):
+    """Taps the arrow keys until the aim angle is as close as possible to target_deg."""
+    step = constants.ARROW_KEY_INCREMENT_DEG
+    presses = round((target_deg - game.aim_angle) / step)
+    key = pygame.K_RIGHT if presses > 0 else pygame.K_LEFT
+    for _ in range(abs(presses)):
+        yield from press(key)
+
+
+def move_contact(game, dx_steps=0, dz_steps=0):
+    """Moves the contact pointer with WASD; positive steps are right (D) and up (W)."""
+    for _ in range(abs(dx_steps)):
+        yield from press(pygame.K_d if dx_steps > 0 else pygame.K_a)
+    for _ in range(abs(dz_steps)):
+        yield from press(pygame.K_w if dz_steps > 0 else pygame.K_s)
+
+
+def hold_space(game, seconds, dt=FRAME_DT):
+    """Holds space for the given duration to charge the power bar, then releases it."""
+    yield [key_down(pygame.K_SPACE)]
+    yield from wait(seconds, dt)
+    yield [key_up(pygame.K_SPACE)]
+
+
+def wait_for_state(game, state, timeout=30.0, dt=FRAME_DT):
+    """Idles until game.game_state equals `state` (or the timeout elapses)."""
+    frames_left = round(timeout / dt)
+    while game.game_state != state and frames_left > 0:
+        frames_left -= 1
+        yield []
+
+
+def kick(game, world_x, world_y, aim_deg=0.0, contact=(0, 0), hold_seconds=0.5, timeout=10.0):
+    """
+    A full attempt: place, aim, set contact, charge and wait for the scene to reset.
+    Balls that stop short or are saved never reset on their own, so after `timeout`
+    seconds the script presses R, as a player would.
+    """
+    yield from place_ball(game, world_x, world_y)
+    yield from aim(game, aim_deg)
+    yield from move_contact(game, *contact)
+    yield from hold_space(game, hold_seconds)
+    yield from wait_for_state(game, "placing_ball", timeout)
+    if game.game_state != "placing_ball":
+        yield from press(pygame.K_r)
+
+
+def random_session(kicks, seed=None):
+    """Returns a script of `kicks` attempts with randomised placement, aim, contact and power."""
+    rng = random.Random(seed)
+
+    def script(game):
+        for _ in range(kicks):
+            world_x = rng.uniform(-15.0, 15.0)
+            world_y = rng.uniform(constants.SPAWN_Y_MIN + 0.5, 45.0)
+            # Aim roughly at the goal from the placement, with some spread
+            aim_deg = -world_x / world_y * 57.3 + rng.uniform(-8.0, 8.0)
+            contact = (rng.randint(-5, 5), rng.randint(-5, 5))
+            yield from kick(game, world_x, world_y, aim_deg, contact, rng.uniform(0.1, 1.2))
+    return script
+
+
+def kick_timing_check(player_config, player="Elvis", rates=(30, 60, 144), press=0.05, release=0.495):
+    """
+    Presses and releases space at the same timestamps at several frame rates and returns
+    the ball position at the first frame after the release, per rate. With the defaults the
+    release falls in the last frame before t=0.5 at 30, 60 and 144 FPS, so the kick frame
+    ends at t=0.5 for every rate and the positions must match.
+    """
+    from .main import Game
+    positions = {}
+    for fps in rates:
+        random.seed(0) # The knuckle effect is random
+        game = Game(player, player_config, headless=True)
+        game.place_ball_at_position(0.0, 25.0)
+        game.game_state = "ready_to_kick"
+        script = [(press, key_down(pygame.K_SPACE)), (release, key_up(pygame.K_SPACE))]
+        dt = 1.0 / fps
+        frame = 0
+        while game.game_state == "ready_to_kick":
+            frame_end = (frame + 1) * dt # Exact frame instants, so every rate reaches t=0.5
+            game.process_events([item for item in script if frame * dt < item[0] <= frame_end])
+            game.update(frame_end - game.sim_time)
+            frame += 1
+        positions[fps] = tuple(game.ball.world_pos)
+    return positions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a headless Goal Masters session with random kicks")
+    parser.add_argument("--kicks", type=int, default=100, help="Number of attempts to simulate")
+    parser.add_argument("--player", default="Elvis", help="Character from player.json")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the session script")
+    parser.add_argument("--render", action="store_true", help="Also render every frame offscreen")
+    parser.add_argument("--verbose", action="store_true", help="Show the game's own log output")
+    parser.add_argument("--check-kick-timing", action="store_true",
+                        help="Check that a kick from the same input timestamps flies the same at 30, 60 and 144 FPS")
+    args = parser.parse_args(argv)
+
+    from .main import Game
+
+    with open(PLAYER_CONFIG_FILE, "r") as f:
+        player_config = json.load(f)
+
+    if args.check_kick_timing:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            positions = kick_timing_check(player_config, args.player)
+        for fps, position in positions.items():
+            print(f"{fps:>4} FPS: ball at ({position[0]:.6f}, {position[1]:.6f}, {position[2]:.6f})")
+        reference = next(iter(positions.values()))
+        same = all(math.dist(position, reference) < 1e-6 for position in positions.values())
+        print("Same position at every frame rate." if same else "Kick depends on the frame rate.")
+        pygame.quit()
+        return 0 if same else 1
+
+    with open(os.devnull, "w") as devnull:
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull)
+        with quiet:
+            game = Game(args.player, player_config, headless=True)
+            result = game.run_headless(random_session(args.kicks, args.seed), render=args.render)
+
+    stats = game.simulation_stats
+    print(f"Result: {result}")
+    print(f"{stats['frames']} frames ({stats['simulated_seconds']:.1f}s simulated) in "
+          f"{stats['wall_seconds']:.2f}s -> {stats['frames_per_second']:.0f} simulated FPS")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Goal Masters - Instant replay.
+
+Every simulation tick the game records the ball and goalkeeper state into a
+ReplayBuffer: a fixed-capacity ring buffer over one preallocated array of floats,
+so recording never allocates and memory use is the same after ten kicks or ten
+thousand. After a goal or a save, InstantReplay plays the last few seconds back,
+at normal speed or in slow motion, interpolating between the recorded ticks.
+"""
+
+import bisect
+from array import array
+
+# Fields of one sample, in storage order
+T, BALL_X, BALL_Y, BALL_Z, BALL_SPIN, KEEPER_X, KEEPER_Y, KEEPER_Z = range(8)
+SAMPLE_FIELDS = 8
+
+MAX_TICK_RATE = 120 # Ticks per second the buffer is sized for (the game loop runs at 60)
+
+
+class ReplayBuffer:
+    def __init__(self, seconds):
+        """Keeps at least the last `seconds` of ticks (at up to MAX_TICK_RATE ticks per second)."""
+        self.capacity = max(2, int(seconds * MAX_TICK_RATE))
+        self.data = array('d', bytes(8 * SAMPLE_FIELDS * self.capacity)) # Preallocated, zero-filled
+        self.start = 0  # Slot of the oldest sample
+        self.count = 0
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+
+    def record(self, t, ball, goalkeeper):
+        """Stores one tick, overwriting the oldest sample once the buffer is full."""
+        if self.count < self.capacity:
+            slot = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        base = slot * SAMPLE_FIELDS
+        data = self.data
+        data[base + T] = t
+        data[base + BALL_X] = ball.world_pos.x
+        data[base + BALL_Y] = ball.world_pos.y
+        data[base + BALL_Z] = ball.world_pos.z
+        data[base + BALL_SPIN] = ball.spin_angle
+        data[base + KEEPER_X] = goalkeeper.world_pos.x
+        data[base + KEEPER_Y] = goalkeeper.world_pos.y
+        data[base + KEEPER_Z] = goalkeeper.world_pos.z
+
+    def _offset(self, i):
+        """Array offset of the i-th oldest sample."""
+        return ((self.start + i) % self.capacity) * SAMPLE_FIELDS
+
+    def time_at(self, i):
+        return self.data[self._offset(i) + T]
+
+    @property
+    def start_time(self):
+        return self.time_at(0) if self.count else 0.0
+
+    @property
+    def end_time(self):
+        return self.time_at(self.count - 1) if self.count else 0.0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        # Lets bisect search the samples by time, oldest first
+        return self.time_at(i)
+
+    def sample(self, t):
+        """
+        The state at time `t`, interpolated between the two recorded ticks around it
+        (clamped to the recorded range): a list indexed by the field constants.
+        """
+        if self.count == 0:
+            raise ValueError("empty replay buffer")
+        i = bisect.bisect_right(self, t, 0, self.count)
+        if i == 0:
+            return self.data[self._offset(0):self._offset(0) + SAMPLE_FIELDS].tolist()
+        if i == self.count:
+            last = self._offset(self.count - 1)
+            return self.data[last:last + SAMPLE_FIELDS].tolist()
+        a = self._offset(i - 1)
+        b = self._offset(i)
+        data = self.data
+        t0, t1 = data[a + T], data[b + T]
+        f = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+        state = [data[a + k] + (data[b + k] - data[a + k]) * f for k in range(SAMPLE_FIELDS)]
+        # The spin angle wraps at 360 degrees: interpolate along the short way round
+        spin_delta = (data[b + BALL_SPIN] - data[a + BALL_SPIN] + 180.0) % 360.0 - 180.0
+        state[BALL_SPIN] = (data[a + BALL_SPIN] + spin_delta * f) % 360.0
+        return state
+
+
+class InstantReplay:
+    def __init__(self, buffer, start_time, end_time, speed=1.0):
+        """Plays the buffer from start_time to end_time (game seconds), `speed` replay seconds per game second."""
+        self.buffer = buffer
+        self.start_time = max(start_time, buffer.start_time)
+        self.end_time = min(end_time, buffer.end_time)
+        self.speed = speed
+        self.time = self.start_time
+
+    @property
+    def finished(self):
+        return self.time >= self.end_time
+
+    def update(self, dt, ball, goalkeeper):
+        """Advances playback by `dt` real seconds and poses the ball and goalkeeper."""
+        self.time = min(self.end_time, self.time + dt * self.speed)
+        state = self.buffer.sample(self.time)
+        ball.world_pos.xyz = (state[BALL_X], state[BALL_Y], state[BALL_Z])
+        ball.spin_angle = state[BALL_SPIN]
+        goalkeeper.world_pos.xyz = (state[KEEPER_X], state[KEEPER_Y], state[KEEPER_Z])
@@ -3,13 +3,57 @@ import sys
 import math
 import json
 import os
+import time
 from . import constants
 from .config import config_manager
 from .camera import Camera
+from .follow_camera import FollowCamera
+from .render_target import RenderTarget
 from .entities.ball import Ball
 from .entities.goalkeeper import Goalkeeper
+from .entities.wall import DefensiveWall
 from .ui.powerbar import PowerBar
 from .ui.contact_selector import ContactSelector
+from .ui.trajectory_preview import TrajectoryPreview
+from .ui.memory_overlay import MemoryOverlay
+from .capture import FrameCapture
+from .instant_replay import ReplayBuffer, InstantReplay
+from .gc_policy import GCPolicy, HitchDetector
+from .memory_registry import memory_registry
+from .metrics import frame_metrics, start_exporter
+from . import assets
+from .analytics import distance_band, OUTCOME_GOAL, OUTCOME_SAVE, OUTCOME_MISS, OUTCOME_SHORT
+
+try:
+    from .entities.ball_store import BallStore # Barrage training mode needs NumPy
+except ImportError as e:
+    print(f"Barrage mode unavailable: {e}")
+    BallStore = None
+
+try:
+    from .perspective import PerspectiveBackground, NOMINAL_SECONDS_PER_PIXEL # Textured pitch and crowd need NumPy
+except ImportError as e:
+    print(f"Textured background unavailable: {e}")
+    PerspectiveBackground = None
+
+# States in which the follow camera tracks the ball (otherwise it eases back to the configured view)
+FOLLOW_CAMERA_STATES = ("ball_kicked", "past_goal_line", "goal_scored")
+
+# Instant replay: states recorded into the replay buffer, and how the replay window is cut
+REPLAY_RECORDED_STATES = ("ready_to_kick", "ball_kicked", "past_goal_line", "goal_scored")
+REPLAY_BUFFER_SECONDS = 8.0    # Covers the replayed seconds plus the 2-second goal celebration
+REPLAY_LEAD_IN = 0.3           # Seconds before the kick that the replay may show
+REPLAY_AFTER_EVENT = 0.75      # Seconds after the goal or save that the replay shows
+SAVE_REPLAY_DELAY = 1.0        # Seconds of the deflection shown live before a save is replayed
+
+# States of active play: the managed GC policy runs no collections in them (see gc_policy.py)
+GC_ACTIVE_STATES = ("ball_kicked", "past_goal_line", "barrage", "instant_replay")
+
+# Input timing: run() drains the event queue while it waits for the next frame, so every
+# event is stamped within about a millisecond of when it arrived rather than at the next frame
+FRAME_RATE = 60
+INPUT_POLL_INTERVAL = 0.001    # Seconds between event queue polls while waiting
+MAX_KICK_CATCH_UP = 0.1        # Longest flight advanced at once for a kick that happened between frames
 
 # Define HUD positions (can be moved to constants.py later if preferred)
 HUD_POWER_BAR_WIDTH = 200
@@ -22,24 +66,44 @@ HUD_CONTACT_SELECTOR_MARGIN = 20
 HUD_CONTACT_SELECTOR_X = constants.SCREEN_WIDTH - HUD_CONTACT_SELECTOR_RADIUS - HUD_CONTACT_SELECTOR_MARGIN
 HUD_CONTACT_SELECTOR_Y = HUD_CONTACT_SELECTOR_RADIUS + HUD_CONTACT_SELECTOR_MARGIN
 
+# Character stats file, watched for hot reload while a session runs
+PLAYER_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "player.json")
+
 # Coin display settings
 COIN_SIZE = 32  # Size of the coin image in pixels
 COIN_MARGIN = 10  # Margin from the screen edges
 COIN_FONT_SIZE = 24  # Size of the coin count text
 
 class Game:
-    def __init__(self, selected_player="Elvis", player_config=None):
+    def __init__(self, selected_player="Elvis", player_config=None, headless=False, player_store=None, analytics=None,
+                 follow_camera_enabled=None):
         pygame.init()
-        self.screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
-        pygame.display.set_caption("Goal Masters")
+        # Headless mode renders into an offscreen surface and never touches the window,
+        # the event queue or the audio device (see run_headless()).
+        self.headless = headless
+        if self.headless:
+            self.screen = memory_registry.track(pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)),
+                                                "game", "headless screen")
+        else:
+            self.screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
+            pygame.display.set_caption("Goal Masters")
         self.clock = pygame.time.Clock()
         self.running = True
+        self.mouse_pos = (0, 0) # Last known mouse position (scripted in headless mode)
+        self.simulation_stats = {} # Frames/time of the last run_headless() call
 
         # Player configuration
         self.selected_player = selected_player
         self.player_config = player_config or self.load_default_player_config()
         self.apply_player_config()
 
+        # Optional PlayerDataStore: goals and attempts are journaled as they happen,
+        # so a crash mid-session does not lose them
+        self.player_store = player_store
+        # Optional ShotAnalytics: every kick and its outcome is queued for the shots database
+        self.analytics = analytics
+        self.current_shot = None # Kick parameters of the shot in flight, until its outcome is known
+
         # Game statistics
         self.goals_scored = 0
         self.attempts_made = 0
@@ -48,28 +112,49 @@ class Game:
         # Load coin image and set coin count
         try:
             coin_image_path = os.path.join(os.path.dirname(__file__), "..", "imagens", "moeda.png")
-            self.coin_image = pygame.image.load(coin_image_path)
-            self.coin_image = pygame.transform.scale(self.coin_image, (COIN_SIZE, COIN_SIZE))
+            self.coin_image = pygame.transform.scale(assets.load_image(coin_image_path), (COIN_SIZE, COIN_SIZE))
         except:
             # If coin image is not found, create a simple yellow circle
             self.coin_image = pygame.Surface((COIN_SIZE, COIN_SIZE), pygame.SRCALPHA)
             pygame.draw.circle(self.coin_image, (255, 255, 0), (COIN_SIZE//2, COIN_SIZE//2), COIN_SIZE//2)
+        memory_registry.track(self.coin_image, "hud", "coin")
 
         # Load stadium crowd image
         try:
             crowd_image_path = os.path.join(os.path.dirname(__file__), "..", "imagens", "Stadium Crowd Wide from Yashin Request.png")
-            self.stadium_crowd_image = pygame.image.load(crowd_image_path).convert_alpha()
+            self.stadium_crowd_image = assets.load_image(crowd_image_path, convert_alpha=True) # Shared by every Game
             print(f"Stadium crowd image loaded: {self.stadium_crowd_image.get_size()}")
         except Exception as e:
             print(f"Failed to load stadium crowd image: {e}")
             self.stadium_crowd_image = None
 
         self.camera = Camera()
+        # Tracks the ball in flight, then eases back. Off by default in headless runs: every camera move
+        # re-bakes the background, and scripted sessions and soak tests want the cached static view
+        if follow_camera_enabled is None:
+            follow_camera_enabled = not headless
+        self.follow_camera = FollowCamera(self.camera, allowed=follow_camera_enabled)
+        # World render target; its resolution follows the frame time (fixed in headless mode)
+        self.render_target = RenderTarget((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT), self.camera,
+                                          adaptive=not self.headless)
+        # Static background (crowd, pitch lines, goal frame), rebuilt only when the camera changes
+        self.background_layer = None
+        self.background_camera_version = None
+        self.background_complete = False # False while the layer shows a preview of the textured background
+        self.pitch_geometry = self.build_pitch_geometry()
+        self.placement_preview_surfaces = {} # Preview radius (pixels) -> semi-transparent ball
+        # Perspective-mapped grass and crowd, baked per camera configuration (flat colours without NumPy)
+        self.perspective_background = None
+        if PerspectiveBackground is not None and config_manager.get_setting('textured_background', default=True):
+            self.perspective_background = PerspectiveBackground(self.stadium_crowd_image)
+        config_manager.watch_file(PLAYER_CONFIG_FILE, self.on_player_config_file_changed)
         self.ball = Ball()
         self.goalkeeper = Goalkeeper()
         self.power_bar = PowerBar(HUD_POWER_BAR_X, HUD_POWER_BAR_Y, HUD_POWER_BAR_WIDTH, HUD_POWER_BAR_HEIGHT)
         self.contact_selector = ContactSelector(HUD_CONTACT_SELECTOR_X, HUD_CONTACT_SELECTOR_Y, 
                                               HUD_CONTACT_SELECTOR_RADIUS, constants.BALL_RADIUS)
+        self.trajectory_preview = TrajectoryPreview(self.ball) # Toggled with T
+        self.memory_overlay = MemoryOverlay(COIN_MARGIN, COIN_SIZE + 2 * COIN_MARGIN) # Toggled with M
 
         self.aim_angle = 0  # Horizontal aim in degrees
         self.kick_angle_rad = 0.0 # Added for arrow rendering
@@ -79,13 +164,47 @@ class Game:
         self.past_line_timer = 0.0
         self.past_line_display_time = 3.0 # Seconds before reset when ball crosses goal line without scoring
         self.time_since_kick = 0.0 # Timer to track time since last kick. May not be needed with new reset logic.
+        # Instant replay after goals and saves (off in headless runs, so scripted sessions keep their timing)
+        self.sim_time = 0.0
+        self.kick_time = 0.0
+        self.replay_buffer = ReplayBuffer(REPLAY_BUFFER_SECONDS)
+        self.instant_replay = None
+        self.replay_event_time = None # When the goal or save to replay happened
+        self.replay_camera_cut = False
+        self.instant_replay_enabled = (not headless and
+                                       config_manager.get_setting('instant_replay_enabled', default=True))
+        # Clock that input timestamps come from: real time in run(), the simulation clock otherwise
+        self.input_clock = None
+        self.pending_input = [] # (timestamp, event) pairs drained from the queue between frames
+        self.pending_kick_time = None # Kick instant of a space release, kicked in the next update()
         self.kick_y_position = 0.0 # Store Y-coordinate of the ball at the time of kick
         self.last_awarded_coins = 0 # Store the amount of coins awarded for the last goal
+        self.barrage = None # BallStore while in the "barrage" training mode
+        self.wall_enabled = False # Toggled with F; the wall is built when the ball placement is confirmed
+        self.wall = None
+        self.frame_capture = None # FrameCapture while capture is on (C key, or capture_enabled in config.json)
+        self.capture_recording = False # Whether the last rendered frame went into a clip
+        self.capture_status_font = pygame.font.Font(None, 24)
+        self.capture_status_key = None # (queue depth, dropped, saved, recording) the cached REC text shows
+        self.capture_status_text = None
+
+        self.goal_sound = None
+        self.kick_sound = None
+        if not self.headless:
+            self.load_sounds()
+
+        if not self.headless and config_manager.get_setting('capture_enabled', default=False):
+            self.start_capture() # Always-on capture (e.g. on the showroom machine)
+
+        print(f"Game Initialized with player: {selected_player}")
+        print(f"Ball initial world position: {self.ball.world_pos}")
 
+    def load_sounds(self):
+        """Load the goal and kick sounds (skipped in headless mode)"""
         # Load goal sound
         try:
             goal_sound_path = os.path.join(os.path.dirname(__file__), "..", "imagens", "galvao-bueno-olha-o-gol.mp3")
-            self.goal_sound = pygame.mixer.Sound(goal_sound_path)
+            self.goal_sound = assets.load_sound(goal_sound_path)
             print("Goal sound loaded successfully.")
         except pygame.error as e:
             print(f"Failed to load goal sound: {e}")
@@ -94,15 +213,12 @@ class Game:
         # Load kick sound
         try:
             kick_sound_path = os.path.join(os.path.dirname(__file__), "..", "imagens", "ChuteGoal.mp3")
-            self.kick_sound = pygame.mixer.Sound(kick_sound_path)
+            self.kick_sound = assets.load_sound(kick_sound_path)
             print("Kick sound loaded successfully.")
         except pygame.error as e:
             print(f"Failed to load kick sound: {e}")
             self.kick_sound = None
 
-        print(f"Game Initialized with player: {selected_player}")
-        print(f"Ball initial world position: {self.ball.world_pos}")
-
     def load_default_player_config(self):
         """Load default player configuration if not provided"""
         default_config = {
@@ -118,16 +234,41 @@ class Game:
         """Apply the selected player's configuration to the game"""
         if self.selected_player in self.player_config:
             player_stats = self.player_config[self.selected_player]
-            # Update config manager with player-specific values
-            config_manager.settings['min_kick_strength'] = player_stats['min_kick_strength']
-            config_manager.settings['max_kick_strength'] = player_stats['max_kick_strength']
-            config_manager.settings['max_kick_curve'] = player_stats['max_kick_curve']
+            # Update config manager with player-specific values (kept across config.json reloads)
+            config_manager.set_overrides({
+                'min_kick_strength': player_stats['min_kick_strength'],
+                'max_kick_strength': player_stats['max_kick_strength'],
+                'max_kick_curve': player_stats['max_kick_curve'],
+            })
             print(f"Applied {self.selected_player} config: Min Strength: {player_stats['min_kick_strength']}, Max Strength: {player_stats['max_kick_strength']}, Max Curve: {player_stats['max_kick_curve']}")
 
+    def on_player_config_file_changed(self, path):
+        """Hot reload of player.json: re-applies the selected player's stats without a reset"""
+        try:
+            with open(path, 'r') as f:
+                new_player_config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Player config hot reload skipped ({e}); keeping current stats.")
+            return
+        # Update in place so callers holding the same dict (the menu) see the new values too
+        self.player_config.clear()
+        self.player_config.update(new_player_config)
+        self.apply_player_config()
+
     def reset_for_kick(self):
+        if self.current_shot is not None:
+            self.finish_shot(OUTCOME_SHORT) # Reset before the ball reached the goal line
+        if self.instant_replay is not None:
+            self.instant_replay = None
+            if self.replay_camera_cut:
+                self.follow_camera.reset() # Cut back from the replay camera
+        self.replay_event_time = None
+        self.barrage = None # Leaving barrage mode (if active)
+        self.wall = None # Rebuilt for the next ball position
         self.ball.reset()
         self.goalkeeper.reset()
         self.power_bar.reset()
+        self.pending_kick_time = None
         # self.contact_selector.set_contact_offsets(0,0) # Optionally reset contact point
         self.aim_angle = 0
         self.kick_angle_rad = 0.0 # Reset kick_angle_rad
@@ -142,14 +283,63 @@ class Game:
         self.ball.world_pos.z = constants.BALL_RADIUS
         print(f"Ball placed at: X={world_x:.1f}, Y={world_y:.1f}, Z={constants.BALL_RADIUS}")
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def input_time(self):
+        """Current time on the input clock, in seconds"""
+        return self.input_clock() if self.input_clock else self.sim_time
+
+    def poll_input(self):
+        """Moves the queued events into pending_input, stamped with the time they were seen"""
+        events = pygame.event.get()
+        if events:
+            now = self.input_time()
+            self.pending_input.extend((now, event) for event in events)
+
+    def stamp_events(self, events=None):
+        """
+        Returns (timestamp, event) pairs to process this frame: the events drained since
+        the last frame plus the queue, or the given events (scripted input), stamped now
+        """
+        if events is None:
+            self.poll_input()
+            stamped, self.pending_input = self.pending_input, []
+            return stamped
+        now = self.input_time()
+        return [(now, event) for event in events]
+
+    def handle_events(self, events=None):
+        """Process input events. Reads the pygame event queue unless a list of events is given."""
+        self.process_events(self.stamp_events(events))
+
+    def process_events(self, stamped_events):
+        """Process (timestamp, event) pairs in order; the power bar charges by the timestamps"""
+        for stamp, event in stamped_events:
+            if event.type == pygame.MOUSEMOTION:
+                self.mouse_pos = event.pos
+
             if event.type == pygame.QUIT:
                 self.running = False
             
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+                if event.key == pygame.K_f and self.game_state in ("placing_ball", "ready_to_kick", "barrage"):
+                    self.wall_enabled = not self.wall_enabled
+                    print(f"Defensive wall {'enabled' if self.wall_enabled else 'disabled'}")
+                    if self.game_state != "placing_ball":
+                        self.update_wall()
+
+                if event.key == pygame.K_t:
+                    self.trajectory_preview.toggle()
+
+                if event.key == pygame.K_m:
+                    self.memory_overlay.toggle()
+
+                if event.key == pygame.K_c:
+                    if self.frame_capture is None:
+                        self.start_capture()
+                    else:
+                        self.stop_capture()
+
                 if event.key == pygame.K_r: # Config reload AND Manual Reset
                     print("R key pressed: Reloading config and resetting scene...")
                     config_manager.reload_config()
@@ -163,7 +353,18 @@ class Game:
                     # Press Enter to confirm ball placement and move to aiming
                     if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
                         self.game_state = "ready_to_kick"
+                        self.update_wall()
                         print("Ball placement confirmed. Ready to aim and kick.")
+                    elif event.key == pygame.K_b:
+                        self.start_barrage()
+
+                elif self.game_state == "barrage":
+                    if event.key == pygame.K_b:
+                        self.reset_for_kick() # Back to normal play
+
+                elif self.game_state == "instant_replay":
+                    if event.key == pygame.K_SPACE:
+                        self.reset_for_kick() # Skip the replay
                 
                 elif self.game_state == "ready_to_kick":
                     # Aiming with arrow keys
@@ -180,13 +381,14 @@ class Game:
                     # Power bar charging
                     if event.key == pygame.K_SPACE:
                         if not self.ball.is_kicked:
-                            self.power_bar.start_charging()
+                            self.power_bar.start_charging(stamp)
             
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if self.game_state == "placing_ball":
                     # Place ball with mouse click
                     if event.button == 1:  # Left mouse button
-                        mouse_x, mouse_y = pygame.mouse.get_pos()
+                        self.mouse_pos = event.pos
+                        mouse_x, mouse_y = self.render_target.to_render(event.pos)
                         world_coords = self.camera.screen_to_world_on_ground(mouse_x, mouse_y)
                         if world_coords:
                             world_x, world_y = world_coords
@@ -201,57 +403,194 @@ class Game:
             if event.type == pygame.KEYUP:
                 if self.game_state == "ready_to_kick":
                     if event.key == pygame.K_SPACE:
-                        if self.power_bar.stop_charging(): # Returns true if it was charging
-                            power = self.power_bar.get_power_fraction()
-                            cx, cz = self.contact_selector.get_contact_offsets()
-                            
-                            self.kick_y_position = self.ball.world_pos.y # Record Y-pos at kick
-                            print(f"Kicking from Y={self.kick_y_position:.2f}m: Power={power*100:.0f}%, Aim={self.aim_angle:.1f}deg, Contact(X:{cx:.2f}, Z:{cz:.2f})")
-                            if self.kick_sound:
-                                self.kick_sound.play()
-                            self.ball.kick(
-                                power_fraction=power,
-                                horizontal_aim_deg=self.aim_angle,
-                                pointer_x_offset=cx,
-                                pointer_z_offset=cz
-                            )
-                            self.game_state = "ball_kicked"
-                            self.attempts_made += 1
-                            self.time_since_kick = 0.0 # Reset timer on new kick
+                        if self.power_bar.stop_charging(stamp): # Returns true if it was charging
+                            # Kicked in update(), after this frame's ball step, like the auto kick (otherwise the
+                            # flight would get the catch-up and a whole frame more). A release after the bar
+                            # filled kicks from the full-charge instant.
+                            self.pending_kick_time = min(stamp, self.power_bar.full_charge_time)
                             # Power bar is reset internally by its logic or by game state change
                             # self.power_bar.reset() # Will be reset when scene resets
 
+    def update_wall(self):
+        """Build (or remove) the defensive wall for the current ball position"""
+        if not self.wall_enabled:
+            self.wall = None
+        elif self.game_state == "barrage":
+            # Barrage balls come from everywhere; place the wall for the configured spawn spot
+            spawn_x = config_manager.get_setting('spawn_position_x', default=0.0)
+            spawn_y = config_manager.get_setting('spawn_position_y', default=30.0)
+            self.wall = DefensiveWall(spawn_x, spawn_y)
+        else:
+            self.wall = DefensiveWall(self.ball.world_pos.x, self.ball.world_pos.y)
+
+    def start_capture(self):
+        """Start capturing frames to disk (only the goal celebrations unless capture_mode is "all")"""
+        capture_dir = config_manager.get_setting('capture_dir', default="captures")
+        if not os.path.isabs(capture_dir):
+            capture_dir = os.path.join(os.path.dirname(__file__), "..", capture_dir)
+        session_dir = os.path.join(capture_dir, time.strftime("%Y%m%d-%H%M%S"))
+        self.frame_capture = FrameCapture(
+            session_dir,
+            max_queue_bytes=int(config_manager.get_setting('capture_queue_mb', default=96) * 1024 * 1024),
+            frame_step=config_manager.get_setting('capture_frame_step', default=2),
+            compression=config_manager.get_setting('capture_compression', default=1))
+        self.capture_recording = False
+        print(f"Frame capture on: {session_dir}")
+
+    def stop_capture(self):
+        """Stop capturing; frames still queued are encoded before this returns"""
+        if self.frame_capture is not None:
+            self.frame_capture.close()
+            self.frame_capture = None
+            self.capture_recording = False
+
+    def capture_frame(self):
+        """Queue the frame just drawn if capture is on and the game is in a captured moment"""
+        if config_manager.get_setting('capture_mode', default="goals") == "all":
+            recording = True
+        else:
+            recording = self.game_state == "goal_scored" # The 2-second goal window
+        if recording and not self.capture_recording:
+            self.frame_capture.start_clip()
+        self.capture_recording = recording
+        if recording:
+            self.frame_capture.submit(self.screen)
+
+    def draw_capture_status(self):
+        """Small REC indicator with queue depth and dropped frames (drawn after the frame is captured)"""
+        stats = self.frame_capture.stats()
+        key = (stats['queue_depth'], stats['dropped'], stats['encoded'], self.capture_recording)
+        if key != self.capture_status_key: # Re-rendered only when a number or the colour changes
+            self.capture_status_key = key
+            color = constants.RED if self.capture_recording else constants.WHITE
+            self.capture_status_text = self.capture_status_font.render(
+                f"REC  queue {stats['queue_depth']}  dropped {stats['dropped']}  saved {stats['encoded']}", True, color)
+        self.screen.blit(self.capture_status_text, (10, constants.SCREEN_HEIGHT // 2))
+
+    def start_barrage(self):
+        """Training mode: hundreds of balls kicked at the goal at once (no coins awarded)"""
+        if BallStore is None:
+            print("Barrage mode requires NumPy (pip install numpy).")
+            return
+        ball_count = int(config_manager.get_setting('barrage_ball_count', default=200))
+        self.barrage = BallStore(ball_count)
+        self.goalkeeper.reset()
+        self.game_state = "barrage"
+        self.update_wall()
+        print(f"Barrage training started with {ball_count} balls. Press B to stop.")
+
+    def kick_ball(self, power, auto=False, late_by=0.0):
+        """
+        Kick the ball with the current aim and contact point and start the ball_kicked state.
+        late_by: seconds between the kick (the key release, or the instant the power bar
+        filled) and now; the flight is advanced by that much so it starts from the real kick.
+        """
+        cx, cz = self.contact_selector.get_contact_offsets()
+        # Placement recorded before the catch-up below moves the ball into its flight
+        kick_x_position = self.ball.world_pos.x
+        self.kick_y_position = self.ball.world_pos.y # Record Y-pos at kick
+        label = "Kicking (MAX POWER AUTO)" if auto else "Kicking"
+        print(f"{label} from Y={self.kick_y_position:.2f}m: Power={power*100:.0f}%, Aim={self.aim_angle:.1f}deg, Contact(X:{cx:.2f}, Z:{cz:.2f})")
+        if self.kick_sound:
+            self.kick_sound.play()
+        self.ball.kick(
+            power_fraction=power,
+            horizontal_aim_deg=self.aim_angle,
+            pointer_x_offset=cx,
+            pointer_z_offset=cz
+        )
+        self.game_state = "ball_kicked"
+        self.attempts_made += 1
+        self.time_since_kick = 0.0 # Reset timer on new kick
+        self.kick_time = self.sim_time
+        if late_by > 0:
+            self.ball.update(min(late_by, MAX_KICK_CATCH_UP))
+        if self.player_store:
+            self.player_store.record_attempt() # Persisted by the store's writer thread
+        self.current_shot = {
+            'character': self.selected_player,
+            'ball_x': kick_x_position,
+            'ball_y': self.kick_y_position,
+            'aim_deg': self.aim_angle,
+            'contact_x': cx,
+            'contact_z': cz,
+            'power': power,
+        }
+
+    def finish_shot(self, outcome, coins=0, crossing=None):
+        """Record the outcome of the shot in flight (once) in the analytics database"""
+        shot, self.current_shot = self.current_shot, None
+        if shot is None or not self.analytics:
+            return
+        cross_x, cross_z = crossing if crossing else (None, None)
+        self.analytics.record_shot(outcome=outcome, coins=coins, cross_x=cross_x, cross_z=cross_z, **shot)
+
+    def start_instant_replay(self):
+        """Replay the moments around the last goal or save; returns False if there is nothing to replay"""
+        event_time, self.replay_event_time = self.replay_event_time, None
+        if not self.instant_replay_enabled or event_time is None or len(self.replay_buffer) < 2:
+            return False
+        seconds = config_manager.get_setting('instant_replay_seconds', default=3.0)
+        speed = config_manager.get_setting('instant_replay_speed', default=0.5)
+        start = max(event_time - seconds, self.kick_time - REPLAY_LEAD_IN)
+        self.instant_replay = InstantReplay(self.replay_buffer, start, event_time + REPLAY_AFTER_EVENT, speed)
+        # Optional alternative camera: [x, y, z, downlook degrees]; otherwise the follow camera tracks the replay
+        pose = config_manager.get_setting('instant_replay_camera', default=None)
+        self.replay_camera_cut = bool(pose)
+        if pose:
+            self.camera.set_pose(*pose)
+        self.game_state = "instant_replay"
+        print(f"Instant replay: {self.instant_replay.end_time - self.instant_replay.start_time:.1f}s at x{speed:g}")
+        return True
+
+    def update_instant_replay(self, dt):
+        self.instant_replay.update(dt, self.ball, self.goalkeeper)
+        if not self.replay_camera_cut:
+            self.follow_camera.update(dt, self.ball, tracking=True)
+        if self.instant_replay.finished:
+            self.reset_for_kick()
+
     def update(self, dt):
+        config_manager.check_for_changes() # Cheap mtime poll; applies edits to config.json/player.json live
+        if self.game_state == "instant_replay":
+            self.update_instant_replay(dt)
+            return
+        if self.instant_replay_enabled and self.game_state in REPLAY_RECORDED_STATES:
+            self.replay_buffer.record(self.sim_time, self.ball, self.goalkeeper)
+        self.sim_time += dt
+        self.follow_camera.update(dt, self.ball, tracking=self.game_state in FOLLOW_CAMERA_STATES)
+
         if self.game_state == "ready_to_kick":
-            self.power_bar.update(dt) # Update power bar charging
+            now = self.input_time()
+            self.power_bar.update(now) # Update power bar charging
 
-            # Check for automatic kick when power bar is full
-            if self.power_bar.is_fully_charged_for_kick():
+            if self.pending_kick_time is not None:
+                # Released since the last frame: the flight catches up from the release
+                kick_time, self.pending_kick_time = self.pending_kick_time, None
+                self.kick_ball(self.power_bar.get_power_fraction(), late_by=now - kick_time)
+            # Automatic kick at full power, from the instant the bar filled (usually between frames)
+            elif self.power_bar.is_fully_charged_for_kick(now):
                 power = self.power_bar.get_power_fraction() # Should be 1.0 as set in powerbar.py
-                cx, cz = self.contact_selector.get_contact_offsets()
-                self.kick_y_position = self.ball.world_pos.y # Record Y-pos at kick
-                print(f"Kicking (MAX POWER AUTO) from Y={self.kick_y_position:.2f}m: Power={power*100:.0f}%, Aim={self.aim_angle:.1f}deg, Contact(X:{cx:.2f}, Z:{cz:.2f})")
-                if self.kick_sound:
-                    self.kick_sound.play()
-                self.ball.kick(
-                    power_fraction=power, 
-                    horizontal_aim_deg=self.aim_angle,
-                    pointer_x_offset=cx,
-                    pointer_z_offset=cz
-                )
-                self.game_state = "ball_kicked"
-                self.attempts_made += 1
-                self.time_since_kick = 0.0
+                self.kick_ball(power, auto=True, late_by=now - self.power_bar.full_charge_time)
         
         elif self.game_state == "ball_kicked":
+            # After a save, let the deflection play out for a moment, then replay it
+            if self.replay_event_time is not None and self.sim_time >= self.replay_event_time + SAVE_REPLAY_DELAY:
+                if self.start_instant_replay():
+                    return
             self.ball.update(dt)
             self.goalkeeper.update(dt, self.ball)
             self.time_since_kick += dt # Increment time since kick - still useful for other potential logic
+
+            if self.wall:
+                self.wall.check_and_deflect(self.ball, dt)
             
             # Check for goalkeeper save BEFORE checking for goals
             if self.goalkeeper.check_save(self.ball):
                 if self.goalkeeper.save_ball(self.ball):
                     # Save was successful, don't check for goals this frame
+                    self.finish_shot(OUTCOME_SAVE)
+                    self.replay_event_time = self.sim_time
                     return
             
             # Check if ball crossed goal line (y<=0)
@@ -262,27 +601,31 @@ class Game:
                     print("GOAL!")
                     self.goals_scored += 1
                     
-                    # Determine coins based on kick distance
-                    if self.kick_y_position > 40:
-                        self.last_awarded_coins = 40
-                    elif self.kick_y_position > 30: # and <= 40 implied
-                        self.last_awarded_coins = 20
-                    else: # Covers 16.5 < Y <= 30 and any other valid goal case
-                        self.last_awarded_coins = 10
-                        
+                    # Determine coins based on kick distance: 40 beyond Y=40m, 20 beyond Y=30m, else 10
+                    self.last_awarded_coins = distance_band(self.kick_y_position)
+
                     self.coins_earned += self.last_awarded_coins
+                    if self.player_store:
+                        self.player_store.award_goal(self.last_awarded_coins)
+                    self.finish_shot(OUTCOME_GOAL, self.last_awarded_coins,
+                                     (self.ball.world_pos.x, self.ball.world_pos.z))
                     print(f"Awarded {self.last_awarded_coins} coins for goal from Y={self.kick_y_position:.2f}m")
                     self.game_state = "goal_scored"
                     self.goal_scored_timer = 0.0
+                    self.replay_event_time = self.sim_time
                     if self.goal_sound:
                         self.goal_sound.play()
                 else:
                     # Only transition to past_goal_line if not already in that state or goal_scored state
                     if self.game_state == "ball_kicked": 
                         print("Ball crossed goal line (no goal). Waiting to reset.")
+                        self.finish_shot(OUTCOME_MISS, crossing=(self.ball.world_pos.x, self.ball.world_pos.z))
                         self.game_state = "past_goal_line"
                         self.past_line_timer = 0.0
 
+        elif self.game_state == "barrage":
+            self.barrage.update(dt, self.goalkeeper, self.wall)
+
         elif self.game_state == "past_goal_line":
             # Ball continues to update visually even after crossing line, until reset
             self.ball.update(dt) 
@@ -295,9 +638,14 @@ class Game:
             # self.ball.update(dt) # Optionally freeze ball by not updating
             self.goal_scored_timer += dt
             if self.goal_scored_timer >= self.goal_scored_display_time:
-                self.reset_for_kick()
+                if not self.start_instant_replay():
+                    self.reset_for_kick()
 
-    def draw_pitch_and_goal(self, screen, camera):
+    def build_pitch_geometry(self):
+        """
+        The pitch markings and goal frame as world-space polylines: (colour, thickness, points).
+        Built once; when the camera moves only the points are projected again.
+        """
         # Essential pitch markings around the goal area only
         PENALTY_AREA_LENGTH = 16.5  # meters from goal line (corrected from 11.0)
         PENALTY_ARC_RADIUS = 9.15  # meters
@@ -309,49 +657,42 @@ class Game:
         
         line_color = constants.WHITE
         line_thickness = 2
+        polylines = []
         
-        # Helper function to draw a line at ground level (z=0)
-        def draw_ground_line(start_x, start_y, end_x, end_y, thickness=line_thickness):
-            start_screen = camera.world_to_screen(start_x, start_y, 0)
-            end_screen = camera.world_to_screen(end_x, end_y, 0)
-            pygame.draw.line(screen, line_color, start_screen, end_screen, thickness)
+        # Helper function to add a line at ground level (z=0)
+        def ground_line(start_x, start_y, end_x, end_y, thickness=line_thickness):
+            polylines.append((line_color, thickness, [(start_x, start_y, 0), (end_x, end_y, 0)]))
         
-        # Helper function to draw an arc at ground level
-        def draw_ground_arc(center_x, center_y, radius, start_angle, end_angle, thickness=line_thickness):
-            # Draw arc by approximating with line segments
+        # Helper function to add an arc at ground level
+        def ground_arc(center_x, center_y, radius, start_angle, end_angle, thickness=line_thickness):
+            # Approximate the arc with line segments
             num_segments = 20
             angle_step = (end_angle - start_angle) / num_segments
-            
-            for i in range(num_segments):
-                angle1 = start_angle + i * angle_step
-                angle2 = start_angle + (i + 1) * angle_step
-                
-                x1 = center_x + radius * math.cos(angle1)
-                y1 = center_y + radius * math.sin(angle1)
-                x2 = center_x + radius * math.cos(angle2)
-                y2 = center_y + radius * math.sin(angle2)
-                
-                draw_ground_line(x1, y1, x2, y2, thickness)
+            points = []
+            for i in range(num_segments + 1):
+                angle = start_angle + i * angle_step
+                points.append((center_x + radius * math.cos(angle), center_y + radius * math.sin(angle), 0))
+            polylines.append((line_color, thickness, points))
         
         # 1. GOAL LINE (back line)
-        draw_ground_line(-25, goal_line_y, 25, goal_line_y, 3) # Updated to x=-25 to x=25
+        ground_line(-25, goal_line_y, 25, goal_line_y, 3) # Updated to x=-25 to x=25
         
         # NEW: Side Lines
         # Adjust far y-coordinate to be further from camera to avoid projection issues
         # Camera is at y=65. Previous 64.9 was too close.
         side_line_far_y = 45.0 
         # Left side line
-        draw_ground_line(-25, goal_line_y, -25, side_line_far_y, 3)
+        ground_line(-25, goal_line_y, -25, side_line_far_y, 3)
         # Right side line
-        draw_ground_line(25, goal_line_y, 25, side_line_far_y, 3)
+        ground_line(25, goal_line_y, 25, side_line_far_y, 3)
         
         # 2. PENALTY AREA (penalty box)
         # Left side of penalty box
-        draw_ground_line(penalty_area_left_x, goal_line_y, penalty_area_left_x, PENALTY_AREA_LENGTH)
+        ground_line(penalty_area_left_x, goal_line_y, penalty_area_left_x, PENALTY_AREA_LENGTH)
         # Right side of penalty box
-        draw_ground_line(penalty_area_right_x, goal_line_y, penalty_area_right_x, PENALTY_AREA_LENGTH)
+        ground_line(penalty_area_right_x, goal_line_y, penalty_area_right_x, PENALTY_AREA_LENGTH)
         # Top of penalty box
-        draw_ground_line(penalty_area_left_x, PENALTY_AREA_LENGTH, penalty_area_right_x, PENALTY_AREA_LENGTH)
+        ground_line(penalty_area_left_x, PENALTY_AREA_LENGTH, penalty_area_right_x, PENALTY_AREA_LENGTH)
         
         # 3. PENALTY ARC - the big semicircle at the edge of the penalty area
         penalty_spot_distance = 11.0  # meters from goal line
@@ -362,9 +703,28 @@ class Game:
         arc_half_angle = math.acos(5.5 / PENALTY_ARC_RADIUS)
         start_angle = math.pi/2 - arc_half_angle
         end_angle = math.pi/2 + arc_half_angle
-        draw_ground_arc(0, penalty_spot_distance, PENALTY_ARC_RADIUS, start_angle, end_angle)
+        ground_arc(0, penalty_spot_distance, PENALTY_ARC_RADIUS, start_angle, end_angle)
+        
+        # 5. GOAL FRAME: posts (at Y=0, Z=0 to Z=CROSSBAR_Z) and crossbar (at Y=0, Z=CROSSBAR_Z)
+        goal_post_color = constants.WHITE
+        polylines.append((goal_post_color, 5, [(constants.GOAL_MIN_X, 0, 0), (constants.GOAL_MIN_X, 0, constants.CROSSBAR_Z)]))
+        polylines.append((goal_post_color, 5, [(constants.GOAL_MAX_X, 0, 0), (constants.GOAL_MAX_X, 0, constants.CROSSBAR_Z)]))
+        polylines.append((goal_post_color, 5, [(constants.GOAL_MIN_X, 0, constants.CROSSBAR_Z),
+                                               (constants.GOAL_MAX_X, 0, constants.CROSSBAR_Z)]))
+        return polylines
+
+    def draw_pitch_and_goal(self, screen, camera):
+        # All polyline points are projected in one batch, then drawn segment by segment
+        points = [point for _color, _thickness, polyline in self.pitch_geometry for point in polyline]
+        screen_points = camera.world_to_screen_list(points)
+        index = 0
+        for color, thickness, polyline in self.pitch_geometry:
+            for i in range(index, index + len(polyline) - 1):
+                pygame.draw.line(screen, color, screen_points[i], screen_points[i + 1], thickness)
+            index += len(polyline)
         
         # 4. PENALTY SPOT
+        penalty_spot_distance = 11.0  # meters from goal line
         penalty_spot_radius = 0.11  # meters (as specified by user)
         penalty_spot_screen = camera.world_to_screen(0, penalty_spot_distance, 0)
         # Use proper rendering logic like the ball
@@ -377,33 +737,7 @@ class Game:
             0   # z position (on ground)
         )
         spot_radius_pixels = max(1, int(scaled_diameter_pixels / 2))
-        pygame.draw.circle(screen, line_color, penalty_spot_screen, spot_radius_pixels)
-        
-        # 5. GOAL FRAME (keeping the existing goal posts and crossbar)
-        # Posts (at Y=0, Z=0 to Z=CROSSBAR_Z)
-        goal_posts_world = [
-            (constants.GOAL_MIN_X, 0, 0), (constants.GOAL_MIN_X, 0, constants.CROSSBAR_Z),
-            (constants.GOAL_MAX_X, 0, 0), (constants.GOAL_MAX_X, 0, constants.CROSSBAR_Z),
-        ]
-        # Crossbar (at Y=0, Z=CROSSBAR_Z, between X_MIN and X_MAX)
-        goal_crossbar_world = [
-            (constants.GOAL_MIN_X, 0, constants.CROSSBAR_Z), (constants.GOAL_MAX_X, 0, constants.CROSSBAR_Z)
-        ]
-
-        goal_post_color = constants.WHITE
-        # Draw Posts
-        p1_start_screen = camera.world_to_screen(*goal_posts_world[0])
-        p1_end_screen = camera.world_to_screen(*goal_posts_world[1])
-        pygame.draw.line(screen, goal_post_color, p1_start_screen, p1_end_screen, 5)
-        
-        p2_start_screen = camera.world_to_screen(*goal_posts_world[2])
-        p2_end_screen = camera.world_to_screen(*goal_posts_world[3])
-        pygame.draw.line(screen, goal_post_color, p2_start_screen, p2_end_screen, 5)
-        
-        # Draw Crossbar
-        cb_start_screen = camera.world_to_screen(*goal_crossbar_world[0])
-        cb_end_screen = camera.world_to_screen(*goal_crossbar_world[1])
-        pygame.draw.line(screen, goal_post_color, cb_start_screen, cb_end_screen, 5)
+        pygame.draw.circle(screen, constants.WHITE, penalty_spot_screen, spot_radius_pixels)
 
     def draw_kick_indicator_arrow(self, surface, camera):
         if self.game_state != "ready_to_kick":
@@ -430,7 +764,7 @@ class Game:
         p_base_screen = camera.world_to_screen(ball_center_x, ball_center_y, ball_center_z)
         p_tip_screen = camera.world_to_screen(tip_x, tip_y, ball_center_z)
 
-        if p_base_screen[0] < -constants.SCREEN_WIDTH or p_tip_screen[0] < -constants.SCREEN_WIDTH: # Basic off-screen check
+        if p_base_screen[0] < -camera.viewport_width or p_tip_screen[0] < -camera.viewport_width: # Basic off-screen check
             return
 
         # Draw main shaft
@@ -502,11 +836,11 @@ class Game:
                 # Basic culling for the current tile (can be improved)
                 # If all x are < -100 or all x > SCREEN_WIDTH + 100, skip.
                 all_x_coords = [bottom_left_screen[0], bottom_right_screen[0], top_left_screen[0], top_right_screen[0]]
-                if all(x < -100 for x in all_x_coords) or all(x > constants.SCREEN_WIDTH + 100 for x in all_x_coords):
+                if all(x < -100 for x in all_x_coords) or all(x > camera.viewport_width + 100 for x in all_x_coords):
                     continue 
                 # Similar check for y (though less likely for a wide background)
                 all_y_coords = [bottom_left_screen[1], bottom_right_screen[1], top_left_screen[1], top_right_screen[1]]
-                if all(y < -100 for y in all_y_coords) or all(y > constants.SCREEN_HEIGHT + 100 for y in all_y_coords):
+                if all(y < -100 for y in all_y_coords) or all(y > camera.viewport_height + 100 for y in all_y_coords):
                     continue
 
                 # Calculate apparent screen width and height for this tile
@@ -538,19 +872,59 @@ class Game:
                         print(f"Error scaling or blitting crowd tile: {e}. Scaled size: ({scaled_width}, {scaled_height})")
                         pass # Continue if one tile fails
 
-    def render(self):
-        self.screen.fill(constants.DARK_GREEN)
-        
-        # Draw the stadium crowd first (behind everything)
-        self.draw_stadium_crowd(self.screen, self.camera)
-        
+    def build_background_layer(self, size):
+        """Draw the static scene (pitch colour, crowd, pitch lines, goal frame) into a cached surface"""
+        if self.background_layer is None or self.background_layer.get_size() != tuple(size):
+            self.background_layer = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                self.background_layer = self.background_layer.convert()
+            memory_registry.track(self.background_layer, "background", "layer")
+        self.background_complete = True
+        if self.perspective_background is not None:
+            # Textured ground and crowd, warped per pixel (cached per camera configuration). While the
+            # camera moves, baking is limited to a per-frame budget and a lower resolution preview is shown
+            base, self.background_complete = self.perspective_background.surface_for(
+                self.camera, size, self.background_pixel_budget())
+            self.background_layer.blit(base, (0, 0))
+        else:
+            self.background_layer.fill(constants.DARK_GREEN)
+            # Draw the stadium crowd first (behind everything)
+            self.draw_stadium_crowd(self.background_layer, self.camera)
         # Draw the game world
-        self.draw_pitch_and_goal(self.screen, self.camera)
-        
-        # Draw the ball and goalkeeper in proper depth order (higher Y = farther = render first)
-        ball_screen_pos = self.camera.world_to_screen(self.ball.world_pos.x, self.ball.world_pos.y, self.ball.world_pos.z)
+        self.draw_pitch_and_goal(self.background_layer, self.camera)
+        self.background_camera_version = self.camera.version
+
+    def placement_preview_surface(self, radius):
+        """Semi-transparent ball of the given pixel radius, drawn once per radius"""
+        surface = self.placement_preview_surfaces.get(radius)
+        if surface is None:
+            surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (255, 255, 255, 128), (radius, radius), radius)
+            self.placement_preview_surfaces[radius] = memory_registry.track(surface, "hud", "placement preview")
+        return surface
+
+    def background_pixel_budget(self):
+        """Pixels of textured background to bake per frame (None: bake a missing background in full)"""
+        budget_seconds = config_manager.get_setting('background_rebake_budget_ms', default=4.0) / 1000.0
+        if not self.headless:
+            return self.perspective_background.affordable_pixels(budget_seconds)
+        # Headless renders must not depend on timing: a fixed-size preview while the camera moves,
+        # the full bake as soon as it rests
+        if not self.follow_camera.moved:
+            return None
+        return int(budget_seconds / NOMINAL_SECONDS_PER_PIXEL)
+
+    def render(self):
+        # The world is drawn into the render target (possibly below window resolution), the HUD on the window
+        world = self.render_target.begin(self.screen)
+        # The background only depends on the camera (and the target size), so it is rebuilt only when it
+        # changes, or to continue a background bake that did not fit in the last frame's budget
+        if (self.background_layer is None or self.background_camera_version != self.camera.version
+                or not self.background_complete):
+            self.build_background_layer(world.get_size())
+        world.blit(self.background_layer, (0, 0))
         
-        # Calculate scaled ball diameter using camera method
+        # Calculate scaled ball diameter using camera method (for the placement preview)
         ball_diameter_world = constants.BALL_RADIUS * 2
         scaled_diameter_pixels_w, _ = self.camera.get_sprite_display_size(
             ball_diameter_world, 
@@ -559,21 +933,27 @@ class Game:
             self.ball.world_pos.y,
             self.ball.world_pos.z
         )
-        ball_radius_pixels = max(1, int(scaled_diameter_pixels_w / 2)) # Ensure at least 1 pixel radius
-        
-        # Render in depth order: farther objects (higher Y) first, closer objects (lower Y) last
-        if self.ball.world_pos.y > self.goalkeeper.world_pos.y:
-            # Ball is farther, draw ball first then goalkeeper
-            pygame.draw.circle(self.screen, constants.WHITE, ball_screen_pos, ball_radius_pixels)
-            self.goalkeeper.draw(self.screen, self.camera)
+
+        # Render in depth order: the camera looks towards -Y, so lower Y is farther and is drawn first
+        occluders = [self.goalkeeper] + (self.wall.defenders if self.wall else [])
+        occluders.sort(key=lambda entity: entity.world_pos.y)
+        if self.game_state == "barrage":
+            # All barrage balls are projected and blitted in batches between the occluders
+            self.barrage.draw(world, self.camera, occluders)
         else:
-            # Goalkeeper is farther, draw goalkeeper first then ball
-            self.goalkeeper.draw(self.screen, self.camera)
-            pygame.draw.circle(self.screen, constants.WHITE, ball_screen_pos, ball_radius_pixels)
+            ball_drawn = False
+            for entity in occluders:
+                if not ball_drawn and self.ball.world_pos.y < entity.world_pos.y:
+                    # Ball is farther than this entity, draw it first
+                    self.ball.draw(world, self.camera)
+                    ball_drawn = True
+                entity.draw(world, self.camera)
+            if not ball_drawn:
+                self.ball.draw(world, self.camera)
 
         # Draw ball placement preview in placement mode
         if self.game_state == "placing_ball":
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = self.render_target.to_render(self.mouse_pos if self.headless else pygame.mouse.get_pos())
             world_coords = self.camera.screen_to_world_on_ground(mouse_x, mouse_y)
             if world_coords:
                 world_x, world_y = world_coords
@@ -581,13 +961,19 @@ class Game:
                     preview_screen_pos = self.camera.world_to_screen(world_x, world_y, constants.BALL_RADIUS)
                     preview_radius_pixels = max(1, int(scaled_diameter_pixels_w / 2))
                     # Draw semi-transparent preview ball
-                    preview_surface = pygame.Surface((preview_radius_pixels * 2, preview_radius_pixels * 2), pygame.SRCALPHA)
-                    pygame.draw.circle(preview_surface, (255, 255, 255, 128), (preview_radius_pixels, preview_radius_pixels), preview_radius_pixels)
-                    self.screen.blit(preview_surface, (preview_screen_pos[0] - preview_radius_pixels, preview_screen_pos[1] - preview_radius_pixels))
+                    preview_surface = self.placement_preview_surface(preview_radius_pixels)
+                    world.blit(preview_surface, (preview_screen_pos[0] - preview_radius_pixels, preview_screen_pos[1] - preview_radius_pixels))
 
-        # Draw aim arrow during ready_to_kick
+        # Draw aim arrow (and the predicted path, if enabled) during ready_to_kick
         if self.game_state == "ready_to_kick":
-            self.draw_kick_indicator_arrow(self.screen, self.camera)
+            if self.trajectory_preview.enabled:
+                cx, cz = self.contact_selector.get_contact_offsets()
+                self.trajectory_preview.update(self.camera, self.power_bar.get_charge_fraction(),
+                                               self.aim_angle, cx, cz)
+                self.trajectory_preview.draw(world)
+            self.draw_kick_indicator_arrow(world, self.camera)
+
+        self.render_target.present(self.screen) # One upscale; everything below is HUD at native resolution
 
         # Draw contact selector UI
         self.contact_selector.draw(self.screen)
@@ -604,11 +990,22 @@ class Game:
             goal_rect = goal_text.get_rect(center=(constants.SCREEN_WIDTH // 2, constants.SCREEN_HEIGHT // 2))
             self.screen.blit(goal_text, goal_rect)
 
+        elif self.game_state == "instant_replay":
+            replay_text = font.render(f"REPLAY  x{self.instant_replay.speed:g}   (Space: skip)", True, constants.YELLOW)
+            self.screen.blit(replay_text, replay_text.get_rect(center=(constants.SCREEN_WIDTH // 2, 30)))
+
         elif self.game_state == "past_goal_line":
             miss_text = font.render("MISS! Try again", True, constants.RED)
             miss_rect = miss_text.get_rect(center=(constants.SCREEN_WIDTH // 2, constants.SCREEN_HEIGHT // 2))
             self.screen.blit(miss_text, miss_rect)
 
+        elif self.game_state == "barrage":
+            barrage_text_message = (f"BARRAGE ({self.barrage.capacity} balls)  Shots: {self.barrage.shots}  "
+                                    f"Goals: {self.barrage.goals}  Saves: {self.barrage.saves}  Blocks: {self.barrage.blocks}  "
+                                    f"Misses: {self.barrage.misses}")
+            barrage_text = font.render(barrage_text_message, True, constants.YELLOW)
+            self.screen.blit(barrage_text, barrage_text.get_rect(center=(constants.SCREEN_WIDTH // 2, 30)))
+
         # --- Text display at the BOTTOM of the screen ---
         line_spacing = 5
         text_margin = 10  # Margin from screen edges
@@ -637,8 +1034,8 @@ class Game:
         controls_title_str = "Controls:"
         control_line1_str = "Click/Enter: Place/Confirm"
         control_line2_str = "Arrows: Aim | WASD: Contact"
-        control_line3_str = "Space: Charge | R: Reset"
-        control_line4_str = "ESC: Menu"
+        control_line3_str = "Space: Charge | R: Reset | C: Capture"
+        control_line4_str = "B: Barrage | F: Wall | T: Path | ESC: Menu"
 
         control_texts = [
             font.render(controls_title_str, True, constants.WHITE),
@@ -654,16 +1051,53 @@ class Game:
             text_y = constants.SCREEN_HEIGHT - (len(control_texts) - i) * font_height - (len(control_texts) - 1 - i) * line_spacing - text_margin
             self.screen.blit(text_surface, (text_x, text_y))
 
-        pygame.display.flip()
+        self.draw_overlay()
+
+        if self.frame_capture is not None:
+            self.capture_frame()
+            self.draw_capture_status()
+
+        self.memory_overlay.draw(self.screen) # After the capture: recordings never show it
+
+        if not self.headless:
+            pygame.display.flip()
+
+    def draw_overlay(self):
+        """Hook for modes built on Game (e.g. the network shootout) to draw over the HUD"""
+        pass
 
     def run(self):
         print("Starting Game Loop. Arrows: Aim, WASD: Contact, Space: Charge/Kick.")
-        while self.running:
-            dt = self.clock.tick(60) / 1000.0
-            self.handle_events()
-            self.update(dt)
-            self.render()
-
+        self.input_clock = time.perf_counter
+        gc_policy = GCPolicy()
+        hitch_detector = HitchDetector(gc_policy)
+        start_exporter() # Fleet dashboard scrapes (no-op if already serving or disabled)
+        frame_metrics.attach_game(self)
+        gc_policy.start() # Assets are loaded: freeze them
+        try:
+            previous_frame = time.perf_counter()
+            while self.running:
+                frame_start = self.wait_for_frame(previous_frame + 1.0 / FRAME_RATE)
+                dt = frame_start - previous_frame
+                previous_frame = frame_start
+                gc_policy.begin_frame()
+                self.handle_events()
+                self.update(dt)
+                self.render()
+                gc_policy.end_frame(idle=self.game_state not in GC_ACTIVE_STATES)
+                # Busy time only (not the wait for the next frame) drives the render resolution
+                busy_time = time.perf_counter() - frame_start
+                self.render_target.record_frame_time(busy_time)
+                hitch_detector.record_frame(busy_time, self.game_state)
+                frame_metrics.record_frame(dt, busy_time)
+        finally:
+            # Also when the game raises: the menu catches it and keeps running, so the GC callback,
+            # the objects this game froze and the capture encoder thread must not outlive it
+            gc_policy.stop()
+            frame_metrics.attach_game(None)
+            if hitch_detector.hitches:
+                print(hitch_detector.summary())
+            self.stop_capture()
         print("Exiting Game")
         return {
             'goals': self.goals_scored,
@@ -671,6 +1105,65 @@ class Game:
             'coins_earned': self.coins_earned
         }
 
+    def wait_for_frame(self, deadline):
+        """
+        Sleeps until `deadline` (perf_counter seconds), draining the event queue every
+        INPUT_POLL_INTERVAL so input gets timestamps close to when it happened.
+        Returns the time the new frame starts.
+        """
+        while True:
+            self.poll_input()
+            now = time.perf_counter()
+            if now >= deadline:
+                return now
+            time.sleep(min(INPUT_POLL_INTERVAL, deadline - now))
+
+    def run_headless(self, script, dt=1.0 / 60.0, render=False, max_frames=None):
+        """
+        Run the game loop without a window or clock, as fast as the CPU allows.
+        script: an iterable yielding one list of pygame events per frame, or a callable
+                taking this Game and returning such an iterable (e.g. a generator function
+                built from goal_masters.headless helpers).
+        dt: fixed simulation time step per frame, in seconds.
+        render: also draw every frame into the offscreen surface.
+        max_frames: optional safety limit on the number of simulated frames.
+        Returns the same result dict as run(); frame counts and simulated FPS are
+        stored in self.simulation_stats.
+        """
+        frames_iter = script(self) if callable(script) else script
+        frames = 0
+        frame_metrics.attach_game(self)
+        start_time = frame_start = time.perf_counter()
+        try:
+            for events in frames_iter:
+                self.handle_events(events)
+                self.update(dt)
+                if render:
+                    self.render()
+                frames += 1
+                frame_end = time.perf_counter()
+                frame_metrics.record_frame(dt, frame_end - frame_start) # Simulated interval, real busy time
+                frame_start = frame_end
+                if not self.running or (max_frames is not None and frames >= max_frames):
+                    break
+        finally:
+            frame_metrics.attach_game(None) # The session is over, even if the caller keeps the Game
+            self.stop_capture()
+        elapsed = time.perf_counter() - start_time
+        self.simulation_stats = {
+            'frames': frames,
+            'simulated_seconds': frames * dt,
+            'wall_seconds': elapsed,
+            'frames_per_second': frames / elapsed if elapsed > 0 else 0.0,
+        }
+        print(f"Headless run: {frames} frames ({frames * dt:.1f}s simulated) in {elapsed:.2f}s "
+              f"-> {self.simulation_stats['frames_per_second']:.0f} simulated FPS")
+        return {
+            'goals': self.goals_scored,
+            'attempts': self.attempts_made,
+            'coins_earned': self.coins_earned
+        }
+
     def run_with_player(self, selected_player, player_config):
         """Run the game with a specific player configuration"""
         self.selected_player = selected_player
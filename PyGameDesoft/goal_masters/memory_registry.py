@@ -0,0 +1,123 @@
+"""
+Goal Masters - Surface and sound memory accounting.
+
+Code that creates a pygame.Surface or a mixer Sound registers it with
+memory_registry.track(obj, owner, name). The registry only holds weak
+references: an entry disappears when its object is freed, so the totals are
+always what is alive right now. It reports the memory by owner and the largest
+items, and warns once when the total goes over memory_budget_mb (config.json).
+The in-game overlay (M) and the soak test (goal_masters.soak) read it.
+"""
+
+import weakref
+import pygame
+from .config import config_manager
+
+MB = 1024 * 1024
+
+
+class MemoryEntry:
+    __slots__ = ('ref', 'kind', 'owner', 'name', 'size', 'format', 'bytes')
+
+    def __init__(self, ref, kind, owner, name, size, format, nbytes):
+        self.ref = ref
+        self.kind = kind
+        self.owner = owner
+        self.name = name
+        self.size = size
+        self.format = format
+        self.bytes = nbytes
+
+
+def describe(obj):
+    """(kind, size, format, bytes) of a Surface or Sound."""
+    if isinstance(obj, pygame.Surface):
+        alpha = obj.get_flags() & pygame.SRCALPHA
+        format = f"{obj.get_bitsize()}-bit{' alpha' if alpha else ''}"
+        # A subsurface shares its parent's pixels
+        nbytes = 0 if obj.get_parent() is not None else obj.get_pitch() * obj.get_height()
+        return "surface", obj.get_size(), format, nbytes
+    # Sounds are decoded into the mixer's format when loaded
+    frequency, sample_format, channels = pygame.mixer.get_init() or (44100, -16, 2)
+    seconds = obj.get_length()
+    nbytes = int(seconds * frequency) * channels * (abs(sample_format) // 8)
+    return "sound", round(seconds, 2), f"{frequency} Hz {abs(sample_format)}-bit x{channels}", nbytes
+
+
+class MemoryRegistry:
+    def __init__(self):
+        self.entries = {}    # id(obj) -> MemoryEntry, for live objects only
+        self.total_bytes = 0
+        self.tracked = 0     # Objects registered since start
+        self.released = 0    # Registered objects freed since start
+        self.over_budget = False
+
+    def track(self, obj, owner, name=None):
+        """Registers a Surface or Sound and returns it, so creation sites can wrap the constructor."""
+        key = id(obj)
+        entry = self.entries.get(key)
+        if entry is not None and entry.ref() is obj:
+            entry.owner, entry.name = owner, name or entry.name # Re-registered (e.g. a shared asset)
+            return obj
+        kind, size, format, nbytes = describe(obj)
+        ref = weakref.ref(obj, lambda _, key=key: self.release(key))
+        self.entries[key] = MemoryEntry(ref, kind, owner, name, size, format, nbytes)
+        self.total_bytes += nbytes
+        self.tracked += 1
+        self.check_budget()
+        return obj
+
+    def release(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.bytes
+            self.released += 1
+            if self.over_budget and self.total_bytes <= self.budget_bytes():
+                self.over_budget = False
+
+    def budget_bytes(self):
+        return config_manager.get_setting('memory_budget_mb', default=256) * MB
+
+    def check_budget(self):
+        """Warns once each time the tracked total goes over the budget."""
+        budget = self.budget_bytes()
+        if self.total_bytes > budget and not self.over_budget:
+            self.over_budget = True
+            owners = ", ".join(f"{owner} {nbytes / MB:.1f} MB" for owner, (_, nbytes) in self.by_owner()[:3])
+            print(f"Warning: surfaces and sounds use {self.total_bytes / MB:.1f} MB, over the "
+                  f"{budget / MB:.0f} MB budget (largest owners: {owners})")
+
+    def count(self, kind=None):
+        if kind is None:
+            return len(self.entries)
+        return sum(1 for entry in self.entries.values() if entry.kind == kind)
+
+    def by_owner(self):
+        """[(owner, (count, bytes))], largest first."""
+        owners = {}
+        for entry in self.entries.values():
+            count, nbytes = owners.get(entry.owner, (0, 0))
+            owners[entry.owner] = (count + 1, nbytes + entry.bytes)
+        return sorted(owners.items(), key=lambda item: item[1][1], reverse=True)
+
+    def largest(self, n=10):
+        return sorted(self.entries.values(), key=lambda entry: entry.bytes, reverse=True)[:n]
+
+    def report(self, top=10):
+        """Multi-line text report: totals, memory per owner and the largest items."""
+        lines = [f"Tracked: {self.count('surface')} surfaces, {self.count('sound')} sounds, "
+                 f"{self.total_bytes / MB:.1f} MB of {self.budget_bytes() / MB:.0f} MB budget "
+                 f"({self.tracked} registered, {self.released} freed)"]
+        lines.append("By owner:")
+        for owner, (count, nbytes) in self.by_owner():
+            lines.append(f"  {owner:<16} {count:>5} items {nbytes / MB:>9.2f} MB")
+        lines.append("Largest:")
+        for entry in self.largest(top):
+            size = "x".join(str(v) for v in entry.size) if entry.kind == "surface" else f"{entry.size}s"
+            lines.append(f"  {entry.bytes / MB:>7.2f} MB  {entry.kind:<7} {size:<11} {entry.format:<16} "
+                         f"{entry.owner}/{entry.name or '-'}")
+        return "\n".join(lines)
+
+
+# Global instance
+memory_registry = MemoryRegistry()
@@ -0,0 +1,304 @@
+"""
+Goal Masters - Operational metrics for the fleet dashboard.
+
+The frame loop only bumps plain counters: FrameMetrics.record_frame() writes the
+frame's interval and busy time into two fixed-size rings, and the caches count
+their hits and loads on attributes. Nothing takes a lock; the exporter thread reads
+the counters when it is scraped and does all the work (copying the rings, sorting
+them for percentiles, formatting). A read can be off by the frame being recorded at
+that instant, which does not matter for a dashboard.
+
+MetricsExporter serves the counters as a Prometheus text page on
+http://127.0.0.1:<metrics_port>/metrics (config.json), from a daemon thread:
+
+- fps and frame busy-time percentiles over the last FRAME_WINDOW frames;
+- goals, attempts and coins of the current session (the Game being played);
+- surface and sound memory (memory registry) and the process resident size;
+- hit rates of the asset, ball sprite and portrait caches.
+
+Usage (from the PyGameDesoft directory):
+    python -m goal_masters.metrics                                  # headless session + local test scrapes
+    python -m goal_masters.metrics --scrape http://127.0.0.1:9108/metrics
+Exits with status 1 if the scrape fails or misses a metric.
+"""
+
+import argparse
+import contextlib
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+import weakref
+
+from .config import config_manager
+from .memory_registry import memory_registry
+
+FRAME_WINDOW = 600 # Frames (10 s at 60 FPS) the fps and percentiles are computed over
+QUANTILES = (0.5, 0.95, 0.99)
+DEFAULT_PORT = 9108
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "goal_masters_"
+
+
+class CacheCounter:
+    """Hit and load counts of a cache without a class of its own to keep them (e.g. the assets module)."""
+    __slots__ = ('hit_count', 'load_count')
+
+    def __init__(self):
+        self.hit_count = 0
+        self.load_count = 0
+
+
+class FrameMetrics:
+    """Counters written by the frame loop only; read from the exporter thread without locks."""
+
+    def __init__(self, window=FRAME_WINDOW):
+        self.window = window
+        self.frame_intervals = [0.0] * window # Seconds from the previous frame start (1 / fps)
+        self.busy_times = [0.0] * window      # Seconds of update + render, without the wait
+        self.index = 0                        # Next ring slot to write
+        self.frames = 0                       # Frames recorded since start
+        self.busy_total = 0.0
+        self.game_ref = None                  # Weak reference to the Game being played
+        self.caches = {}                      # name -> object with hit_count and load_count
+
+    # ----- Frame loop side -----
+
+    def record_frame(self, interval, busy):
+        index = self.index
+        self.frame_intervals[index] = interval
+        self.busy_times[index] = busy
+        index += 1
+        self.index = index if index < self.window else 0
+        self.frames += 1
+        self.busy_total += busy
+
+    def attach_game(self, game):
+        """The Game whose session stats are exported (held weakly, so a finished game is freed)."""
+        self.game_ref = weakref.ref(game) if game is not None else None
+
+    def register_cache(self, name, cache):
+        """Exports `cache`'s hit_count and load_count under `name`; returns the cache."""
+        self.caches[name] = cache
+        return cache
+
+    # ----- Exporter side -----
+
+    def frame_snapshot(self):
+        """(fps, sorted busy times) over the recorded part of the window."""
+        count = min(self.frames, self.window)
+        intervals = self.frame_intervals[:count]
+        busy = sorted(self.busy_times[:count])
+        elapsed = sum(intervals)
+        return (count / elapsed if elapsed > 0 else 0.0), busy
+
+    def session(self):
+        game = self.game_ref() if self.game_ref is not None else None
+        if game is None:
+            return None
+        return game.goals_scored, game.attempts_made, game.coins_earned, game.game_state
+
+
+def quantile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def resident_bytes():
+    """Resident set size of the process, or None where /proc is not available."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def render_metrics(metrics):
+    """The Prometheus text exposition of `metrics`."""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{PREFIX}{name}{labels} {value}")
+
+    fps, busy = metrics.frame_snapshot()
+    metric("fps", "gauge", f"Frames per second over the last {metrics.window} frames.", [("", f"{fps:.2f}")])
+    metric("frame_busy_seconds", "summary", "Update and render time per frame.",
+           [(f'{{quantile="{q}"}}', f"{quantile(busy, q):.6f}") for q in QUANTILES])
+    lines.append(f"{PREFIX}frame_busy_seconds_sum {metrics.busy_total:.6f}")
+    lines.append(f"{PREFIX}frame_busy_seconds_count {metrics.frames}")
+
+    session = metrics.session()
+    goals, attempts, coins, state = session or (0, 0, 0, None) # Zeros while the menu is shown
+    metric("session_active", "gauge", "1 while a game session is running.", [("", int(session is not None))])
+    metric("session_goals", "gauge", "Goals scored in the current session.", [("", goals)])
+    metric("session_attempts", "gauge", "Kicks taken in the current session.", [("", attempts)])
+    metric("session_coins", "gauge", "Coins earned in the current session.", [("", coins)])
+    if state is not None:
+        metric("game_state", "gauge", "State of the current session.", [(f'{{state="{state}"}}', 1)])
+
+    metric("tracked_memory_bytes", "gauge", "Pixel and sample memory of the live surfaces and sounds.",
+           [("", memory_registry.total_bytes)])
+    metric("tracked_objects", "gauge", "Live surfaces and sounds in the memory registry.",
+           [("", len(memory_registry.entries))])
+    rss = resident_bytes()
+    if rss is not None:
+        metric("resident_memory_bytes", "gauge", "Resident set size of the process.", [("", rss)])
+
+    caches = list(metrics.caches.items())
+    metric("cache_requests_total", "counter", "Cache lookups by result.",
+           [(f'{{cache="{name}",result="{result}"}}', count) for name, cache in caches
+            for result, count in (("hit", cache.hit_count), ("load", cache.load_count))])
+    rates = []
+    for name, cache in caches:
+        hits, loads = cache.hit_count, cache.load_count
+        rates.append((f'{{cache="{name}"}}', f"{hits / (hits + loads):.4f}" if hits + loads else "0"))
+    metric("cache_hit_ratio", "gauge", "Share of cache lookups served without loading.", rates)
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_metrics(self.server.metrics).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # One line per scrape would flood the console
+
+
+class MetricsExporter:
+    """HTTP server for the metrics page on its own daemon thread."""
+
+    def __init__(self, metrics, host="127.0.0.1", port=DEFAULT_PORT):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self):
+        """Starts serving; returns False (and the game goes on) if the port cannot be bound."""
+        try:
+            self.server = http.server.HTTPServer((self.host, self.port), MetricsHandler)
+        except OSError as e:
+            print(f"Metrics exporter unavailable on {self.host}:{self.port}: {e}")
+            return False
+        self.server.metrics = self.metrics
+        self.port = self.server.server_address[1] # Actual port when 0 was requested
+        self.thread = threading.Thread(target=self.server.serve_forever, name="MetricsExporter", daemon=True)
+        self.thread.start()
+        print(f"Metrics exporter serving {self.url}")
+        return True
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = self.thread = None
+
+
+# Global instances
+frame_metrics = FrameMetrics()
+_exporter = None
+
+def start_exporter(port=None):
+    """Starts the global exporter once per process if metrics_enabled (config.json); returns it or None."""
+    global _exporter
+    if _exporter is None and config_manager.get_setting('metrics_enabled', default=True):
+        if port is None:
+            port = config_manager.get_setting('metrics_port', default=DEFAULT_PORT)
+        exporter = MetricsExporter(frame_metrics, port=port)
+        if exporter.start():
+            _exporter = exporter
+    return _exporter
+
+
+def scrape(url, timeout=5.0):
+    """(page text, seconds the request took)."""
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        page = response.read().decode("utf-8")
+    return page, time.perf_counter() - start
+
+
+EXPECTED_METRICS = ("fps", "frame_busy_seconds", "session_goals", "session_attempts", "session_coins",
+                    "tracked_memory_bytes", "cache_hit_ratio")
+
+
+def scrape_local_session(kicks, port):
+    """
+    Plays a short headless session with a local exporter, scraping it before the session
+    ends and once after (when it must report no active session). Returns (page, seconds, url).
+    """
+    # Imported by the game itself, so the dummy drivers are only selected here (before Game initialises pygame)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from .main import Game
+    from .headless import random_session, PLAYER_CONFIG_FILE
+    from . import metrics # Under -m this file is __main__: the game records into the package module
+    with open(PLAYER_CONFIG_FILE, "r") as f:
+        player_config = json.load(f)
+    exporter = metrics.MetricsExporter(metrics.frame_metrics, port=port)
+    if not exporter.start():
+        raise OSError(f"cannot serve on port {port}")
+    scrapes = []
+
+    def script(game):
+        yield from random_session(kicks, seed=1)(game)
+        scrapes.append(scrape(exporter.url)) # While the session is still running
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        Game("Elvis", player_config, headless=True).run_headless(script, render=True)
+    after, _ = scrape(exporter.url)
+    exporter.stop()
+    if f"\n{PREFIX}session_active 0\n" not in after:
+        raise OSError("session still reported as active after the game ended")
+    page, elapsed = scrapes[0]
+    return page, elapsed, exporter.url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Goal Masters metrics exporter test scrape")
+    parser.add_argument("--scrape", metavar="URL", help="Scrape a running game instead of a local headless one")
+    parser.add_argument("--kicks", type=int, default=5, help="Kicks in the local headless session")
+    parser.add_argument("--port", type=int, default=0, help="Port for the local exporter (0: any free port)")
+    args = parser.parse_args(argv)
+
+    url = args.scrape or "local headless session"
+    try:
+        if args.scrape:
+            page, elapsed = scrape(args.scrape)
+        else:
+            page, elapsed, url = scrape_local_session(args.kicks, args.port)
+    except OSError as e:
+        print(f"Scrape of {url} failed: {e}")
+        return 1
+    print(page, end="")
+    missing = [name for name in EXPECTED_METRICS if f"\n{PREFIX}{name}" not in "\n" + page]
+    print(f"# Scraped {len(page)} bytes from {url} in {elapsed * 1000:.1f} ms")
+    if missing:
+        print(f"# Missing metrics: {', '.join(missing)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
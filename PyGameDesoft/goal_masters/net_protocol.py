@@ -0,0 +1,163 @@
+"""
+Goal Masters - Wire format for the networked penalty shootout.
+
+Messages travel over a TCP stream as a 2-byte big-endian length followed by the
+payload; the first payload byte is the message type.
+
+World state is quantized to small integers (positions in centimetres) and each
+snapshot is delta-compressed against the last snapshot the client acknowledged:
+only fields that changed are sent, as a signed byte when the change is small and as
+a 16-bit value otherwise. A snapshot with base tick 0 carries every field.
+"""
+
+import struct
+
+DEFAULT_PORT = 5555
+TICK_RATE = 60            # Server simulation ticks per second
+SNAPSHOT_INTERVAL = 2     # Ticks between snapshots (30 snapshots per second)
+HISTORY_SIZE = 64         # Snapshots kept on both ends as delta baselines
+
+# Message types
+MSG_HELLO = 1      # Client -> server: requested role
+MSG_WELCOME = 2    # Server -> client: assigned role, tick rate, snapshot interval
+MSG_INPUT = 3      # Client -> server: input + acknowledged snapshot tick
+MSG_SNAPSHOT = 4   # Server -> client: delta-compressed world state
+MSG_REJECT = 5     # Server -> client: role already taken
+
+ROLE_SHOOTER = 0
+ROLE_KEEPER = 1
+ROLE_NAMES = {ROLE_SHOOTER: "shooter", ROLE_KEEPER: "keeper"}
+
+# Shootout phases (the "phase" state field)
+PHASE_READY = 0    # Ball on the spot, waiting for the kick
+PHASE_FLIGHT = 1
+PHASE_GOAL = 2
+PHASE_SAVE = 3
+PHASE_MISS = 4
+PHASE_OVER = 5     # All rounds played
+PHASE_NAMES = {PHASE_READY: "ready", PHASE_FLIGHT: "flight", PHASE_GOAL: "goal",
+               PHASE_SAVE: "save", PHASE_MISS: "miss", PHASE_OVER: "over"}
+
+# State fields in wire order, with the scale used to quantize them (1 = sent as is)
+STATE_FIELDS = (
+    ('phase', 1),
+    ('round', 1),
+    ('goals', 1),
+    ('saves', 1),
+    ('ball_x', 100),    # centimetres
+    ('ball_y', 100),
+    ('ball_z', 100),
+    ('keeper_x', 100),
+)
+FIELD_COUNT = len(STATE_FIELDS)
+FIELD_NAMES = tuple(name for name, _ in STATE_FIELDS)
+EMPTY_STATE = (0,) * FIELD_COUNT
+
+LENGTH = struct.Struct('!H')
+HELLO = struct.Struct('!BB')                # type, role
+WELCOME = struct.Struct('!BBBB')            # type, role, tick rate, snapshot interval
+# type, seq, acked snapshot tick, client time (ms), keeper move, kick flag, power, aim (centidegrees),
+# contact x, contact z (millimetres)
+INPUT = struct.Struct('!BIIIbBBhbb')
+# type, tick, base tick, last input seq applied, its client time, changed mask, small-delta mask
+SNAPSHOT_HEADER = struct.Struct('!BIIIIHH')
+
+
+def frame(payload):
+    """Prefixes a payload with its length for the stream."""
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    """Reads one framed payload from an asyncio StreamReader."""
+    header = await reader.readexactly(LENGTH.size)
+    (length,) = LENGTH.unpack(header)
+    return await reader.readexactly(length)
+
+
+def quantize_state(state):
+    """Dict of float fields -> tuple of ints in STATE_FIELDS order (clamped to 16 bits)."""
+    return tuple(max(-32768, min(32767, int(round(state[name] * scale)))) for name, scale in STATE_FIELDS)
+
+
+def dequantize_state(values):
+    return {name: value / scale if scale != 1 else value
+            for (name, scale), value in zip(STATE_FIELDS, values)}
+
+
+def encode_snapshot(tick, state, base_tick, base_state, input_seq, input_time):
+    """
+    Encodes quantized `state` as a delta against `base_state` (the snapshot the
+    client acknowledged at `base_tick`; pass base_tick=0 and EMPTY_STATE for a full one).
+    """
+    changed_mask = 0
+    small_mask = 0
+    body = []
+    for i, (value, base) in enumerate(zip(state, base_state)):
+        if base_tick and value == base:
+            continue
+        changed_mask |= 1 << i
+        delta = value - base
+        if base_tick and -128 <= delta <= 127:
+            small_mask |= 1 << i
+            body.append(struct.pack('!b', delta))
+        else:
+            body.append(struct.pack('!h', value))
+    header = SNAPSHOT_HEADER.pack(MSG_SNAPSHOT, tick, base_tick, input_seq,
+                                  input_time, changed_mask, small_mask)
+    return header + b''.join(body)
+
+
+def decode_snapshot(payload, baselines):
+    """
+    Decodes a snapshot payload. `baselines` maps tick -> quantized state for the
+    snapshots received so far. Returns (tick, state, input_seq, input_time, base_tick),
+    or None if the base snapshot is unknown (base_tick 0 marks a full snapshot).
+    """
+    _, tick, base_tick, input_seq, input_time, changed_mask, small_mask = SNAPSHOT_HEADER.unpack_from(payload)
+    if base_tick:
+        base_state = baselines.get(base_tick)
+        if base_state is None:
+            return None
+    else:
+        base_state = EMPTY_STATE
+    values = list(base_state)
+    offset = SNAPSHOT_HEADER.size
+    for i in range(FIELD_COUNT):
+        if not changed_mask & (1 << i):
+            continue
+        if small_mask & (1 << i):
+            (delta,) = struct.unpack_from('!b', payload, offset)
+            values[i] = base_state[i] + delta
+            offset += 1
+        else:
+            (values[i],) = struct.unpack_from('!h', payload, offset)
+            offset += 2
+    return tick, tuple(values), input_seq, input_time, base_tick
+
+
+def encode_input(seq, ack_tick, client_time_ms, keeper_move=0, kick=None):
+    """kick: optional (power_fraction, aim_deg, contact_x, contact_z) in game units."""
+    if kick is None:
+        return INPUT.pack(MSG_INPUT, seq, ack_tick, client_time_ms, keeper_move, 0, 0, 0, 0, 0)
+    power, aim_deg, contact_x, contact_z = kick
+    return INPUT.pack(MSG_INPUT, seq, ack_tick, client_time_ms, keeper_move, 1,
+                      int(round(max(0.0, min(1.0, power)) * 255)),
+                      int(round(aim_deg * 100)),
+                      int(round(contact_x * 1000)), int(round(contact_z * 1000)))
+
+
+def decode_input(payload):
+    """Returns (seq, ack_tick, client_time_ms, keeper_move, kick or None)."""
+    _, seq, ack_tick, client_time, keeper_move, has_kick, power, aim, contact_x, contact_z = INPUT.unpack(payload)
+    kick = (power / 255, aim / 100, contact_x / 1000, contact_z / 1000) if has_kick else None
+    return seq, ack_tick, client_time, keeper_move, kick
+
+
+def time_ms(now):
+    """Wire timestamp: a perf_counter() reading in milliseconds, wrapped to 32 bits."""
+    return int(now * 1000) & 0xFFFFFFFF
+
+
+def elapsed_ms(now, sent_ms):
+    return ((time_ms(now) - sent_ms) & 0xFFFFFFFF)
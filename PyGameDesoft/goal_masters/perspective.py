@@ -0,0 +1,223 @@
+import collections
+import math
+import time
+
+import numpy as np
+import pygame
+
+from . import constants
+from .memory_registry import memory_registry
+
+# Ground texture: mowing stripes across the pitch, with some noise so the grass is not flat
+GRASS_TEXTURE_SIZE = 256        # Texture pixels per tile side (a power of two, wrapped with a bit mask)
+GRASS_TILE_METRES = 10.0        # World size covered by one texture tile (two 5 m stripes)
+GRASS_LIGHT = (34, 139, 34)
+GRASS_DARK = (24, 115, 28)
+GRASS_FADE_START = 35.0         # Beyond this distance the grass fades to its mean colour (hides aliasing)
+GRASS_FADE_END = 90.0
+
+# The crowd plane, as in Game.draw_stadium_crowd(): a 2x2 grid of 40 m wide tiles, 5 m behind the goal line
+CROWD_PLANE_Y = -5.0
+CROWD_BOTTOM_Z = 2.0
+CROWD_TILE_WIDTH = 40.0
+
+# Bakes kept per camera configuration; dynamic resolution moves between a few target sizes
+MAX_CACHED_BAKES = 4
+
+# Budgeted baking (moving camera)
+NOMINAL_SECONDS_PER_PIXEL = 1e-7 # Bake cost assumed until measured (and by headless runs, which must not depend on timing)
+PREVIEW_BUDGET_SHARE = 0.5       # Share of the pixel budget a preview may use (the rest covers upscaling it)
+MIN_PREVIEW_SCALE = 0.1
+MIN_BAND_ROWS = 8                # A full bake advances at least this much per frame, however small the budget
+
+
+def make_grass_texture(seed=7):
+    """A tileable (GRASS_TEXTURE_SIZE, GRASS_TEXTURE_SIZE, 3) grass texture: two stripes plus noise."""
+    rng = np.random.default_rng(seed)
+    size = GRASS_TEXTURE_SIZE
+    stripe = (np.arange(size) * 2 // size) % 2           # Two stripes along the texture's v axis
+    base = np.where(stripe[np.newaxis, :, np.newaxis] == 0, GRASS_LIGHT, GRASS_DARK).astype(np.float32)
+    base = np.broadcast_to(base, (size, size, 3)).copy()
+    noise = rng.normal(0.0, 6.0, (size, size, 1)).astype(np.float32)
+    return np.clip(base + noise, 0, 255).astype(np.uint8)
+
+
+class PerspectiveBackground:
+    """
+    Bakes the static background with per-pixel perspective: every pixel of the target
+    is turned into a view ray from the Camera parameters, intersected with the ground
+    plane (z=0) and with the crowd's vertical plane behind the goal, and the textures
+    are sampled at the hit points (nearest texel). Whole-image NumPy operations, so a
+    bake is one pass over the pixels, and surface_for() keeps the last few bakes, so
+    the per-frame cost is a blit and changing the camera back and forth is free.
+
+    With a pixel budget (a moving camera), surface_for() never bakes in full in one
+    frame: it returns a low resolution preview sized to fit the budget, and once the
+    camera rests it finishes the full bake in bands of rows over the next frames.
+    """
+
+    def __init__(self, crowd_image=None):
+        self.grass = make_grass_texture()
+        self.grass_flat = self.grass.reshape(-1, 3)   # Indexed by u * size + v
+        self.grass_mean = self.grass_flat.mean(axis=0).astype(np.float32)
+        self.crowd = None
+        if crowd_image is not None:
+            self.crowd = pygame.surfarray.array3d(crowd_image)  # (width, height, 3)
+            crowd_width, crowd_height = crowd_image.get_size()
+            self.crowd_tile_height = crowd_height * (CROWD_TILE_WIDTH / crowd_width)
+        self.bakes = collections.OrderedDict() # Camera key -> baked surface, least recently used first
+        self.bake_count = 0
+        self.seconds_per_pixel = NOMINAL_SECONDS_PER_PIXEL # Measured bake cost, see affordable_pixels()
+        self.pending = None    # Full bake in progress for a resting camera: (key, pixels, next row)
+        self.preview = None
+
+    @staticmethod
+    def camera_key(camera, size):
+        return (tuple(camera.position), camera.focal_length_pixels, camera.downlook_radians,
+                camera.viewport_width, camera.viewport_height, tuple(size))
+
+    def surface_for(self, camera, size, pixel_budget=None):
+        """
+        The background for this camera configuration, and whether it is the full bake.
+        Without a budget a missing bake is done in full right away. With a budget, at most
+        about `pixel_budget` pixels are baked this frame: a new camera pose gets a preview,
+        and if the pose holds the full bake continues band by band. Do not draw on the result.
+        """
+        key = self.camera_key(camera, size)
+        surface = self.bakes.get(key)
+        if surface is not None:
+            self.bakes.move_to_end(key)
+            return surface, True
+        if pixel_budget is None:
+            return self.store(key, self.bake(camera, size)), True
+
+        width, height = size
+        if self.pending is None or self.pending[0] != key:
+            # The camera moved since the last frame: preview now, start the full bake if it stays put
+            self.bake_preview(camera, size, pixel_budget * PREVIEW_BUDGET_SHARE)
+            self.pending = (key, None, 0)
+            return self.preview, False
+        _, pixels, row = self.pending
+        if pixels is None:
+            pixels = np.empty((width, height, 3), dtype=np.uint8)
+        stop = min(height, row + max(MIN_BAND_ROWS, pixel_budget // width))
+        self.render_rows(camera, size, pixels[:, row:stop], row, stop)
+        if stop < height:
+            self.pending = (key, pixels, stop)
+            return self.preview, False
+        self.pending = None
+        return self.store(key, self.to_surface(pixels)), True
+
+    def affordable_pixels(self, seconds):
+        """How many pixels a bake covers in `seconds`, going by the measured cost."""
+        return int(seconds / self.seconds_per_pixel)
+
+    def store(self, key, surface):
+        self.bakes[key] = surface
+        while len(self.bakes) > MAX_CACHED_BAKES:
+            self.bakes.popitem(last=False)
+        self.bake_count += 1
+        return surface
+
+    def bake_preview(self, camera, size, pixel_count):
+        """Bakes about `pixel_count` pixels and upscales them into self.preview (of `size`)."""
+        width, height = size
+        scale = min(1.0, max(MIN_PREVIEW_SCALE, math.sqrt(pixel_count / (width * height))))
+        small_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        pixels = np.empty((small_size[0], small_size[1], 3), dtype=np.uint8)
+        self.render_rows(camera, small_size, pixels, 0, small_size[1])
+        small = self.to_surface(pixels)
+        if self.preview is None or self.preview.get_size() != tuple(size):
+            self.preview = small.copy() if small_size == tuple(size) else pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                self.preview = self.preview.convert()
+            memory_registry.track(self.preview, "perspective", "preview")
+        if small_size == tuple(size):
+            self.preview.blit(small, (0, 0))
+        else:
+            # Smooth upscaling: a moving camera reads as slight motion blur rather than blocks
+            pygame.transform.smoothscale(small, size, self.preview)
+
+    def bake(self, camera, size):
+        """Returns a surface of `size` with the textured ground and crowd (no pitch lines)."""
+        pixels = np.empty((size[0], size[1], 3), dtype=np.uint8)
+        self.render_rows(camera, size, pixels, 0, size[1])
+        return self.to_surface(pixels)
+
+    def to_surface(self, pixels):
+        surface = pygame.Surface(pixels.shape[:2])
+        pygame.surfarray.blit_array(surface, pixels)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return memory_registry.track(surface, "perspective", "bake")
+
+    def view_rays(self, camera, size, row_start, row_stop):
+        """
+        Ray directions in world space for the pixel rows [row_start, row_stop) of a `size`
+        image covering the camera viewport, scaled so that the ray parameter is the view
+        depth. The camera does not roll, so dir_x depends only on the column and dir_y,
+        dir_z only on the row: returns (dir_x per column, dir_y per row, dir_z per row).
+        """
+        width, height = size
+        f = camera.focal_length_pixels
+        # Pixel centres in viewport coordinates relative to its centre, divided by the focal length
+        pixel_w = camera.viewport_width / width
+        pixel_h = camera.viewport_height / height
+        a = ((np.arange(width, dtype=np.float32) + 0.5) * pixel_w - camera.viewport_width / 2) / f
+        b = (camera.viewport_height / 2 - (np.arange(row_start, row_stop, dtype=np.float32) + 0.5) * pixel_h) / f
+        # Inverse of Camera.world_to_screen(): view_x = X, view_y = Y*sin + Z*cos, depth = -Y*cos - Z*sin,
+        # with a = view_x/depth and b = view_y/depth, solved for (X, Y, Z) per unit of depth
+        cos_a, sin_a = camera.cos_downlook, camera.sin_downlook
+        det = cos_a * cos_a - sin_a * sin_a
+        dir_y = -(b * sin_a + cos_a) / det
+        dir_z = (sin_a + b * cos_a) / det
+        return a, dir_y, dir_z
+
+    def render_rows(self, camera, size, pixels, row_start, row_stop, fill_color=constants.DARK_GREEN):
+        """Fills `pixels` ((width, row_stop - row_start, 3)) with rows [row_start, row_stop) of the bake."""
+        start_time = time.perf_counter()
+        cam_x, cam_y, cam_z = camera.position
+        dir_x, dir_y, dir_z = self.view_rays(camera, size, row_start, row_stop)
+        pixels[...] = fill_color
+
+        # Ground plane z = 0: rays pointing down hit it at t = -cam_z / dir_z, the same t for a whole row
+        # dir_z grows monotonically up the image, so the ground is one contiguous band of rows
+        ground = np.flatnonzero(dir_z < 0)
+        if ground.size:
+            rows = slice(ground[0], ground[-1] + 1)
+            t = -cam_z / dir_z[rows]
+            world_x = cam_x + np.outer(dir_x, t)                # (width, ground rows)
+            world_y = cam_y + t * dir_y[rows]                   # Per row
+            texels = GRASS_TEXTURE_SIZE / GRASS_TILE_METRES
+            # The texture size is a power of two, so wrapping is a bit mask
+            u = np.floor(world_x * texels).astype(np.int32) & (GRASS_TEXTURE_SIZE - 1)
+            v = np.floor(world_y * texels).astype(np.int32) & (GRASS_TEXTURE_SIZE - 1)
+            texel = u * GRASS_TEXTURE_SIZE + v[np.newaxis, :]
+            grass = np.take(self.grass_flat, texel, axis=0).astype(np.float32)
+            # Far grass fades to its mean colour instead of shimmering between stripes
+            distance = np.hypot(world_x - cam_x, (world_y - cam_y)[np.newaxis, :])
+            fade = np.clip((distance - GRASS_FADE_START) / (GRASS_FADE_END - GRASS_FADE_START), 0.0, 1.0)
+            grass += (self.grass_mean - grass) * fade[..., np.newaxis]
+            pixels[:, rows] = grass.astype(np.uint8)
+
+        # Crowd plane y = CROWD_PLANE_Y (in front of the camera, so rays must head towards -y)
+        if self.crowd is not None:
+            crowd_width_px, crowd_height_px = self.crowd.shape[:2]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = np.where(dir_y < 0, (CROWD_PLANE_Y - cam_y) / dir_y, -1.0)
+            rel_z = cam_z + t * dir_z - CROWD_BOTTOM_Z          # Grid spans z in [2, 2 + 2 * tile height]
+            crowd_rows = np.flatnonzero((t > 0) & (rel_z >= 0) & (rel_z < 2 * self.crowd_tile_height))
+            if crowd_rows.size:
+                rows = slice(crowd_rows[0], crowd_rows[-1] + 1)
+                rel_x = cam_x + np.outer(dir_x, t[rows]) + CROWD_TILE_WIDTH  # and x in [-40, 40]
+                hit = (rel_x >= 0) & (rel_x < 2 * CROWD_TILE_WIDTH)
+                u = (np.mod(rel_x, CROWD_TILE_WIDTH) * (crowd_width_px / CROWD_TILE_WIDTH)).astype(np.int64)
+                # Image rows run top-down, world z bottom-up
+                v = ((1.0 - np.mod(rel_z[rows], self.crowd_tile_height) / self.crowd_tile_height) *
+                     crowd_height_px).astype(np.int64)
+                crowd = self.crowd[np.minimum(u, crowd_width_px - 1), np.minimum(v, crowd_height_px - 1)[np.newaxis, :]]
+                pixels[:, rows] = np.where(hit[..., np.newaxis], crowd, pixels[:, rows])
+
+        # Cost per pixel (smoothed), used to turn a time budget into a pixel budget
+        seconds = (time.perf_counter() - start_time) / max(1, pixels.shape[0] * pixels.shape[1])
+        self.seconds_per_pixel += (seconds - self.seconds_per_pixel) * 0.25
@@ -0,0 +1,260 @@
+"""
+Goal Masters - Crash-safe player data store.
+
+Player progress (coins, unlocked characters, selection, totals) is kept in memory
+and every change is appended to a small journal file as one JSON line. A background
+writer thread batches the journal writes and fsyncs them off the frame path, and
+periodically compacts the journal into an atomically replaced snapshot
+(player_data.json). On startup the journal is replayed onto the last snapshot, so a
+crash or power cut loses at most the last flush interval of changes.
+"""
+
+import json
+import os
+import threading
+
+DEFAULT_PLAYER_DATA = {
+    'coins': 0,
+    'unlocked': ['Elvis'],
+    'selected': 'Elvis',
+    'total_goals': 0,
+    'total_attempts': 0
+}
+
+FLUSH_INTERVAL = 0.5  # Seconds between journal fsyncs
+COMPACT_EVERY = 200   # Journal records between snapshot compactions
+SNAPSHOT_SEQ_KEY = 'journal_seq'  # Last journal record folded into the snapshot
+
+
+def apply_record(data, record):
+    """Applies one journal record to a player data dict (used live and on replay)."""
+    op = record['op']
+    if op == 'select':
+        data['selected'] = record['name']
+    elif op == 'purchase':
+        data['coins'] -= record['price']
+        if record['name'] not in data['unlocked']:
+            data['unlocked'].append(record['name'])
+        data['selected'] = record['name']
+    elif op == 'goal':
+        data['coins'] += record['coins']
+        data['total_goals'] += 1
+    elif op == 'attempt':
+        data['total_attempts'] += 1
+    elif op == 'coins':
+        data['coins'] += record['amount']
+    else:
+        print(f"PlayerDataStore: Unknown journal op '{op}', skipped")
+
+
+class PlayerDataStore:
+    def __init__(self, snapshot_path, journal_path=None, defaults=None,
+                 flush_interval=FLUSH_INTERVAL, compact_every=COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.journal'
+        self.defaults = defaults or DEFAULT_PLAYER_DATA
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+
+        self.data = {}
+        self.seq = 0                 # Sequence number of the last record applied in memory
+        self.written_seq = 0         # Last record written and fsynced to the journal
+        self.snapshot_seq = 0        # Last record folded into the snapshot
+        self.records_since_compact = 0
+
+        self.pending = []            # Records waiting for the writer thread
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.flushed = threading.Condition(self.lock)
+        self.flush_requested = False
+        self.closing = False
+
+        self.recover()
+        self.journal_file = open(self.journal_path, 'a', encoding='utf-8')
+        self.writer = threading.Thread(target=self._writer_loop, name="PlayerDataStoreWriter", daemon=True)
+        self.writer.start()
+
+    # ----- Recovery -----
+
+    def recover(self):
+        """Loads the last snapshot and replays newer journal records onto it."""
+        self.data = json.loads(json.dumps(self.defaults))  # Deep copy of the defaults
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                self.snapshot_seq = snapshot.pop(SNAPSHOT_SEQ_KEY, 0)
+                self.data.update(snapshot)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"PlayerDataStore: Could not read snapshot {self.snapshot_path}: {e}. Using defaults.")
+        self.seq = self.snapshot_seq
+
+        replayed = 0
+        torn = False
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        record_seq = record['seq']
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        # A torn final line from a crash mid-write; everything before it is intact
+                        print("PlayerDataStore: Ignoring incomplete journal record")
+                        torn = True
+                        break
+                    if record_seq <= self.snapshot_seq:
+                        continue  # Already folded into the snapshot before a crash truncated the journal
+                    apply_record(self.data, record)
+                    self.seq = record_seq
+                    replayed += 1
+        self.written_seq = self.seq
+        self.records_since_compact = replayed
+        print(f"PlayerDataStore: Loaded snapshot (seq {self.snapshot_seq}) and replayed {replayed} journal record(s)")
+
+        if replayed or torn or not os.path.exists(self.snapshot_path):
+            # Fold the replayed records into a fresh snapshot straight away. A torn line must go
+            # too: new records appended after it would be glued to it and lost at the next replay
+            self._write_snapshot(self._copy_data(), self.seq)
+            self._truncate_journal()
+
+    # ----- Mutations (called from the game/menu thread) -----
+
+    def _append(self, record):
+        with self.lock:
+            self.seq += 1
+            record['seq'] = self.seq
+            apply_record(self.data, record)
+            self.pending.append(record)
+            self.wakeup.notify()
+
+    def select(self, name):
+        self._append({'op': 'select', 'name': name})
+
+    def purchase(self, name, price):
+        self._append({'op': 'purchase', 'name': name, 'price': price})
+
+    def award_goal(self, coins):
+        self._append({'op': 'goal', 'coins': coins})
+
+    def record_attempt(self):
+        self._append({'op': 'attempt'})
+
+    def add_coins(self, amount):
+        self._append({'op': 'coins', 'amount': amount})
+
+    def flush(self, timeout=None):
+        """Blocks until every record appended so far is fsynced to the journal."""
+        with self.lock:
+            target = self.seq
+            self.flush_requested = True
+            self.wakeup.notify()
+            return self.flushed.wait_for(lambda: self.written_seq >= target, timeout)
+
+    def close(self):
+        """Flushes the journal, compacts it into the snapshot and stops the writer thread."""
+        with self.lock:
+            if self.closing:
+                return
+            self.closing = True
+            self.wakeup.notify()
+        self.writer.join()
+        self.journal_file.close()
+        if self.seq != self.snapshot_seq:
+            self._write_snapshot(self._copy_data(), self.seq)
+            self._truncate_journal()
+        print("PlayerDataStore: Closed")
+
+    # ----- Writer thread -----
+
+    def _writer_loop(self):
+        while True:
+            with self.lock:
+                while not self.pending and not self.closing:
+                    self.wakeup.wait()
+                # Let a burst of records accumulate so it costs one write and one fsync
+                self.wakeup.wait_for(lambda: self.closing or self.flush_requested, self.flush_interval)
+                self.flush_requested = False
+                batch = self.pending
+                self.pending = []
+                closing = self.closing
+            if batch:
+                self._write_batch(batch)
+            if closing and not batch:
+                return
+
+    def _write_batch(self, batch):
+        self.journal_file.write(''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in batch))
+        self.journal_file.flush()
+        os.fsync(self.journal_file.fileno())
+        with self.lock:
+            self.written_seq = batch[-1]['seq']
+            self.records_since_compact += len(batch)
+            self.flushed.notify_all()
+            # Only compact when nothing is queued, so the in-memory data is exactly the
+            # state as of written_seq (queued records will land in the new journal)
+            compact = self.records_since_compact >= self.compact_every and not self.pending
+            if compact:
+                data, seq = self._copy_data(), self.written_seq
+        if compact:
+            self.compact(data, seq)
+
+    def compact(self, data, seq):
+        """Writes `data` (state as of record `seq`) as the snapshot and drops the folded records."""
+        self._write_snapshot(data, seq)
+        # Records after `seq` may already be queued; they are written to the new journal
+        self.journal_file.close()
+        self._truncate_journal()
+        self.journal_file = open(self.journal_path, 'a', encoding='utf-8')
+        with self.lock:
+            self.records_since_compact = 0
+
+    def _copy_data(self):
+        return json.loads(json.dumps(self.data))
+
+    def _write_snapshot(self, data, seq):
+        """Atomically replaces the snapshot: write a temp file, fsync it, then rename over."""
+        snapshot = dict(data)
+        snapshot[SNAPSHOT_SEQ_KEY] = seq
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self.snapshot_seq = seq
+
+    def _truncate_journal(self):
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+if __name__ == '__main__':
+    # Example usage with throwaway files
+    import tempfile
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'player_data.json')
+
+    store = PlayerDataStore(path, compact_every=5)
+    store.award_goal(20)
+    store.award_goal(40)
+    store.purchase('Neymar', 50)
+    store.flush()
+    print(f"After purchases: {store.data}")
+    # Simulate a crash: do not close, just recover from disk in a second store
+    recovered = PlayerDataStore(path)
+    print(f"Recovered: {recovered.data}")
+    recovered.close()
+
+    # Crash, restart, crash: a torn last line with nothing newer than the snapshot must not
+    # swallow the records written after the restart
+    coins = recovered.data['coins']
+    with open(recovered.journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"op":"coins","amou')
+    restarted = PlayerDataStore(path)
+    restarted.add_coins(80)
+    restarted.flush()
+    crashed_again = PlayerDataStore(path)
+    print(f"After crash-restart-crash: {crashed_again.data}")
+    assert crashed_again.data['coins'] == coins + 80, "records after a torn journal line were lost"
+    crashed_again.close()
@@ -0,0 +1,132 @@
+import pygame
+from .config import config_manager
+from .memory_registry import memory_registry
+
+# Settings of the dynamic resolution controller
+RENDER_SCALE_SETTING_KEYS = ('dynamic_resolution_enabled', 'render_scale_min', 'render_scale_max',
+                             'render_scale_step', 'render_target_fps', 'render_upscale_smooth')
+
+FRAME_TIME_SMOOTHING = 0.1   # Weight of the newest frame in the frame time average
+SCALE_COOLDOWN_FRAMES = 30   # Frames to wait after a change before judging the new scale
+SCALE_DOWN_AT = 0.95         # Scale down when the average frame time exceeds this share of the budget
+SCALE_UP_AT = 0.6            # Scale up when it is below this share (larger targets cost ~scale^2 more)
+NO_GAIN_RATIO = 0.97         # A scale-down that saves less than 3% is undone (the world is not the bottleneck)
+FLOOR_RETRY_FRAMES = 600     # Frames before scaling down is tried again after an undone step
+
+class RenderTarget:
+    """
+    Internal render target for the world (pitch, crowd, goal, ball, keeper, wall).
+
+    The world is drawn into a surface `scale` times the window size and upscaled once
+    to the window; the HUD is then drawn on the window at native resolution. With
+    dynamic resolution on, the scale follows the measured frame time between
+    render_scale_min and render_scale_max, in render_scale_step increments. The
+    camera viewport (and so its focal length) always matches the target size.
+
+    Lowering the resolution only helps when drawing the world is what makes frames
+    slow; a step down that does not make frames cheaper is undone, and scaling down
+    is not retried for a while.
+    """
+
+    def __init__(self, output_size, camera, adaptive=True):
+        self.output_size = output_size
+        self.camera = camera
+        self.adaptive = adaptive # False keeps the scale fixed (headless runs must render identically)
+        self.surface = None
+        self.frame_time = None   # Smoothed busy time per frame, in seconds
+        self.cooldown = SCALE_COOLDOWN_FRAMES
+        self.scale_changes = 0
+        self.pending_check = None # (previous scale, its frame time) after a step down
+        self.floor_scale = 0.0    # Lowest scale worth using for now (raised by undone steps)
+        self.floor_frames = 0
+        self.reload_config()
+        self.scale = self.max_scale if adaptive else 1.0
+        config_manager.subscribe(self.on_config_changed, RENDER_SCALE_SETTING_KEYS)
+
+    def on_config_changed(self, changed_keys):
+        self.reload_config()
+        if self.adaptive:
+            self.scale = min(self.max_scale, max(self.min_scale, self.scale))
+
+    def reload_config(self):
+        self.enabled = config_manager.get_setting('dynamic_resolution_enabled', default=True)
+        self.min_scale = config_manager.get_setting('render_scale_min', default=0.5)
+        self.max_scale = config_manager.get_setting('render_scale_max', default=1.0)
+        self.step = config_manager.get_setting('render_scale_step', default=0.1)
+        self.frame_budget = 1.0 / config_manager.get_setting('render_target_fps', default=60)
+        self.smooth = config_manager.get_setting('render_upscale_smooth', default=False)
+
+    @property
+    def size(self):
+        return (max(1, round(self.output_size[0] * self.scale)), max(1, round(self.output_size[1] * self.scale)))
+
+    def begin(self, screen):
+        """The surface to draw the world into this frame (the window itself at full scale)."""
+        size = self.size
+        if size == self.output_size:
+            self.surface = screen
+        elif self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                self.surface = self.surface.convert()
+            memory_registry.track(self.surface, "render_target", "world")
+        if (self.camera.viewport_width, self.camera.viewport_height) != size:
+            self.camera.set_viewport(*size) # Bumps camera.version, so cached layers rebuild at the new size
+        return self.surface
+
+    def present(self, screen):
+        """Upscales the world to the window; the HUD is drawn on `screen` afterwards."""
+        if self.surface is screen:
+            return
+        if self.smooth:
+            pygame.transform.smoothscale(self.surface, self.output_size, screen)
+        else:
+            pygame.transform.scale(self.surface, self.output_size, screen)
+
+    def to_render(self, pos):
+        """Window coordinates (e.g. the mouse) -> render target coordinates."""
+        return (pos[0] * self.scale, pos[1] * self.scale)
+
+    def to_window(self, pos):
+        """Render target coordinates (e.g. a projected world point) -> window coordinates."""
+        return (round(pos[0] / self.scale), round(pos[1] / self.scale))
+
+    def record_frame_time(self, seconds):
+        """Feeds the busy time of one frame (events, update, render) to the scale controller."""
+        if not (self.adaptive and self.enabled):
+            return
+        if self.frame_time is None:
+            self.frame_time = seconds
+        else:
+            self.frame_time += (seconds - self.frame_time) * FRAME_TIME_SMOOTHING
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return
+        if self.pending_check is not None:
+            previous_scale, previous_time = self.pending_check
+            self.pending_check = None
+            if self.frame_time > previous_time * NO_GAIN_RATIO:
+                self.floor_scale = previous_scale
+                self.floor_frames = FLOOR_RETRY_FRAMES
+                self.set_scale(previous_scale)
+                return
+        if self.floor_frames > 0:
+            self.floor_frames -= 1
+            if self.floor_frames == 0:
+                self.floor_scale = 0.0
+
+        if self.frame_time > self.frame_budget * SCALE_DOWN_AT and self.scale > max(self.min_scale, self.floor_scale):
+            self.pending_check = (self.scale, self.frame_time)
+            self.set_scale(max(self.min_scale, self.scale - self.step))
+        elif self.frame_time < self.frame_budget * SCALE_UP_AT and self.scale < self.max_scale:
+            self.set_scale(min(self.max_scale, self.scale + self.step))
+
+    def set_scale(self, scale):
+        scale = round(scale, 3)
+        if scale == self.scale:
+            return
+        print(f"Render scale {self.scale:.2f} -> {scale:.2f} (frame time {self.frame_time * 1000:.1f} ms)")
+        self.scale = scale
+        self.scale_changes += 1
+        self.frame_time = None # Measure the new scale afresh
+        self.cooldown = SCALE_COOLDOWN_FRAMES
@@ -0,0 +1,231 @@
+"""
+Goal Masters - Offline rendering of recorded kicks to PNG sequences.
+
+Kicks recorded in the shots database (placement, aim, contact point and power) are
+replayed with a fixed time step and drawn with the same Game.render() used on
+screen, into an offscreen surface (SDL dummy drivers), then saved as numbered PNGs
+at the requested resolution and frame rate.
+
+The work is split across a process pool. Each task is one kick, or a range of frames
+of one kick: a worker simulates the kick from the start without drawing up to the
+first frame of its range, then renders and saves only its own frames. The simulation
+is deterministic for a given kick (fixed dt, knuckle randomness seeded per kick), so
+frames rendered by different workers line up.
+
+Usage (from the PyGameDesoft directory):
+    python -m goal_masters.replay_render --out highlights --outcome goal --since-hours 12
+    python -m goal_masters.replay_render --out clips --size 1920x1080 --fps 30 --workers 8
+"""
+
+import os
+
+# Select the dummy drivers before pygame initialises; spawned workers inherit the environment
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import math
+import multiprocessing
+import random
+import sqlite3
+import sys
+import time
+
+import pygame
+
+from . import constants
+
+DB_PATH = os.path.join(os.path.dirname(__file__), "..", "shots.db")
+PLAYER_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "player.json")
+
+PREROLL_SECONDS = 0.5   # Aiming shown before the kick
+MAX_KICK_SECONDS = 5.0  # Clip length cap after the kick (saved or stopped balls never reset on their own)
+DEFAULT_CHUNK_FRAMES = 60
+
+SHOT_COLUMNS = ('id', 'recorded_at', 'character', 'ball_x', 'ball_y', 'aim_deg',
+                'contact_x', 'contact_z', 'power', 'outcome')
+
+
+def load_shots(db_path, outcome=None, since=None, limit=None):
+    """Recorded kicks from the shots database, oldest first, as dicts."""
+    sql = f"SELECT {', '.join(SHOT_COLUMNS)} FROM shots"
+    conditions, params = [], []
+    if outcome:
+        conditions.append("outcome = ?")
+        params.append(outcome)
+    if since is not None:
+        conditions.append("recorded_at >= ?")
+        params.append(since)
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY recorded_at, id"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    connection = sqlite3.connect(db_path)
+    try:
+        return [dict(zip(SHOT_COLUMNS, row)) for row in connection.execute(sql, params)]
+    finally:
+        connection.close()
+
+
+def setup_kick(game, shot):
+    """Puts the game in ready_to_kick with the shot's character, placement, aim and contact."""
+    if shot['character'] in game.player_config:
+        game.selected_player = shot['character']
+        game.apply_player_config()
+    game.reset_for_kick()
+    # Every clip starts from the same HUD and ball state, whichever task ran before in this worker
+    game.goals_scored = game.attempts_made = game.coins_earned = 0
+    game.ball.spin_angle = 0.0
+    game.follow_camera.reset() # The follow camera may still be easing back from the previous clip
+    game.place_ball_at_position(shot['ball_x'], shot['ball_y'])
+    game.aim_angle = shot['aim_deg']
+    game.kick_angle_rad = math.radians(shot['aim_deg'])
+    game.contact_selector.set_contact_offsets(shot['contact_x'], shot['contact_z'])
+    game.game_state = "ready_to_kick"
+
+
+def simulate(game, shot, seed, dt, preroll_frames):
+    """Replays one kick, yielding the frame index after each simulation step."""
+    random.seed(seed) # Knuckle-ball wobble must be identical in every worker
+    setup_kick(game, shot)
+    frame = 0
+    while True:
+        if frame == preroll_frames:
+            game.kick_ball(shot['power'])
+        game.update(dt)
+        yield frame
+        frame += 1
+
+
+def count_frames(game, shot, seed, fps):
+    """Clip length in frames: pre-roll plus the kick until the scene resets (capped)."""
+    preroll_frames = round(PREROLL_SECONDS * fps)
+    max_frames = preroll_frames + round(MAX_KICK_SECONDS * fps)
+    for frame in simulate(game, shot, seed, 1.0 / fps, preroll_frames):
+        if frame + 1 >= max_frames or (frame >= preroll_frames and game.game_state == "placing_ball"):
+            return frame + 1
+
+
+def plan_tasks(shot_frames, chunk_frames):
+    """Splits each kick into (kick_index, first_frame, end_frame) ranges of at most chunk_frames."""
+    tasks = []
+    for kick_index, frame_count in enumerate(shot_frames):
+        for first in range(0, frame_count, chunk_frames):
+            tasks.append((kick_index, first, min(frame_count, first + chunk_frames)))
+    return tasks
+
+
+# ----- Worker process -----
+
+_worker_game = None
+
+
+def _init_worker(player_config):
+    global _worker_game
+    sys.stdout = open(os.devnull, "w") # The game logs every bounce; keep worker output quiet
+    from .main import Game
+    _worker_game = Game(player_config=player_config, headless=True, follow_camera_enabled=True)
+
+
+def render_range(shot, seed, fps, size, out_dir, first_frame, end_frame):
+    """Renders frames [first_frame, end_frame) of one kick to out_dir. Returns the frame count."""
+    game = _worker_game
+    target = pygame.Surface(size) if size != game.screen.get_size() else None
+    preroll_frames = round(PREROLL_SECONDS * fps)
+    os.makedirs(out_dir, exist_ok=True)
+    for frame in simulate(game, shot, seed, 1.0 / fps, preroll_frames):
+        if frame >= end_frame:
+            break
+        if frame < first_frame:
+            continue # Fast-forward: simulate only
+        game.render()
+        image = game.screen
+        if target is not None:
+            pygame.transform.smoothscale(game.screen, size, target)
+            image = target
+        pygame.image.save(image, os.path.join(out_dir, f"frame_{frame:05d}.png"))
+    game.current_shot = None # Replays are never reported as new shots
+    return end_frame - first_frame
+
+
+def render_replays(shots, out_dir, size=(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT), fps=60,
+                   workers=None, chunk_frames=DEFAULT_CHUNK_FRAMES, player_config=None, seed=0):
+    """
+    Renders every shot to out_dir/kick_NNNN/frame_NNNNN.png on a process pool.
+    Returns a dict with kick, frame and timing counts.
+    """
+    from .main import Game
+
+    if player_config is None:
+        with open(PLAYER_CONFIG_FILE, "r") as f:
+            player_config = json.load(f)
+
+    # Plan on the main process: a dry run without drawing is cheap and gives each clip's length
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        planner = Game(player_config=player_config, headless=True, follow_camera_enabled=True)
+        shot_frames = [count_frames(planner, shot, seed + index, fps) for index, shot in enumerate(shots)]
+    tasks = plan_tasks(shot_frames, chunk_frames)
+    plan_seconds = time.perf_counter() - start
+
+    context = multiprocessing.get_context("spawn") # SDL state must not be forked
+    frames_done = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                initializer=_init_worker,
+                                                initargs=(player_config,)) as pool:
+        futures = [pool.submit(render_range, shots[kick_index], seed + kick_index, fps, tuple(size),
+                               os.path.join(out_dir, f"kick_{kick_index + 1:04d}"), first, end)
+                   for kick_index, first, end in tasks]
+        for future in concurrent.futures.as_completed(futures):
+            frames_done += future.result()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'kicks': len(shots),
+        'frames': frames_done,
+        'tasks': len(tasks),
+        'plan_seconds': plan_seconds,
+        'seconds': elapsed,
+        'frames_per_second': frames_done / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render recorded kicks to PNG sequences")
+    parser.add_argument("--db", default=DB_PATH, help="Shots database written by the game")
+    parser.add_argument("--out", default="replays", help="Output directory (one sub-directory per kick)")
+    parser.add_argument("--outcome", default="goal", help="Only kicks with this outcome ('' for all)")
+    parser.add_argument("--since-hours", type=float, default=None, help="Only kicks from the last N hours")
+    parser.add_argument("--limit", type=int, default=None, help="At most this many kicks")
+    parser.add_argument("--size", type=parse_size, default=(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT),
+                        help="Output resolution, e.g. 1920x1080")
+    parser.add_argument("--fps", type=int, default=60, help="Frame rate (also the simulation step)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-frames", type=int, default=DEFAULT_CHUNK_FRAMES,
+                        help="Frames per task; long kicks are split across workers")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.since_hours * 3600 if args.since_hours is not None else None
+    shots = load_shots(args.db, args.outcome or None, since, args.limit)
+    if not shots:
+        print("No recorded kicks match.")
+        return 0
+    print(f"Rendering {len(shots)} kick(s) at {args.size[0]}x{args.size[1]}, {args.fps} FPS...")
+    stats = render_replays(shots, args.out, args.size, args.fps, args.workers, args.chunk_frames)
+    print(f"{stats['frames']} frames in {stats['tasks']} task(s) rendered in {stats['seconds']:.2f}s "
+          f"({stats['frames_per_second']:.0f} frames/s, planning {stats['plan_seconds']:.2f}s) -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
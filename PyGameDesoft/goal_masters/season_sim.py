@@ -0,0 +1,323 @@
+"""
+Goal Masters - Shootout and season simulator for the store economy.
+
+Every character in player.json takes simulated kicks against the Goalkeeper AI,
+with the same ball physics and goal/save/miss rules as the game (ShootoutSimulation).
+Shooter behaviour (placement, target, aim error, contact point, power) is sampled
+from configurable distributions. Two kinds of runs are aggregated:
+
+* Free play: kicks from sampled placements, paid like in Game.update() (10/20/40
+  coins by distance band). Gives goal rate and coins earned per attempt, and from
+  them what each store price is worth: attempts needed to afford it and attempts
+  until the faster coin rate pays the price back.
+* Seasons: round-robin penalty shootouts between every pair of characters (best of
+  5 from the spot, then sudden death), with a league table.
+
+The work is split into tasks (a batch of kicks for one character, or one season),
+run on a process pool. Each task seeds its own RNG from the base seed and its index,
+so a run is reproducible whatever the number of workers.
+
+Usage (from the PyGameDesoft directory):
+    python -m goal_masters.season_sim --attempts 20000 --seasons 50
+    python -m goal_masters.season_sim --behaviour cautious.json --json economy.json
+"""
+
+import argparse
+import concurrent.futures
+import copy
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from . import constants
+from . import net_protocol as proto
+from .analytics import distance_band
+from .config import config_manager
+from .shootout_server import ShootoutSimulation, PENALTY_SPOT_Y
+
+PLAYER_CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "player.json")
+DT = 1.0 / 60.0
+SHOOTOUT_ROUNDS = 5
+MAX_SUDDEN_DEATH_ROUNDS = 20  # A shootout still level after this is recorded as a draw
+KICKS_PER_TASK = 1000
+
+# Shooter behaviour. Each entry is a distribution: {"dist": "uniform", "low", "high"},
+# {"dist": "normal", "mean", "std"} (optionally clipped with "low"/"high") or {"value"}.
+DEFAULT_BEHAVIOUR = {
+    # Free-play placement, as allowed by Game.handle_events()
+    'ball_x': {'dist': 'uniform', 'low': -15.0, 'high': 15.0},
+    'ball_y': {'dist': 'uniform', 'low': 16.5, 'high': 45.0},
+    # Point on the goal line the shooter aims at, and the error on the aim angle (degrees)
+    'target_x': {'dist': 'uniform', 'low': -3.3, 'high': 3.3},
+    'aim_error': {'dist': 'normal', 'mean': 0.0, 'std': 3.0},
+    # Contact point on the ball (metres from the centre, see ContactSelector)
+    'contact_x': {'dist': 'normal', 'mean': 0.0, 'std': 0.04, 'low': -constants.BALL_RADIUS, 'high': constants.BALL_RADIUS},
+    'contact_z': {'dist': 'normal', 'mean': -0.02, 'std': 0.04, 'low': -constants.BALL_RADIUS, 'high': constants.BALL_RADIUS},
+    # Power bar fraction at release
+    'power': {'dist': 'normal', 'mean': 0.65, 'std': 0.2, 'low': 0.0, 'high': 1.0},
+}
+
+
+def sample(rng, spec):
+    """Draws one value from a behaviour distribution."""
+    dist = spec.get('dist', 'value')
+    if dist == 'uniform':
+        return rng.uniform(spec['low'], spec['high'])
+    if dist == 'normal':
+        value = rng.gauss(spec['mean'], spec['std'])
+        return min(spec.get('high', math.inf), max(spec.get('low', -math.inf), value))
+    if dist == 'value':
+        return spec['value']
+    raise ValueError(f"Unknown distribution '{dist}'")
+
+
+def load_behaviour(path=None):
+    """DEFAULT_BEHAVIOUR, with the entries of a JSON file (if given) replacing the defaults."""
+    behaviour = copy.deepcopy(DEFAULT_BEHAVIOUR)
+    if path:
+        with open(path, 'r') as f:
+            behaviour.update(json.load(f))
+    return behaviour
+
+
+def use_character(stats):
+    """Kick stats of a character, as Game.apply_player_config() sets them."""
+    config_manager.set_overrides({
+        'min_kick_strength': stats['min_kick_strength'],
+        'max_kick_strength': stats['max_kick_strength'],
+        'max_kick_curve': stats['max_kick_curve'],
+    })
+
+
+def take_kick(sim, rng, behaviour, ball_x, ball_y):
+    """One kick from (ball_x, ball_y) against the keeper AI. Returns the result phase."""
+    sim.ball.spawn()
+    sim.ball.world_pos.xyz = (ball_x, ball_y, constants.BALL_REST_Z)
+    sim.goalkeeper.reset()
+    sim.phase = proto.PHASE_READY
+    sim.phase_timer = 0.0
+    target_x = sample(rng, behaviour['target_x'])
+    aim_deg = math.degrees(math.atan2(target_x - ball_x, ball_y)) + sample(rng, behaviour['aim_error'])
+    sim.kick(sample(rng, behaviour['power']), aim_deg,
+             sample(rng, behaviour['contact_x']), sample(rng, behaviour['contact_z']))
+    while sim.phase == proto.PHASE_FLIGHT:
+        sim.step(DT)
+    return sim.phase
+
+
+def new_simulation():
+    sim = ShootoutSimulation()
+    sim.keeper_move = None # No remote player: Goalkeeper.update() runs its AI
+    return sim
+
+
+# ----- Tasks (run in the worker processes) -----
+
+def _init_worker():
+    sys.stdout = open(os.devnull, "w") # Ball and keeper log every bounce and save
+
+
+def free_play_task(name, stats, behaviour, kicks, seed):
+    """`kicks` free-play attempts for one character. Returns ('free_play', name, totals)."""
+    rng = random.Random(seed)
+    random.seed(seed) # Knuckle-ball wobble uses the module RNG
+    use_character(stats)
+    sim = new_simulation()
+    totals = {'attempts': kicks, 'goals': 0, 'saves': 0, 'misses': 0, 'coins': 0,
+              'penalty_attempts': 0, 'penalty_goals': 0}
+    for _ in range(kicks):
+        ball_x = sample(rng, behaviour['ball_x'])
+        ball_y = sample(rng, behaviour['ball_y'])
+        result = take_kick(sim, rng, behaviour, ball_x, ball_y)
+        if result == proto.PHASE_GOAL:
+            totals['goals'] += 1
+            totals['coins'] += distance_band(ball_y)
+        elif result == proto.PHASE_SAVE:
+            totals['saves'] += 1
+        else:
+            totals['misses'] += 1
+        # One penalty from the spot per free-play kick, for the spot conversion rate
+        totals['penalty_attempts'] += 1
+        totals['penalty_goals'] += take_kick(sim, rng, behaviour, 0.0, PENALTY_SPOT_Y) == proto.PHASE_GOAL
+    return 'free_play', name, totals
+
+
+def shootout(sim, rng, behaviour, stats_a, stats_b):
+    """Best of SHOOTOUT_ROUNDS penalties each, then sudden death. Returns (goals_a, goals_b)."""
+    goals = [0, 0]
+    for round_index in range(SHOOTOUT_ROUNDS + MAX_SUDDEN_DEATH_ROUNDS):
+        for side, stats in enumerate((stats_a, stats_b)):
+            use_character(stats)
+            goals[side] += take_kick(sim, rng, behaviour, 0.0, PENALTY_SPOT_Y) == proto.PHASE_GOAL
+            if round_index < SHOOTOUT_ROUNDS:
+                # Decided early once the trailing side cannot catch up
+                kicks_left = [SHOOTOUT_ROUNDS - round_index - 1, SHOOTOUT_ROUNDS - round_index - (side == 1)]
+                if goals[0] + kicks_left[0] < goals[1] or goals[1] + kicks_left[1] < goals[0]:
+                    return tuple(goals)
+        if round_index >= SHOOTOUT_ROUNDS - 1 and goals[0] != goals[1]:
+            return tuple(goals)
+    return tuple(goals)
+
+
+def season_task(characters, behaviour, seed):
+    """One round-robin season. Returns ('season', None, {name: [wins, draws, losses, goals for, goals against]})."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    sim = new_simulation()
+    table = {name: [0, 0, 0, 0, 0] for name in characters}
+    for home, away in itertools.combinations(characters, 2):
+        goals_home, goals_away = shootout(sim, rng, behaviour, characters[home], characters[away])
+        table[home][3] += goals_home
+        table[home][4] += goals_away
+        table[away][3] += goals_away
+        table[away][4] += goals_home
+        if goals_home == goals_away:
+            table[home][1] += 1
+            table[away][1] += 1
+        else:
+            winner, loser = (home, away) if goals_home > goals_away else (away, home)
+            table[winner][0] += 1
+            table[loser][2] += 1
+    return 'season', None, table
+
+
+# ----- Aggregation -----
+
+def economy_report(characters, free_play):
+    """Per character: rates, coins per attempt and what its store price is worth."""
+    report = []
+    for name, stats in characters.items():
+        totals = free_play[name]
+        attempts = totals['attempts']
+        report.append({
+            'name': name,
+            'price': stats.get('price', 0),
+            'attempts': attempts,
+            'goal_rate': totals['goals'] / attempts,
+            'save_rate': totals['saves'] / attempts,
+            'miss_rate': totals['misses'] / attempts,
+            'penalty_goal_rate': totals['penalty_goals'] / totals['penalty_attempts'],
+            'coins_per_attempt': totals['coins'] / attempts,
+        })
+    report.sort(key=lambda entry: entry['price'])
+    base = report[0]['coins_per_attempt'] # The free starting character
+    previous = None
+    for entry in report:
+        cpa = entry['coins_per_attempt']
+        # Attempts needed to afford this character while playing the next cheaper one
+        entry['attempts_to_afford'] = (entry['price'] / previous['coins_per_attempt']
+                                       if previous and previous['coins_per_attempt'] > 0 else 0.0)
+        # Attempts until the extra coins per attempt (over the free character) repay the price
+        gain = cpa - base
+        entry['coin_gain_per_attempt'] = gain
+        entry['payback_attempts'] = entry['price'] / gain if gain > 0 else (0.0 if entry['price'] == 0 else math.inf)
+        previous = entry
+    return report
+
+
+def season_report(tables):
+    standings = {}
+    for table in tables:
+        ranked = sorted(table, key=lambda name: (3 * table[name][0] + table[name][1],
+                                                 table[name][3] - table[name][4]), reverse=True)
+        for name, row in table.items():
+            entry = standings.setdefault(name, {'name': name, 'wins': 0, 'draws': 0, 'losses': 0,
+                                                'goals_for': 0, 'goals_against': 0, 'titles': 0})
+            for key, value in zip(('wins', 'draws', 'losses', 'goals_for', 'goals_against'), row):
+                entry[key] += value
+        standings[ranked[0]]['titles'] += 1
+    seasons = len(tables)
+    for entry in standings.values():
+        entry['points_per_season'] = (3 * entry['wins'] + entry['draws']) / seasons
+    return sorted(standings.values(), key=lambda entry: entry['points_per_season'], reverse=True)
+
+
+def run(characters, behaviour, attempts, seasons, workers=None, seed=0, kicks_per_task=KICKS_PER_TASK):
+    """Runs every task on a process pool and returns the aggregated report."""
+    start = time.perf_counter()
+    free_play = {name: {'attempts': 0, 'goals': 0, 'saves': 0, 'misses': 0, 'coins': 0,
+                        'penalty_attempts': 0, 'penalty_goals': 0} for name in characters}
+    tables = []
+    task_index = 0
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                initializer=_init_worker) as pool:
+        futures = []
+        for name, stats in characters.items():
+            for first in range(0, attempts, kicks_per_task):
+                task_index += 1
+                futures.append(pool.submit(free_play_task, name, stats, behaviour,
+                                           min(kicks_per_task, attempts - first), seed + task_index))
+        for _ in range(seasons):
+            task_index += 1
+            futures.append(pool.submit(season_task, characters, behaviour, seed + task_index))
+        for future in concurrent.futures.as_completed(futures):
+            kind, name, result = future.result()
+            if kind == 'free_play':
+                for key, value in result.items():
+                    free_play[name][key] += value
+            else:
+                tables.append(result)
+    return {
+        'attempts_per_character': attempts,
+        'seasons': seasons,
+        'seed': seed,
+        'tasks': task_index,
+        'seconds': time.perf_counter() - start,
+        'behaviour': behaviour,
+        'economy': economy_report(characters, free_play) if attempts else [],
+        'standings': season_report(tables) if tables else [],
+    }
+
+
+def print_report(report):
+    if report['economy']:
+        print(f"Free play ({report['attempts_per_character']} attempts per character):")
+        print(f"  {'Character':<22}{'Price':>6}{'Goal':>7}{'Save':>7}{'Miss':>7}{'Spot':>7}"
+              f"{'Coins/att':>10}{'To afford':>11}{'Payback':>9}")
+        for entry in report['economy']:
+            payback = "-" if math.isinf(entry['payback_attempts']) else f"{entry['payback_attempts']:.0f}"
+            print(f"  {entry['name']:<22}{entry['price']:>6}{entry['goal_rate']:>7.1%}{entry['save_rate']:>7.1%}"
+                  f"{entry['miss_rate']:>7.1%}{entry['penalty_goal_rate']:>7.1%}{entry['coins_per_attempt']:>10.2f}"
+                  f"{entry['attempts_to_afford']:>11.0f}{payback:>9}")
+        print("  To afford: attempts needed with the next cheaper character; "
+              "Payback: attempts until the extra coins repay the price.")
+    if report['standings']:
+        print(f"Seasons ({report['seasons']} round robins of penalty shootouts):")
+        print(f"  {'Character':<22}{'W':>6}{'D':>6}{'L':>6}{'GF':>7}{'GA':>7}{'Pts/season':>12}{'Titles':>8}")
+        for entry in report['standings']:
+            print(f"  {entry['name']:<22}{entry['wins']:>6}{entry['draws']:>6}{entry['losses']:>6}"
+                  f"{entry['goals_for']:>7}{entry['goals_against']:>7}{entry['points_per_season']:>12.2f}"
+                  f"{entry['titles']:>8}")
+    print(f"{report['tasks']} task(s) in {report['seconds']:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate shootouts and seasons between the characters")
+    parser.add_argument("--attempts", type=int, default=10000, help="Free-play attempts per character")
+    parser.add_argument("--seasons", type=int, default=20, help="Round-robin seasons to simulate")
+    parser.add_argument("--behaviour", default=None, help="JSON file overriding the shooter distributions")
+    parser.add_argument("--players", default=PLAYER_CONFIG_FILE, help="Character file (player.json)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed; task N uses seed + N")
+    parser.add_argument("--json", default=None, help="Also write the full report to this JSON file")
+    args = parser.parse_args(argv)
+
+    with open(args.players, 'r') as f:
+        characters = json.load(f)
+    report = run(characters, load_behaviour(args.behaviour), args.attempts, args.seasons, args.workers, args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+"""
+Goal Masters - Networked penalty shootout client.
+
+The client runs its network loop (asyncio) on a background thread: it sends inputs
+to the authoritative server, decodes the delta-compressed snapshots it gets back and
+keeps a short buffer of them. The game renders the world `interpolation delay`
+behind the newest snapshot, blending between the two snapshots around that time,
+so motion stays smooth at 30 snapshots per second.
+
+Both ends measure the link: the client records round-trip time (which includes
+waiting for the next snapshot to echo the input), input-to-display
+latency (from sending an input until the first snapshot reflecting it is shown) and
+bytes per snapshot/tick; the server records bytes per tick and its own RTT.
+
+Usage (from the PyGameDesoft directory):
+    python -m goal_masters.shootout_client --role shooter --host 192.168.0.10
+    python -m goal_masters.shootout_client --role keeper --local        # stand-in server + bot shooter
+    python -m goal_masters.shootout_client --bots --latency-ms 20       # headless, both sides are bots
+"""
+
+import argparse
+import asyncio
+import collections
+import random
+import socket
+import threading
+import time
+
+import pygame
+
+from . import constants
+from . import net_protocol as proto
+from .main import Game
+from .shootout_server import ShootoutServer, PENALTY_SPOT_Y
+
+SNAPSHOT_BUFFER_SIZE = 32
+CLOCK_SAMPLES = 64   # Recent arrivals used to estimate the server clock
+
+
+class ShootoutClient:
+    def __init__(self, host, port, role):
+        self.host = host
+        self.port = port
+        self.role = role
+        self.tick_rate = proto.TICK_RATE
+        self.snapshot_interval = proto.SNAPSHOT_INTERVAL
+        self.interpolation_delay_ticks = 2 * proto.SNAPSHOT_INTERVAL
+
+        self.lock = threading.Lock()
+        self.loop = None
+        self.writer = None
+        self.thread = None
+        self.connected = threading.Event()
+        self.error = None
+        self.closed = False
+
+        # Received state
+        self.baselines = collections.OrderedDict()  # tick -> quantized state (delta baselines)
+        self.snapshots = collections.deque(maxlen=SNAPSHOT_BUFFER_SIZE)  # (tick, state dict)
+        self.clock_offsets = collections.deque(maxlen=CLOCK_SAMPLES)     # arrival - tick time
+        self.latest_tick = 0
+
+        # Inputs
+        self.input_seq = 0
+        self.keeper_move = 0
+        self.pending_inputs = {}      # seq -> send time, for inputs whose effect we wait to display
+        self.awaiting_display = []    # (first tick that reflects the input, send time)
+        self.last_echoed_seq = 0
+
+        # Measurements
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.full_snapshots = 0
+        self.first_tick = None
+        self.rtt_samples = collections.deque(maxlen=256)
+        self.input_to_display_samples = collections.deque(maxlen=256)
+
+    # ----- Connection (called from the game thread) -----
+
+    def start(self, timeout=5.0):
+        self.thread = threading.Thread(target=lambda: asyncio.run(self._run()),
+                                       name=f"ShootoutClient-{proto.ROLE_NAMES[self.role]}", daemon=True)
+        self.thread.start()
+        if not self.connected.wait(timeout) or self.error:
+            raise ConnectionError(f"Could not join shootout at {self.host}:{self.port}: {self.error or 'timeout'}")
+        return self
+
+    def close(self):
+        self.closed = True
+        if self.loop is not None and self.writer is not None:
+            self.loop.call_soon_threadsafe(self.writer.close)
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+
+    def set_keeper_move(self, move):
+        """Keeper input: -1 (left), 0 (stop) or +1 (right)."""
+        if move != self.keeper_move:
+            self.keeper_move = move
+            self.loop.call_soon_threadsafe(self._send_input, None, True)
+
+    def send_kick(self, power, aim_deg, contact_x, contact_z):
+        self.loop.call_soon_threadsafe(self._send_input, (power, aim_deg, contact_x, contact_z), True)
+
+    # ----- Network thread -----
+
+    async def _run(self):
+        self.loop = asyncio.get_running_loop()
+        try:
+            reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.writer.write(proto.frame(proto.HELLO.pack(proto.MSG_HELLO, self.role)))
+            welcome = await proto.read_message(reader)
+            if welcome[0] != proto.MSG_WELCOME:
+                raise ConnectionError(f"{proto.ROLE_NAMES[self.role]} role already taken")
+            _, _, self.tick_rate, self.snapshot_interval = proto.WELCOME.unpack(welcome)
+            self.interpolation_delay_ticks = 2 * self.snapshot_interval
+        except (OSError, asyncio.IncompleteReadError) as e:
+            self.error = e
+            self.connected.set()
+            return
+        self.connected.set()
+        try:
+            while True:
+                payload = await proto.read_message(reader)
+                if payload[0] == proto.MSG_SNAPSHOT:
+                    self._on_snapshot(payload, len(payload) + proto.LENGTH.size)
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            if not self.closed:
+                print("Shootout client: Disconnected from server")
+
+    def _on_snapshot(self, payload, size):
+        now = time.perf_counter()
+        decoded = proto.decode_snapshot(payload, self.baselines)
+        if decoded is None:
+            return # Base snapshot unknown; the next ack makes the server resend in full
+        tick, values, input_seq, input_time, base_tick = decoded
+        self.baselines[tick] = values
+        while len(self.baselines) > proto.HISTORY_SIZE:
+            self.baselines.popitem(last=False)
+
+        with self.lock:
+            self.bytes_received += size
+            self.snapshots_received += 1
+            self.full_snapshots += base_tick == 0
+            if self.first_tick is None:
+                self.first_tick = tick
+            if tick > self.latest_tick:
+                self.latest_tick = tick
+                self.snapshots.append((tick, proto.dequantize_state(values)))
+                self.clock_offsets.append(now - tick / self.tick_rate)
+            if input_seq > self.last_echoed_seq:
+                self.last_echoed_seq = input_seq
+                self.rtt_samples.append(proto.elapsed_ms(now, input_time))
+                # Inputs now reflected in the world: they are "displayed" once rendering reaches this tick
+                for seq in [seq for seq in self.pending_inputs if seq <= input_seq]:
+                    self.awaiting_display.append((tick, self.pending_inputs.pop(seq)))
+        self._send_input(None, False) # Acknowledge the snapshot (also keeps RTT samples flowing)
+
+    def _send_input(self, kick, track_display):
+        if self.writer is None or self.writer.is_closing():
+            return
+        now = time.perf_counter()
+        self.input_seq += 1
+        if track_display:
+            with self.lock:
+                self.pending_inputs[self.input_seq] = now
+        self.writer.write(proto.frame(proto.encode_input(self.input_seq, self.latest_tick, proto.time_ms(now),
+                                                         self.keeper_move, kick)))
+
+    # ----- Interpolated view (called from the game thread) -----
+
+    def interpolated_state(self, now=None):
+        """World state to display now, or None before the first snapshot."""
+        now = time.perf_counter() if now is None else now
+        with self.lock:
+            if not self.snapshots:
+                return None
+            # Server tick "now", from the lowest-latency arrival seen recently, minus the interpolation delay
+            server_tick = (now - min(self.clock_offsets)) * self.tick_rate
+            render_tick = server_tick - self.interpolation_delay_ticks
+
+            older = newer = None
+            for snapshot in self.snapshots:
+                if snapshot[0] <= render_tick:
+                    older = snapshot
+                else:
+                    newer = snapshot
+                    break
+            if older is None:
+                state = dict(newer[1])
+            elif newer is None:
+                state = dict(older[1])
+            else:
+                # Blend positions; discrete fields (phase, scores) come from the older snapshot
+                t = (render_tick - older[0]) / (newer[0] - older[0])
+                state = dict(older[1])
+                for name in ('ball_x', 'ball_y', 'ball_z', 'keeper_x'):
+                    state[name] = older[1][name] + (newer[1][name] - older[1][name]) * t
+
+            shown = [entry for entry in self.awaiting_display if entry[0] <= render_tick]
+            if shown:
+                self.awaiting_display = [entry for entry in self.awaiting_display if entry[0] > render_tick]
+                self.input_to_display_samples.extend((now - sent) * 1000.0 for _, sent in shown)
+            return state
+
+    def stats(self):
+        with self.lock:
+            ticks = (self.latest_tick - self.first_tick + self.snapshot_interval) if self.first_tick else 0
+            return {
+                'role': proto.ROLE_NAMES[self.role],
+                'bytes_received': self.bytes_received,
+                'snapshots_received': self.snapshots_received,
+                'full_snapshots': self.full_snapshots,
+                'bytes_per_snapshot': self.bytes_received / self.snapshots_received if self.snapshots_received else 0.0,
+                'bytes_per_tick': self.bytes_received / ticks if ticks else 0.0,
+                'rtt_ms': _mean(self.rtt_samples),
+                'input_to_display_ms': _mean(self.input_to_display_samples),
+                'input_to_display_max_ms': max(self.input_to_display_samples, default=0.0),
+                'interpolation_delay_ms': self.interpolation_delay_ticks * 1000.0 / self.tick_rate,
+            }
+
+
+def _mean(samples):
+    return sum(samples) / len(samples) if samples else 0.0
+
+
+def print_client_stats(stats):
+    print(f"Shootout client ({stats['role']}): {stats['bytes_per_snapshot']:.1f} B/snapshot, "
+          f"{stats['bytes_per_tick']:.1f} B/tick ({stats['full_snapshots']} full of {stats['snapshots_received']}), "
+          f"RTT {stats['rtt_ms']:.1f} ms, input-to-display {stats['input_to_display_ms']:.1f} ms "
+          f"(max {stats['input_to_display_max_ms']:.1f}, interpolation delay {stats['interpolation_delay_ms']:.0f} ms)")
+
+
+class RemoteShootoutGame(Game):
+    """
+    The normal game screen driven by server snapshots. The shooter aims, sets the
+    contact point and charges with the usual controls, but the kick is sent to the
+    server; the keeper moves with the Left/Right arrows.
+    """
+
+    SHOOTER_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d,
+                    pygame.K_SPACE, pygame.K_t)
+
+    def __init__(self, client, headless=False):
+        super().__init__(headless=headless)
+        self.client = client
+        self.role = client.role
+        self.phase = None
+        self.net_state = None
+        self.keys_held = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+        self.place_ball_at_position(0.0, PENALTY_SPOT_Y)
+        self.game_state = "waiting"
+
+    def handle_events(self, events=None):
+        forwarded = []
+        for stamp, event in self.stamp_events(events):
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                self.running = False
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                if self.role == proto.ROLE_KEEPER and event.key in self.keys_held:
+                    self.keys_held[event.key] = event.type == pygame.KEYDOWN
+                    self.client.set_keeper_move(self.keys_held[pygame.K_RIGHT] - self.keys_held[pygame.K_LEFT])
+                elif self.role == proto.ROLE_SHOOTER and event.key in self.SHOOTER_KEYS:
+                    forwarded.append((stamp, event))
+            elif event.type == pygame.MOUSEMOTION:
+                forwarded.append((stamp, event))
+        self.process_events(forwarded)
+
+    def kick_ball(self, power, auto=False, late_by=0.0):
+        """Sends the kick to the server instead of simulating it"""
+        cx, cz = self.contact_selector.get_contact_offsets()
+        self.client.send_kick(power, self.aim_angle, cx, cz)
+        if self.kick_sound:
+            self.kick_sound.play()
+        self.attempts_made += 1
+        self.game_state = "waiting" # Until the server's snapshots show the ball in flight
+
+    def update(self, dt):
+        state = self.client.interpolated_state()
+        if state is None:
+            return
+        self.net_state = state
+        self.ball.world_pos.xyz = (state['ball_x'], state['ball_y'], state['ball_z'])
+        self.goalkeeper.world_pos.x = state['keeper_x']
+        self.goals_scored = state['goals']
+
+        if state['phase'] != self.phase:
+            self.phase = state['phase']
+            if self.phase == proto.PHASE_READY:
+                self.power_bar.reset()
+                self.pending_kick_time = None
+                self.game_state = "ready_to_kick" if self.role == proto.ROLE_SHOOTER else "waiting"
+            elif self.phase == proto.PHASE_FLIGHT:
+                self.game_state = "ball_kicked"
+            elif self.phase == proto.PHASE_OVER:
+                self.game_state = "shootout_over"
+            else:
+                self.game_state = "shootout_result"
+                if self.phase == proto.PHASE_GOAL and self.goal_sound:
+                    self.goal_sound.play()
+
+        self.sim_time += dt
+        self.follow_camera.update(dt, self.ball, tracking=self.game_state in ("ball_kicked", "shootout_result"))
+        if self.game_state == "ready_to_kick":
+            now = self.input_time()
+            self.power_bar.update(now)
+            if self.pending_kick_time is not None: # Space released since the last frame
+                self.pending_kick_time = None
+                self.kick_ball(self.power_bar.get_power_fraction())
+            elif self.power_bar.is_fully_charged_for_kick(now):
+                self.kick_ball(self.power_bar.get_power_fraction(), auto=True)
+
+    def draw_overlay(self):
+        font = pygame.font.Font(None, 36)
+        state = self.net_state
+        if state is None:
+            text = font.render("Waiting for the server...", True, constants.WHITE)
+            self.screen.blit(text, text.get_rect(center=(constants.SCREEN_WIDTH // 2, constants.SCREEN_HEIGHT // 2)))
+            return
+        header = (f"{proto.ROLE_NAMES[self.role].upper()}  Round {state['round']}  "
+                  f"Goals: {state['goals']}  Saves: {state['saves']}")
+        text = font.render(header, True, constants.YELLOW)
+        self.screen.blit(text, text.get_rect(center=(constants.SCREEN_WIDTH // 2, 30)))
+
+        messages = {proto.PHASE_GOAL: ("GOAL!", constants.YELLOW), proto.PHASE_SAVE: ("SAVED!", constants.BLUE),
+                    proto.PHASE_MISS: ("MISS!", constants.RED), proto.PHASE_OVER: ("Shootout over - ESC to exit", constants.WHITE)}
+        if state['phase'] in messages:
+            message, color = messages[state['phase']]
+            text = font.render(message, True, color)
+            self.screen.blit(text, text.get_rect(center=(constants.SCREEN_WIDTH // 2, constants.SCREEN_HEIGHT // 2)))
+
+        stats = self.client.stats()
+        net_text = pygame.font.Font(None, 24).render(f"RTT {stats['rtt_ms']:.0f} ms  Input->display {stats['input_to_display_ms']:.0f} ms  "
+                               f"{stats['bytes_per_tick']:.1f} B/tick", True, constants.WHITE)
+        self.screen.blit(net_text, (10, 55))
+
+
+# ----- Bots (headless testing against the localhost stand-in server) -----
+
+class ShooterBot:
+    def __init__(self, client, rng):
+        self.client = client
+        self.rng = rng
+        self.kicked_round = 0
+        self.kick_at = None
+
+    def update(self, now):
+        state = self.client.interpolated_state(now)
+        if state is None or state['phase'] != proto.PHASE_READY or state['round'] == self.kicked_round:
+            return state
+        if self.kick_at is None:
+            self.kick_at = now + self.rng.uniform(0.3, 0.8) # Take a moment to "aim"
+        elif now >= self.kick_at:
+            self.client.send_kick(self.rng.uniform(0.2, 1.0), self.rng.uniform(-12.0, 12.0),
+                                  self.rng.uniform(-0.08, 0.08), self.rng.uniform(-0.08, 0.02))
+            self.kicked_round = state['round']
+            self.kick_at = None
+        return state
+
+
+class KeeperBot:
+    def __init__(self, client, rng):
+        self.client = client
+        self.reaction_x = rng.uniform(0.2, 0.6) # Dead zone, so the bot keeper is beatable
+
+    def update(self, now):
+        state = self.client.interpolated_state(now)
+        if state is None:
+            return state
+        target_x = state['ball_x'] if state['phase'] == proto.PHASE_FLIGHT else 0.0
+        offset = target_x - state['keeper_x']
+        self.client.set_keeper_move(0 if abs(offset) < self.reaction_x else (1 if offset > 0 else -1))
+        return state
+
+
+def run_bots(bots, timeout):
+    """Steps the bots at 60 Hz until the shootout is over (or timeout seconds pass)."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        now = time.perf_counter()
+        states = [bot.update(now) for bot in bots]
+        if all(state is not None and state['phase'] == proto.PHASE_OVER for state in states):
+            return True
+        time.sleep(1.0 / 60.0)
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Goal Masters networked penalty shootout")
+    parser.add_argument("--role", choices=("shooter", "keeper"), default="shooter")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=proto.DEFAULT_PORT)
+    parser.add_argument("--local", action="store_true",
+                        help="Start a stand-in server on localhost with a bot playing the other role")
+    parser.add_argument("--bots", action="store_true",
+                        help="Headless test: stand-in server and bots for both roles, then print measurements")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in server's simulated one-way delay")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    rng = random.Random(args.seed)
+    server = None
+    if args.local or args.bots:
+        server = ShootoutServer('127.0.0.1', 0, rounds=args.rounds, latency_ms=args.latency_ms).start_in_thread()
+        args.host, args.port = '127.0.0.1', server.port
+
+    role = proto.ROLE_SHOOTER if args.role == "shooter" else proto.ROLE_KEEPER
+    other_role = proto.ROLE_KEEPER if role == proto.ROLE_SHOOTER else proto.ROLE_SHOOTER
+    clients = []
+    try:
+        if args.bots:
+            shooter = ShootoutClient(args.host, args.port, proto.ROLE_SHOOTER).start()
+            keeper = ShootoutClient(args.host, args.port, proto.ROLE_KEEPER).start()
+            clients = [shooter, keeper]
+            finished = run_bots([ShooterBot(shooter, rng), KeeperBot(keeper, rng)], timeout=args.rounds * 12.0)
+            print(f"Bot shootout {'finished' if finished else 'timed out'}")
+        else:
+            client = ShootoutClient(args.host, args.port, role).start()
+            clients = [client]
+            if args.local:
+                bot_client = ShootoutClient(args.host, args.port, other_role).start()
+                clients.append(bot_client)
+                bot = (ShooterBot if other_role == proto.ROLE_SHOOTER else KeeperBot)(bot_client, rng)
+                threading.Thread(target=run_bots, args=([bot], 3600.0), daemon=True).start()
+            pygame.display.set_caption(f"Goal Masters - Shootout ({args.role})")
+            RemoteShootoutGame(client).run()
+    finally:
+        for client in clients:
+            print_client_stats(client.stats())
+            client.close()
+        if server is not None:
+            server.stop()
+        pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
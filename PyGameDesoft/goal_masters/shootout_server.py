@@ -0,0 +1,334 @@
+"""
+Goal Masters - Authoritative server for the networked penalty shootout.
+
+One client shoots (aim, contact point and power, as in the normal game) and the
+other drives the goalkeeper left/right. The server owns the only real Ball and
+Goalkeeper and steps them at a fixed tick rate; clients only send inputs and
+render the delta-compressed snapshots they receive (see net_protocol).
+
+Usage (from the PyGameDesoft directory):
+    python -m goal_masters.shootout_server --port 5555
+    python -m goal_masters.shootout_server --latency-ms 40   # stand-in with simulated LAN delay
+"""
+
+import argparse
+import asyncio
+import collections
+import socket
+import threading
+import time
+
+import pygame
+
+from . import constants
+from . import net_protocol as proto
+from .entities.ball import Ball
+from .entities.goalkeeper import Goalkeeper
+
+PENALTY_SPOT_Y = 11.0       # metres from the goal line
+RESULT_DISPLAY_TIME = 2.0   # Seconds a goal/save/miss is shown before the next round
+FLIGHT_TIMEOUT = 6.0        # A kick still unresolved after this long counts as a miss
+STATS_INTERVAL = 5          # Seconds between server statistics prints
+
+
+class ShootoutSimulation:
+    """The shootout rules around one Ball and one Goalkeeper (no rendering)."""
+
+    def __init__(self, rounds=5):
+        self.rounds = rounds
+        self.ball = Ball(initial_position=(0.0, PENALTY_SPOT_Y, constants.BALL_REST_Z))
+        self.goalkeeper = Goalkeeper()
+        self.keeper_move = 0
+        self.phase = proto.PHASE_READY
+        self.round = 1
+        self.goals = 0
+        self.saves = 0
+        self.phase_timer = 0.0
+
+    def kick(self, power, aim_deg, contact_x, contact_z):
+        if self.phase != proto.PHASE_READY:
+            return False
+        self.ball.kick(power_fraction=power, horizontal_aim_deg=aim_deg,
+                       pointer_x_offset=contact_x, pointer_z_offset=contact_z)
+        self.phase = proto.PHASE_FLIGHT
+        self.phase_timer = 0.0
+        return True
+
+    def step(self, dt):
+        self.phase_timer += dt
+        if self.phase == proto.PHASE_OVER:
+            return
+        # The keeper may move at any time, like a real keeper on the line
+        self.goalkeeper.update(dt, self.ball, control=self.keeper_move)
+
+        if self.phase == proto.PHASE_FLIGHT:
+            self.ball.update(dt)
+            # Same save/goal/miss rules as Game.update()
+            if self.goalkeeper.check_save(self.ball) and self.goalkeeper.save_ball(self.ball):
+                self.finish_round(proto.PHASE_SAVE)
+            elif self.ball.world_pos.y <= 0:
+                if constants.GOAL_MIN_X <= self.ball.world_pos.x <= constants.GOAL_MAX_X and \
+                   constants.BALL_RADIUS <= self.ball.world_pos.z <= constants.CROSSBAR_Z:
+                    self.finish_round(proto.PHASE_GOAL)
+                else:
+                    self.finish_round(proto.PHASE_MISS)
+            elif not self.ball.is_kicked or self.phase_timer >= FLIGHT_TIMEOUT:
+                self.finish_round(proto.PHASE_MISS)
+        elif self.phase in (proto.PHASE_GOAL, proto.PHASE_SAVE, proto.PHASE_MISS):
+            self.ball.update(dt) # Keep the ball moving while the result is shown
+            if self.phase_timer >= RESULT_DISPLAY_TIME:
+                self.next_round()
+
+    def finish_round(self, phase):
+        self.phase = phase
+        self.phase_timer = 0.0
+        if phase == proto.PHASE_GOAL:
+            self.goals += 1
+        elif phase == proto.PHASE_SAVE:
+            self.saves += 1
+        print(f"Shootout round {self.round}: {proto.PHASE_NAMES[phase]} (goals {self.goals}, saves {self.saves})")
+
+    def next_round(self):
+        if self.round >= self.rounds:
+            self.phase = proto.PHASE_OVER
+            print(f"Shootout over: {self.goals} goal(s), {self.saves} save(s) in {self.rounds} rounds")
+            return
+        self.round += 1
+        self.ball.spawn()
+        self.ball.world_pos.xyz = (0.0, PENALTY_SPOT_Y, constants.BALL_REST_Z)
+        self.goalkeeper.reset()
+        self.phase = proto.PHASE_READY
+        self.phase_timer = 0.0
+
+    def state(self):
+        return {
+            'phase': self.phase,
+            'round': self.round,
+            'goals': self.goals,
+            'saves': self.saves,
+            'ball_x': self.ball.world_pos.x,
+            'ball_y': self.ball.world_pos.y,
+            'ball_z': self.ball.world_pos.z,
+            'keeper_x': self.goalkeeper.world_pos.x,
+        }
+
+
+class ClientConnection:
+    def __init__(self, role, writer):
+        self.role = role
+        self.writer = writer
+        self.acked_tick = 0          # Last snapshot the client confirmed (delta baseline)
+        self.last_input_seq = 0
+        self.last_input_time = 0     # Client timestamp of that input, echoed back for RTT
+        self.history = collections.OrderedDict()  # tick -> quantized state sent
+        self.sent_at = {}            # tick -> perf_counter() when the snapshot was sent
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.full_snapshots = 0
+        self.rtt_samples = collections.deque(maxlen=256)
+
+
+class ShootoutServer:
+    def __init__(self, host='127.0.0.1', port=proto.DEFAULT_PORT, tick_rate=proto.TICK_RATE,
+                 snapshot_interval=proto.SNAPSHOT_INTERVAL, rounds=5, latency_ms=0.0):
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.latency = latency_ms / 1000.0 # One-way delay added by the stand-in server
+        self.simulation = ShootoutSimulation(rounds)
+        self.clients = {}     # role -> ClientConnection
+        self.connections = [] # Every connection so far, for the final statistics
+        self.tick = 0
+        self.server = None
+        self.loop = None
+        self.stopped = None
+        self.thread = None
+        self.bytes_per_tick = collections.deque(maxlen=proto.TICK_RATE * 10)
+        self.tick_overruns = 0
+
+    async def serve(self, ready=None):
+        """Runs the server until stop() is called. `ready` (a threading.Event) is set once listening."""
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1] # Actual port when 0 was requested
+        print(f"Shootout server listening on {self.host}:{self.port} "
+              f"({self.tick_rate} ticks/s, snapshot every {self.snapshot_interval} ticks)")
+        if ready is not None:
+            ready.set()
+        tick_task = asyncio.create_task(self.tick_loop())
+        await self.stopped.wait()
+        tick_task.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+        self.print_stats()
+
+    def start_in_thread(self):
+        """Runs the server on its own thread and event loop (localhost stand-in for testing)."""
+        ready = threading.Event()
+        self.thread = threading.Thread(target=lambda: asyncio.run(self.serve(ready)),
+                                       name="ShootoutServer", daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Stops the server; safe to call from any thread."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.stopped.set)
+        if self.thread is not None:
+            self.thread.join()
+
+    def delayed(self, callback, *args):
+        """Runs callback now, or after the simulated one-way latency."""
+        if self.latency > 0:
+            asyncio.get_running_loop().call_later(self.latency, callback, *args)
+        else:
+            callback(*args)
+
+    async def handle_client(self, reader, writer):
+        writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        role = client = None
+        try:
+            hello = await proto.read_message(reader)
+            _, role = proto.HELLO.unpack(hello)
+            if role not in proto.ROLE_NAMES or role in self.clients: # Unknown role or role taken
+                writer.write(proto.frame(bytes((proto.MSG_REJECT,))))
+                await writer.drain()
+                writer.close()
+                return
+            client = ClientConnection(role, writer)
+            self.clients[role] = client
+            self.connections.append(client)
+            writer.write(proto.frame(proto.WELCOME.pack(proto.MSG_WELCOME, role, self.tick_rate,
+                                                        self.snapshot_interval)))
+            print(f"Shootout server: {proto.ROLE_NAMES[role]} connected")
+            while True:
+                payload = await proto.read_message(reader)
+                if payload[0] == proto.MSG_INPUT:
+                    self.delayed(self.apply_input, client, proto.decode_input(payload))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if client is not None and self.clients.get(role) is client:
+                del self.clients[role]
+                if role == proto.ROLE_KEEPER:
+                    self.simulation.keeper_move = 0
+                print(f"Shootout server: {proto.ROLE_NAMES[role]} disconnected")
+            writer.close()
+
+    def apply_input(self, client, decoded):
+        seq, ack_tick, client_time, keeper_move, kick = decoded
+        now = time.perf_counter()
+        if ack_tick > client.acked_tick:
+            client.acked_tick = ack_tick
+            sent_at = client.sent_at.get(ack_tick)
+            if sent_at is not None:
+                client.rtt_samples.append((now - sent_at) * 1000.0)
+        if seq <= client.last_input_seq:
+            return
+        client.last_input_seq = seq
+        client.last_input_time = client_time
+        if client.role == proto.ROLE_KEEPER:
+            self.simulation.keeper_move = max(-1, min(1, keeper_move))
+        elif kick is not None:
+            self.simulation.kick(*kick)
+
+    async def tick_loop(self):
+        dt = 1.0 / self.tick_rate
+        next_tick = time.perf_counter()
+        while True:
+            self.tick += 1
+            self.simulation.step(dt)
+            if self.tick % self.snapshot_interval == 0:
+                self.send_snapshots()
+            next_tick += dt
+            delay = next_tick - time.perf_counter()
+            if delay < 0:
+                self.tick_overruns += 1
+                next_tick = time.perf_counter() # Don't try to catch up with a burst of ticks
+                delay = 0
+            await asyncio.sleep(delay)
+            if self.tick % (self.tick_rate * STATS_INTERVAL) == 0 and self.clients:
+                self.print_stats()
+
+    def send_snapshots(self):
+        state = proto.quantize_state(self.simulation.state())
+        tick_bytes = 0
+        now = time.perf_counter()
+        for client in list(self.clients.values()):
+            base_state = client.history.get(client.acked_tick)
+            base_tick = client.acked_tick if base_state is not None else 0
+            payload = proto.encode_snapshot(self.tick, state, base_tick, base_state or proto.EMPTY_STATE,
+                                            client.last_input_seq, client.last_input_time)
+            data = proto.frame(payload)
+            client.history[self.tick] = state
+            client.sent_at[self.tick] = now
+            while len(client.history) > proto.HISTORY_SIZE:
+                old_tick, _ = client.history.popitem(last=False)
+                client.sent_at.pop(old_tick, None)
+            client.bytes_sent += len(data)
+            client.snapshots_sent += 1
+            client.full_snapshots += base_tick == 0
+            tick_bytes += len(data)
+            self.delayed(self.write, client, data)
+        self.bytes_per_tick.append(tick_bytes)
+
+    def write(self, client, data):
+        if not client.writer.is_closing():
+            client.writer.write(data)
+
+    def stats(self):
+        ticks = len(self.bytes_per_tick)
+        return {
+            'tick': self.tick,
+            'tick_overruns': self.tick_overruns,
+            'bytes_per_snapshot_tick': sum(self.bytes_per_tick) / ticks if ticks else 0.0,
+            'clients': {
+                proto.ROLE_NAMES[client.role]: {
+                    'bytes_sent': client.bytes_sent,
+                    'snapshots_sent': client.snapshots_sent,
+                    'full_snapshots': client.full_snapshots,
+                    'bytes_per_snapshot': client.bytes_sent / client.snapshots_sent if client.snapshots_sent else 0.0,
+                    'rtt_ms': _mean(client.rtt_samples),
+                } for client in self.connections
+            },
+        }
+
+    def print_stats(self):
+        stats = self.stats()
+        print(f"Shootout server: tick {stats['tick']}, {stats['bytes_per_snapshot_tick']:.1f} bytes per snapshot tick "
+              f"(all clients), {stats['tick_overruns']} late tick(s)")
+        for name, client in stats['clients'].items():
+            print(f"  {name:<8} {client['bytes_per_snapshot']:.1f} B/snapshot "
+                  f"({client['full_snapshots']} full of {client['snapshots_sent']}), RTT {client['rtt_ms']:.1f} ms")
+
+
+def _mean(samples):
+    return sum(samples) / len(samples) if samples else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Goal Masters shootout server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=proto.DEFAULT_PORT)
+    parser.add_argument("--tick-rate", type=int, default=proto.TICK_RATE)
+    parser.add_argument("--snapshot-interval", type=int, default=proto.SNAPSHOT_INTERVAL,
+                        help="Ticks between snapshots")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Simulated one-way network delay (stand-in server for testing)")
+    args = parser.parse_args(argv)
+
+    pygame.init() # Ball and Goalkeeper use pygame vectors/images, no window is opened
+    server = ShootoutServer(args.host, args.port, args.tick_rate, args.snapshot_interval,
+                            args.rounds, args.latency_ms)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        server.print_stats()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Goal Masters - Memory soak test.
+
+Plays thousands of headless kicks through Game, starting a new Game every few
+kicks as the kiosk does each time a player goes back to the menu and presses
+Start, and samples memory as it goes: the Python memory traced by tracemalloc
+and the surfaces and sounds in the memory registry. The tracemalloc snapshot
+taken after a warm-up game is compared with the final one (top growing source
+lines), and the growth is extrapolated to a full kiosk day.
+
+Usage (from the PyGameDesoft directory):
+    python -m goal_masters.soak                          # 12 hours at one kick every 20 s
+    python -m goal_masters.soak --kicks 5000 --kicks-per-game 10 --render
+Exits with status 1 if memory is not flat.
+"""
+
+import os
+
+# Select the dummy drivers before pygame initialises
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from .headless import random_session, PLAYER_CONFIG_FILE
+from .entities.ball_sprites import get_ball_sprite_atlas
+from .memory_registry import memory_registry, MB
+
+DEFAULT_HOURS = 12.0
+DEFAULT_KICK_INTERVAL = 20.0  # Seconds between kicks on a busy kiosk (aiming, flight, celebration)
+DEFAULT_TOLERANCE_MB = 1.0    # Growth over the whole day that still counts as flat
+
+
+def take_sample(kicks, games):
+    gc.collect()
+    traced, _ = tracemalloc.get_traced_memory()
+    return {
+        'kicks': kicks,
+        'games': games,
+        'traced_bytes': traced,
+        'surfaces': memory_registry.count('surface'),
+        'sounds': memory_registry.count('sound'),
+        'surface_bytes': memory_registry.total_bytes,
+        'gc_objects': len(gc.get_objects()),
+    }
+
+
+def slope(samples, key):
+    """Least-squares growth of samples[key] per kick."""
+    xs = [s['kicks'] for s in samples]
+    ys = [s[key] for s in samples]
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def run_soak(total_kicks, kicks_per_game, player, player_config, samples=10, render=False, seed=1234):
+    """Plays `total_kicks` kicks in games of `kicks_per_game`; returns (samples, warm-up snapshot, final snapshot)."""
+    from .main import Game
+    games = max(1, -(-total_kicks // kicks_per_game))
+    sample_every = max(1, games // samples)
+    history = []
+    base_snapshot = None
+    kicks = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    for index in range(games + 1): # Game 0 is the warm-up (first-use caches, shared assets)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            game = Game(player, player_config, headless=True)
+            game.run_headless(random_session(kicks_per_game, seed + index), render=render)
+            del game
+        if index == 0:
+            if render:
+                get_ball_sprite_atlas().fill() # Bounded cache: fill it now rather than count it as growth
+            history.append(take_sample(0, 0))
+            base_snapshot = tracemalloc.take_snapshot()
+            continue
+        kicks += kicks_per_game
+        if index % sample_every == 0 or index == games:
+            history.append(take_sample(kicks, index))
+            sample = history[-1]
+            print(f"{kicks:>7} kicks {index:>5} games  traced {sample['traced_bytes'] / MB:8.2f} MB  "
+                  f"surfaces {sample['surfaces']:>4} ({sample['surface_bytes'] / MB:6.2f} MB)  "
+                  f"objects {sample['gc_objects']:>7}  [{time.perf_counter() - start:6.1f}s]")
+    final_snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return history, base_snapshot, final_snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Goal Masters memory soak test")
+    parser.add_argument("--hours", type=float, default=DEFAULT_HOURS, help="Kiosk day to simulate")
+    parser.add_argument("--kick-interval", type=float, default=DEFAULT_KICK_INTERVAL,
+                        help="Seconds between kicks on the kiosk (sets the number of kicks)")
+    parser.add_argument("--kicks", type=int, default=None, help="Number of kicks (overrides --hours)")
+    parser.add_argument("--kicks-per-game", type=int, default=10, help="Kicks before going back to the menu")
+    parser.add_argument("--samples", type=int, default=10, help="Memory samples over the run")
+    parser.add_argument("--render", action="store_true", help="Also render every frame offscreen (much slower)")
+    parser.add_argument("--player", default="Elvis", help="Character from player.json")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for the kick scripts")
+    parser.add_argument("--tolerance-mb", type=float, default=DEFAULT_TOLERANCE_MB,
+                        help="Projected growth over the day that still counts as flat")
+    parser.add_argument("--top", type=int, default=10, help="Growing source lines to list")
+    args = parser.parse_args(argv)
+
+    day_kicks = round(args.hours * 3600 / args.kick_interval)
+    total_kicks = args.kicks if args.kicks is not None else day_kicks
+    with open(PLAYER_CONFIG_FILE, "r") as f:
+        player_config = json.load(f)
+
+    print(f"Soak: {total_kicks} kicks in games of {args.kicks_per_game}"
+          f"{' (rendered)' if args.render else ''}; a {args.hours:g}-hour day is {day_kicks} kicks")
+    history, base_snapshot, final_snapshot = run_soak(total_kicks, args.kicks_per_game, args.player,
+                                                      player_config, args.samples, args.render, args.seed)
+
+    print(f"\nTop {args.top} growing source lines since the warm-up game:")
+    for stat in final_snapshot.compare_to(base_snapshot, "lineno")[:args.top]:
+        print(f"  {stat}")
+    print("\nSurfaces and sounds still alive:")
+    print(memory_registry.report(top=5))
+
+    base, last = history[0], history[-1]
+    traced_growth = slope(history, 'traced_bytes') * day_kicks
+    surface_growth = slope(history, 'surface_bytes') * day_kicks
+    print(f"\nTraced memory: {base['traced_bytes'] / MB:.2f} MB after warm-up, {last['traced_bytes'] / MB:.2f} MB "
+          f"after {last['kicks']} kicks; trend {traced_growth / MB:+.2f} MB per {args.hours:g}-hour day")
+    print(f"Surfaces: {base['surfaces']} -> {last['surfaces']} "
+          f"({base['surface_bytes'] / MB:.2f} -> {last['surface_bytes'] / MB:.2f} MB); "
+          f"trend {surface_growth / MB:+.2f} MB per day")
+    flat = (traced_growth <= args.tolerance_mb * MB and surface_growth <= args.tolerance_mb * MB
+            and last['surfaces'] <= base['surfaces'])
+    print("Memory is flat." if flat else f"Memory grows beyond {args.tolerance_mb:g} MB per day.")
+    pygame.quit()
+    return 0 if flat else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
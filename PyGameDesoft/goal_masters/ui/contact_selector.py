@@ -1,7 +1,12 @@
 import pygame
 from .. import constants
+from ..memory_registry import memory_registry
 
 class ContactSelector:
+    __slots__ = ('hud_rect', 'hud_center_x', 'hud_center_y', 'hud_radius', 'ball_actual_radius',
+                 'contact_x_offset', 'contact_z_offset', 'pointer_color', 'ball_hud_color', 'border_color',
+                 'pointer_size', 'pointer_move_increment_world', 'ball_surface', 'surface', 'surface_pointer')
+
     def __init__(self, hud_x, hud_y, hud_radius, ball_actual_radius):
         self.hud_rect = pygame.Rect(hud_x - hud_radius, hud_y - hud_radius, 2 * hud_radius, 2 * hud_radius)
         self.hud_center_x = hud_x
@@ -23,6 +28,12 @@ class ContactSelector:
         self.pointer_move_increment_world = self.ball_actual_radius / 10.0 # Move 1/10th of ball radius per key press for now
                                                                       # This needs to be tied to WASD input handling rate
 
+        # Pre-rendered widget: the magnified ball is drawn once, and the pointer is
+        # drawn over a copy of it only when its (pixel) position changes
+        self.ball_surface = None
+        self.surface = None
+        self.surface_pointer = None # Pointer position (pixels, relative to the centre) the surface shows
+
     def get_contact_offsets(self):
         """Returns the current contact point offsets (x_offset, z_offset) in world units."""
         return self.contact_x_offset, self.contact_z_offset
@@ -68,26 +79,47 @@ class ContactSelector:
             print(f"ContactSelector: Offsets X={self.contact_x_offset:.3f}, Z={self.contact_z_offset:.3f}")
         return moved
 
-    def draw(self, screen):
-        # Draw the magnified ball representation
-        pygame.draw.circle(screen, self.ball_hud_color, (self.hud_center_x, self.hud_center_y), self.hud_radius)
-        pygame.draw.circle(screen, self.border_color, (self.hud_center_x, self.hud_center_y), self.hud_radius, 2)
+    def render_ball(self):
+        margin = self.pointer_size # Room for the pointer, which can sit on the edge of the ball
+        size = 2 * (self.hud_radius + margin)
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (self.hud_radius + margin, self.hud_radius + margin)
+        pygame.draw.circle(surface, self.ball_hud_color, center, self.hud_radius)
+        pygame.draw.circle(surface, self.border_color, center, self.hud_radius, 2)
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+        return memory_registry.track(surface, "hud", "contact ball")
 
+    def draw(self, screen):
         # Calculate pointer position on the HUD
-        # Map world offsets (-radius to +radius) to HUD display (-hud_radius to +hud_radius)
-        pointer_hud_x = self.hud_center_x + (self.contact_x_offset / self.ball_actual_radius) * self.hud_radius
+        # Map world offsets (-radius to +radius) to HUD display (-hud_radius to +hud_radius),
+        # quantized to pixels: the widget only changes when the pointer moves by a pixel
+        pointer_dx = round((self.contact_x_offset / self.ball_actual_radius) * self.hud_radius)
         # For Z-offset on ball, positive Z is up. On screen, positive Y is down.
         # So a positive Z-offset should move the pointer upwards on the HUD circle.
-        pointer_hud_y = self.hud_center_y - (self.contact_z_offset / self.ball_actual_radius) * self.hud_radius
-
-        # Draw the red 'X' pointer
-        s = self.pointer_size // 2
-        pygame.draw.line(screen, self.pointer_color, 
-                         (pointer_hud_x - s, pointer_hud_y - s), 
-                         (pointer_hud_x + s, pointer_hud_y + s), 2)
-        pygame.draw.line(screen, self.pointer_color, 
-                         (pointer_hud_x - s, pointer_hud_y + s), 
-                         (pointer_hud_x + s, pointer_hud_y - s), 2)
+        pointer_dy = round(-(self.contact_z_offset / self.ball_actual_radius) * self.hud_radius)
+
+        if self.ball_surface is None:
+            self.ball_surface = self.render_ball()
+            self.surface = memory_registry.track(self.ball_surface.copy(), "hud", "contact selector")
+        margin = self.pointer_size
+        if (pointer_dx, pointer_dy) != self.surface_pointer:
+            self.surface_pointer = (pointer_dx, pointer_dy)
+            self.surface.fill((0, 0, 0, 0))
+            self.surface.blit(self.ball_surface, (0, 0))
+            pointer_x = self.hud_radius + margin + pointer_dx
+            pointer_y = self.hud_radius + margin + pointer_dy
+
+            # Draw the red 'X' pointer
+            s = self.pointer_size // 2
+            pygame.draw.line(self.surface, self.pointer_color, 
+                             (pointer_x - s, pointer_y - s), 
+                             (pointer_x + s, pointer_y + s), 2)
+            pygame.draw.line(self.surface, self.pointer_color, 
+                             (pointer_x - s, pointer_y + s), 
+                             (pointer_x + s, pointer_y - s), 2)
+        screen.blit(self.surface, (self.hud_center_x - self.hud_radius - margin,
+                                   self.hud_center_y - self.hud_radius - margin))
 
 # Example usage:
 if __name__ == '__main__':
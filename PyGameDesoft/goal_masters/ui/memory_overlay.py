@@ -0,0 +1,54 @@
+import pygame
+from .. import constants
+from ..memory_registry import memory_registry, MB
+
+OVERLAY_LINES = 6 # Owners listed under the totals
+
+class MemoryOverlay:
+    """
+    Panel with the memory registry's totals and largest owners, toggled with M.
+    The text is rendered into a cached panel only when the totals change.
+    """
+
+    def __init__(self, x, y, registry=memory_registry):
+        self.position = (x, y)
+        self.registry = registry
+        self.enabled = False
+        self.font = None
+        self.panel = None
+        self.panel_key = None # (total bytes, item count) the panel shows
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        print(f"Memory overlay {'on' if self.enabled else 'off'}")
+        if self.enabled:
+            print(self.registry.report())
+
+    def render_panel(self):
+        registry = self.registry
+        budget = registry.budget_bytes()
+        color = constants.RED if registry.total_bytes > budget else constants.WHITE
+        lines = [(f"Surfaces {registry.count('surface')}  Sounds {registry.count('sound')}  "
+                  f"{registry.total_bytes / MB:.1f} / {budget / MB:.0f} MB", color)]
+        for owner, (count, nbytes) in registry.by_owner()[:OVERLAY_LINES]:
+            lines.append((f"{owner}: {count} x, {nbytes / MB:.1f} MB", constants.WHITE))
+        texts = [self.font.render(text, True, color) for text, color in lines]
+        line_height = self.font.get_linesize()
+        width = max(text.get_width() for text in texts) + 16
+        # Not registered itself: drawing the panel must not change what it shows
+        panel = pygame.Surface((width, line_height * len(texts) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, text in enumerate(texts):
+            panel.blit(text, (8, 6 + i * line_height))
+        return panel
+
+    def draw(self, screen):
+        if not self.enabled:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font(None, 24)
+        key = (self.registry.total_bytes, len(self.registry.entries))
+        if key != self.panel_key:
+            self.panel_key = key
+            self.panel = self.render_panel()
+        screen.blit(self.panel, self.position)
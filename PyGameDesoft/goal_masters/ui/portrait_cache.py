@@ -0,0 +1,67 @@
+import os
+from collections import OrderedDict
+
+import pygame
+from .. import constants
+from ..memory_registry import memory_registry
+
+class PortraitCache:
+    """
+    LRU cache of character portraits scaled to the store cell size.
+
+    Portraits are loaded from disk and scaled the first time a visible cell asks for
+    them, at most `loads_per_frame` per frame so a page of new portraits never stalls
+    one frame; cells still waiting show a placeholder. Only `capacity` scaled portraits
+    are kept, least recently drawn first out, so memory does not grow with the catalog.
+    """
+
+    def __init__(self, size, capacity=24, loads_per_frame=2):
+        self.size = size
+        self.capacity = capacity
+        self.loads_per_frame = loads_per_frame
+        self.portraits = OrderedDict() # path -> scaled surface
+        self.loads_left = loads_per_frame
+        self.hit_count = 0
+        self.load_count = 0
+        self.eviction_count = 0
+
+        self.placeholder = pygame.Surface(size)
+        self.placeholder.fill((60, 60, 60))
+        pygame.draw.rect(self.placeholder, constants.BLACK, self.placeholder.get_rect(), 2)
+        memory_registry.track(self.placeholder, "portraits", "placeholder")
+
+    def begin_frame(self):
+        """Resets the per-frame load budget; call once per store frame."""
+        self.loads_left = self.loads_per_frame
+
+    def get(self, path):
+        """The portrait for `path`, or the placeholder if it is not loaded yet."""
+        portrait = self.portraits.get(path)
+        if portrait is not None:
+            self.hit_count += 1
+            self.portraits.move_to_end(path)
+            return portrait
+        if self.loads_left <= 0:
+            return self.placeholder
+        self.loads_left -= 1
+        portrait = self.load(path)
+        self.portraits[path] = portrait
+        if len(self.portraits) > self.capacity:
+            self.portraits.popitem(last=False)
+            self.eviction_count += 1
+        return portrait
+
+    def load(self, path):
+        self.load_count += 1
+        try:
+            image = pygame.image.load(path)
+            if pygame.display.get_surface() is not None: # convert_alpha needs a video mode
+                image = image.convert_alpha()
+            return memory_registry.track(pygame.transform.smoothscale(image, self.size), "portraits",
+                                         os.path.basename(path))
+        except Exception as e:
+            print(f"Failed to load portrait {path}: {e}")
+            return self.placeholder
+
+    def is_loaded(self, path):
+        return path in self.portraits
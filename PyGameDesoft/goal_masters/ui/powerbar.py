@@ -1,36 +1,60 @@
 import pygame
 from .. import constants
+from ..memory_registry import memory_registry
 
 class PowerBar:
+    """
+    Charge is a continuous function of time: the fraction of charge_duration elapsed
+    since the press. All methods take the timestamp of the input or frame they handle
+    (Game.input_time()), so the power depends only on when Space went down and up,
+    not on the frame rate or on how late the release event was processed.
+    """
+    __slots__ = ('rect', 'segments', 'charge_time_per_segment', 'charge_duration', 'charge_fraction',
+                 'is_charging', 'charge_start', 'full_charge_time', 'power_fraction_on_release',
+                 'border_color', 'empty_color', 'filled_color', 'border_width',
+                 'empty_bar', 'full_bar', 'surface', 'surface_fill')
+
     def __init__(self, x, y, width, height, segments=constants.POWER_BAR_SEGMENTS):
         self.rect = pygame.Rect(x, y, width, height)
         self.segments = segments
-        self.charge_level = 0  # Current number of lit segments (0 to self.segments)
-        self.is_charging = False
         self.charge_time_per_segment = 0.25  # Seconds to fill one segment
-        self.current_segment_charge_time = 0
+        self.charge_duration = self.charge_time_per_segment * segments
+        self.charge_fraction = 0.0  # Charge the bar currently shows (0 to 1)
+        self.is_charging = False
+        self.charge_start = None       # Timestamp of the press
+        self.full_charge_time = None   # Timestamp at which the bar fills (the automatic kick instant)
         self.power_fraction_on_release = 0.0
-        self.kick_at_full_power = False # Flag to indicate automatic kick at full power
 
         self.border_color = constants.BLACK
         self.empty_color = constants.WHITE
         self.filled_color = constants.RED
         self.border_width = 2
 
-    def start_charging(self):
-        if not self.is_charging and self.charge_level < self.segments:
+        # Pre-rendered widget: the empty and the full bar are drawn once, and the
+        # widget surface is recomposed from them only when the filled width changes
+        self.empty_bar = None
+        self.full_bar = None
+        self.surface = None
+        self.surface_fill = None # Filled width (pixels) the widget surface shows
+
+    def start_charging(self, now):
+        if not self.is_charging and self.charge_fraction < 1.0:
             self.is_charging = True
-            self.current_segment_charge_time = 0
+            self.charge_start = now
+            self.full_charge_time = now + self.charge_duration
             print("PowerBar: Started charging")
-        elif self.charge_level >= self.segments:
+        elif self.charge_fraction >= 1.0:
             print("PowerBar: Already fully charged")
 
-    def stop_charging(self):
+    def charge_at(self, now):
+        """Charge after holding from charge_start until `now` (linear, capped at full)."""
+        return min(1.0, max(0.0, (now - self.charge_start) / self.charge_duration))
+
+    def stop_charging(self, now):
+        """Release at timestamp `now`; the power is the charge at that instant."""
         if self.is_charging:
             self.is_charging = False
-            # Only set power fraction if not already set by reaching full charge
-            if not self.kick_at_full_power: 
-                self.power_fraction_on_release = self.charge_level / self.segments
+            self.charge_fraction = self.power_fraction_on_release = self.charge_at(now)
             print(f"PowerBar: Stopped charging. Power fraction: {self.power_fraction_on_release:.2f}")
             return True # Indicates charging was active and stopped
         return False # Indicates it wasn't charging
@@ -39,55 +63,70 @@ class PowerBar:
         """Returns the power fraction from the last charge cycle."""
         return self.power_fraction_on_release
 
+    def get_charge_fraction(self):
+        """Returns the power the bar currently shows (while charging or after release)."""
+        return self.charge_fraction
+
     def reset(self):
         """Resets the power bar for the next kick."""
-        self.charge_level = 0
+        self.charge_fraction = 0.0
         self.is_charging = False
-        self.current_segment_charge_time = 0
+        self.charge_start = None
+        self.full_charge_time = None
         self.power_fraction_on_release = 0.0
-        self.kick_at_full_power = False # Reset flag
         print("PowerBar: Reset")
 
-    def update(self, dt):
-        if self.is_charging and self.charge_level < self.segments:
-            self.current_segment_charge_time += dt
-            if self.current_segment_charge_time >= self.charge_time_per_segment:
-                self.charge_level += 1
-                self.current_segment_charge_time = 0 
-                print(f"PowerBar: Charge level {self.charge_level}/{self.segments}")
-                if self.charge_level >= self.segments:
-                    self.is_charging = False 
-                    self.power_fraction_on_release = 1.0 # Full power
-                    self.kick_at_full_power = True # Signal for automatic kick
-                    print("PowerBar: Fully charged - KICK INITIATED")
-        # If it fills up, is_charging remains true until space is released.
+    def update(self, now):
+        """Updates the displayed charge for the frame at timestamp `now`."""
+        if self.is_charging:
+            self.charge_fraction = self.charge_at(now)
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.border_color, self.rect, self.border_width)
+    def render_bar(self, filled):
+        """The bar with every segment empty or every segment filled, on a transparent surface."""
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, self.border_color, surface.get_rect(), self.border_width)
         segment_width = (self.rect.width - 2 * self.border_width) / self.segments
-        
         for i in range(self.segments):
             seg_rect = pygame.Rect(
-                self.rect.x + self.border_width + i * segment_width,
-                self.rect.y + self.border_width,
+                self.border_width + i * segment_width,
+                self.border_width,
                 segment_width - (1 if i < self.segments -1 else 0), # Small gap or no gap
                 self.rect.height - 2 * self.border_width
             )
-            
-            color = self.filled_color if i < self.charge_level else self.empty_color
-            pygame.draw.rect(screen, color, seg_rect)
+            pygame.draw.rect(surface, self.filled_color if filled else self.empty_color, seg_rect)
+        if pygame.display.get_surface():
+            surface = surface.convert_alpha()
+        return memory_registry.track(surface, "hud", f"power bar {'full' if filled else 'empty'}")
 
-    def is_fully_charged_for_kick(self):
-        """Checks if the bar is full and a kick should be triggered.
-        Resets the flag after checking to ensure one kick per full charge.
+    def draw(self, screen):
+        if self.empty_bar is None:
+            self.empty_bar = self.render_bar(False)
+            self.full_bar = self.render_bar(True)
+            self.surface = memory_registry.track(self.empty_bar.copy(), "hud", "power bar")
+        # The charge is shown to the pixel: the bar fills continuously across the segments
+        fill = round(self.charge_fraction * (self.rect.width - 2 * self.border_width))
+        if fill != self.surface_fill:
+            self.surface_fill = fill
+            self.surface.blit(self.empty_bar, (0, 0))
+            if fill > 0:
+                self.surface.blit(self.full_bar, (0, 0), (0, 0, self.border_width + fill, self.rect.height))
+        screen.blit(self.surface, self.rect)
+
+    def is_fully_charged_for_kick(self, now):
+        """Checks if the bar filled up by `now` and a kick should be triggered.
+        The kick belongs to the instant the bar filled (full_charge_time), which is
+        usually between frames. Returns True once per charge.
         """
-        if self.kick_at_full_power:
-            self.kick_at_full_power = False # Reset after check
+        if self.is_charging and now >= self.full_charge_time:
+            self.is_charging = False
+            self.charge_fraction = self.power_fraction_on_release = 1.0 # Full power
+            print("PowerBar: Fully charged - KICK INITIATED")
             return True
         return False
 
 # Example usage:
 if __name__ == '__main__':
+    import time
     pygame.init()
     # Mock constants for standalone testing if needed:
     class MockConstants:
@@ -125,11 +164,11 @@ if __name__ == '__main__':
                     running = False
                 if event.key == pygame.K_SPACE:
                     if not kick_requested: # Prevent re-charging if a kick is pending acknowledgement
-                        power_bar.start_charging()
+                        power_bar.start_charging(time.perf_counter())
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_SPACE:
-                    if power_bar.is_charging or power_bar.charge_level > 0: # Check if it was charging or has charge
-                        if power_bar.stop_charging():
+                    if power_bar.is_charging or power_bar.charge_fraction > 0: # Check if it was charging or has charge
+                        if power_bar.stop_charging(time.perf_counter()):
                             kick_power = power_bar.get_power_fraction()
                             print(f"KICK EVENT! Power: {kick_power:.2f}")
                             kick_requested = True # Simulate kick happening
@@ -142,7 +181,7 @@ if __name__ == '__main__':
             power_bar.reset()
             kick_requested = False
 
-        power_bar.update(dt)
+        power_bar.update(time.perf_counter())
         
         screen.fill((100, 100, 100)) # Background
         power_bar.draw(screen)
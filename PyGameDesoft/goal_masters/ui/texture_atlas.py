@@ -0,0 +1,67 @@
+import pygame
+from ..memory_registry import memory_registry
+
+class TextureAtlas:
+    """
+    Packs many small images into one surface with a name -> Rect index.
+
+    Images are added with add() (optionally scaled) and packed by build() into rows
+    ("shelf" packing, tallest first). The atlas is converted to the display format once,
+    so a whole screen of sprites can be drawn with a single Surface.blits() call using
+    (atlas surface, position, area) entries from blit_item().
+    """
+
+    def __init__(self, padding=1):
+        self.padding = padding
+        self.pending = {}   # name -> surface, until build()
+        self.rects = {}     # name -> Rect of the image inside the atlas
+        self.surface = None
+
+    def add(self, name, surface, size=None):
+        """Queues an image; `size` (width, height) scales it first."""
+        if size is not None and surface.get_size() != tuple(size):
+            surface = pygame.transform.smoothscale(surface, size)
+        self.pending[name] = surface
+
+    def add_file(self, name, path, size=None):
+        self.add(name, pygame.image.load(path), size)
+
+    def build(self):
+        """Packs every queued image into the atlas surface and fills the rect index."""
+        items = sorted(self.pending.items(), key=lambda item: item[1].get_height(), reverse=True)
+        pad = self.padding
+        total_area = sum((s.get_width() + pad) * (s.get_height() + pad) for _, s in items)
+        widest = max(s.get_width() + pad for _, s in items)
+        atlas_width = max(widest, int(total_area ** 0.5) + 1)
+
+        # Shelf packing: fill a row left to right, start a new row below when it is full
+        positions = {}
+        x = y = row_height = 0
+        for name, surface in items:
+            width, height = surface.get_width() + pad, surface.get_height() + pad
+            if x + width > atlas_width:
+                x, y, row_height = 0, y + row_height, 0
+            positions[name] = (x, y)
+            x += width
+            row_height = max(row_height, height)
+        atlas_height = y + row_height
+
+        atlas = pygame.Surface((atlas_width, atlas_height), pygame.SRCALPHA)
+        for name, surface in items:
+            self.rects[name] = atlas.blit(surface, positions[name])
+        if pygame.display.get_surface() is not None: # convert_alpha needs a video mode
+            atlas = atlas.convert_alpha()
+        self.surface = memory_registry.track(atlas, "atlas", f"{len(self.rects)} images")
+        self.pending = {}
+        print(f"TextureAtlas: Packed {len(self.rects)} images into {atlas_width}x{atlas_height}")
+        return self
+
+    def blit_item(self, name, position):
+        """A (surface, position, area) entry for Surface.blits()."""
+        return (self.surface, position, self.rects[name])
+
+    def size_of(self, name):
+        return self.rects[name].size
+
+    def draw(self, target, name, position):
+        target.blit(self.surface, position, self.rects[name])
@@ -0,0 +1,97 @@
+import math
+import pygame
+from .. import constants
+from ..config import config_manager
+
+# Settings the predicted path depends on; a change to any of them invalidates the cache
+PREVIEW_SETTING_KEYS = ('min_kick_strength', 'max_kick_strength', 'max_kick_curve',
+                        'ball_bounce_z_restitution', 'ball_friction_xy_retention')
+
+SAMPLE_INTERVAL = 0.04 # Seconds of flight between polyline points
+MAX_BOUNCES = 3        # Hops drawn after the first flight
+MIN_BOUNCE_VZ = 0.1    # Same threshold Ball.update() uses to stop micro-bounces
+
+class TrajectoryPreview:
+    """
+    Predicted path of the next kick, drawn as one projected polyline while aiming.
+
+    The path is evaluated in closed form instead of stepping Ball.update(): between
+    bounces the ball follows x = x0 + vx·t + ½·a·t², y = y0 + vy·t, z = z0 + vz·t − ½·g·t²,
+    and each bounce applies the configured restitution and friction. Knuckleball
+    wobble is random and is not predicted. The screen points are cached and only
+    recomputed when the ball position, aim, contact point, power level, camera or
+    one of PREVIEW_SETTING_KEYS changes.
+    """
+
+    def __init__(self, ball):
+        self.ball = ball
+        self.enabled = config_manager.get_setting('trajectory_preview_enabled', default=False)
+        self.color = constants.YELLOW
+        self.settings_version = 0
+        self.cache_key = None
+        self.screen_points = []
+        self.rebuild_count = 0
+        config_manager.subscribe(self.on_config_changed, PREVIEW_SETTING_KEYS)
+
+    def on_config_changed(self, changed_keys):
+        self.settings_version += 1
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        print(f"Trajectory preview {'enabled' if self.enabled else 'disabled'}")
+
+    def predict(self, power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset):
+        """World points (x, y, z) of the predicted path, from the ball to the goal line or where it stops."""
+        (vx, vy, vz), ax, _ = self.ball.launch_parameters(
+            power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset)
+        restitution = config_manager.get_setting('ball_bounce_z_restitution', default=0.5)
+        retention = config_manager.get_setting('ball_friction_xy_retention', default=0.5)
+        gravity = constants.GRAVITY
+        ground_z = self.ball.radius
+        x, y = self.ball.world_pos.x, self.ball.world_pos.y
+
+        points = [(x, y, ground_z)]
+        if vz <= 0:
+            # Kicked into the ground: Ball.update() bounces it on the first step
+            vz = -vz * restitution
+            vx *= retention
+            vy *= retention
+        for _ in range(MAX_BOUNCES + 1):
+            if vz < MIN_BOUNCE_VZ or vy >= 0:
+                break
+            hop_time = 2.0 * vz / gravity
+            # Stop the path where it crosses the goal line
+            time_to_line = -y / vy
+            end_time = min(hop_time, time_to_line)
+            steps = max(2, math.ceil(end_time / SAMPLE_INTERVAL))
+            for i in range(1, steps + 1):
+                t = end_time * i / steps
+                points.append((x + vx * t + 0.5 * ax * t * t,
+                               y + vy * t,
+                               ground_z + vz * t - 0.5 * gravity * t * t))
+            if time_to_line <= hop_time:
+                break
+            # Bounce: the curve acceleration acts only in the air, like in Ball.update()
+            x += vx * hop_time + 0.5 * ax * hop_time * hop_time
+            y += vy * hop_time
+            vx = (vx + ax * hop_time) * retention
+            vy *= retention
+            vz *= restitution
+        return points
+
+    def update(self, camera, power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset):
+        """Recomputes the projected polyline only if one of its inputs changed."""
+        key = (self.ball.world_pos.x, self.ball.world_pos.y, power_fraction, horizontal_aim_deg,
+               pointer_x_offset, pointer_z_offset, camera.version, self.settings_version)
+        if key == self.cache_key:
+            return
+        self.cache_key = key
+        self.rebuild_count += 1
+        world_points = self.predict(power_fraction, horizontal_aim_deg, pointer_x_offset, pointer_z_offset)
+        screen_points = [camera.world_to_screen(*point) for point in world_points]
+        # world_to_screen() returns (-9999, -9999) for points behind the camera
+        self.screen_points = [point for point in screen_points if point[0] != -9999]
+
+    def draw(self, screen):
+        if self.enabled and len(self.screen_points) >= 2:
+            pygame.draw.lines(screen, self.color, False, self.screen_points, 2)
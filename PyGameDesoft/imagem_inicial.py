@@ -5,6 +5,7 @@ import pygame.mixer
 import os
 import sys
 import json
+import atexit
 
 # Add the parent directory to the Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,6 +14,14 @@ sys.path.append(parent_dir)
 
 try:
     from goal_masters.main import Game
+    from goal_masters.player_store import PlayerDataStore, DEFAULT_PLAYER_DATA
+    from goal_masters.analytics import ShotAnalytics
+    from goal_masters.ui.texture_atlas import TextureAtlas
+    from goal_masters.ui.portrait_cache import PortraitCache
+    from goal_masters.characters import CharacterRegistry
+    from goal_masters.gc_policy import GCPolicy
+    from goal_masters.memory_registry import memory_registry
+    from goal_masters.metrics import frame_metrics, start_exporter
 except ImportError as e:
     print(f"Error importing game: {e}")
     print("Make sure you're running the script from the correct directory")
@@ -27,44 +36,39 @@ HEIGHT = 700
 window = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption('Goal Masters')
 
-# ----- Inicia estruturas de dados
-game = True
-
 # ----- File paths
 PLAYER_DATA_FILE = os.path.join(os.path.dirname(__file__), 'player_data.json')
 PLAYER_CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'player.json')
-
-# ----- Default data
-DEFAULT_PLAYER_DATA = {
-    'coins': 0,
-    'unlocked': ['Elvis'],
-    'selected': 'Elvis',
-    'total_goals': 0,
-    'total_attempts': 0
-}
-
-def load_player_data():
-    if not os.path.exists(PLAYER_DATA_FILE):
-        save_player_data(DEFAULT_PLAYER_DATA)
-        return DEFAULT_PLAYER_DATA.copy()
-    with open(PLAYER_DATA_FILE, 'r') as f:
-        return json.load(f)
-
-def save_player_data(data):
-    with open(PLAYER_DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+SHOTS_DB_FILE = os.path.join(os.path.dirname(__file__), 'shots.db')
 
 def load_player_config():
     with open(PLAYER_CONFIG_FILE, 'r') as f:
         return json.load(f)
 
 # Load data
-player_data = load_player_data()
+# O store e o banco de chutes só são abertos em main_menu(): importar este módulo
+# (ex.: o benchmark menu_frame) não mexe em player_data.json nem em shots.db
+player_store = None
+shot_analytics = None
+player_data = json.loads(json.dumps(DEFAULT_PLAYER_DATA))  # Valores padrão até o store ser aberto
 player_config = load_player_config()
 
+def open_data_files():
+    global player_store, player_data, shot_analytics
+    # O store recupera player_data.json + journal e grava cada mudança em segundo plano
+    player_store = PlayerDataStore(PLAYER_DATA_FILE)
+    atexit.register(player_store.close)  # Compacta o journal no snapshot ao sair
+    player_data = player_store.data
+    # Banco de dados com cada chute (gravado em lotes por uma thread própria)
+    shot_analytics = ShotAnalytics(SHOTS_DB_FILE)
+    atexit.register(shot_analytics.close)
+
 # ----- Inicia assets
 imagem_original = pygame.image.load(os.path.join(os.path.dirname(__file__), "imagens", "imagem inicial.png")).convert()
 image = pygame.transform.scale(imagem_original, (WIDTH, HEIGHT))
+# Registradas na contabilidade de memória (overlay M no jogo e goal_masters.soak)
+memory_registry.track(imagem_original, "menu", "imagem inicial")
+memory_registry.track(image, "menu", "imagem inicial (tela)")
 
 # ----- Inicia fonte para o texto
 font = pygame.font.SysFont("Arial", 80)  # Fonte Arial, tamanho 80
@@ -74,6 +78,34 @@ button_font = pygame.font.SysFont("Arial", 50)
 # Adicionar uma fonte menor para o contador de moedas
 coin_font = pygame.font.SysFont("Arial", 28)
 
+# ----- Grade da loja: os personagens vêm do player.json e são mostrados em páginas
+CHAR_WIDTH, CHAR_HEIGHT = 200, 250
+STORE_COLUMNS, STORE_ROWS = 4, 2
+STORE_PAGE_SIZE = STORE_COLUMNS * STORE_ROWS
+STORE_GRID_X = (WIDTH - (STORE_COLUMNS * CHAR_WIDTH + (STORE_COLUMNS - 1) * 60)) // 2
+STORE_GRID_Y = 140
+STORE_CELL_STEP = (CHAR_WIDTH + 60, CHAR_HEIGHT + 10)
+
+# Retratos carregados sob demanda só para as células visíveis (duas páginas ficam em cache)
+portrait_cache = PortraitCache((CHAR_WIDTH, CHAR_HEIGHT), capacity=STORE_PAGE_SIZE * 2)
+frame_metrics.register_cache("portraits", portrait_cache)
+
+# ----- Atlas com a arte fixa da loja e do menu (cadeado e moedas)
+# Carregado e redimensionado uma vez e desenhado junto com os retratos num único window.blits por frame
+def build_menu_atlas():
+    images_dir = os.path.join(os.path.dirname(__file__), "imagens")
+    atlas = TextureAtlas()
+    atlas.add_file("cadeado", os.path.join(images_dir, "cadeado.png"), (CHAR_WIDTH, CHAR_HEIGHT))
+    coin_image = pygame.image.load(os.path.join(images_dir, "moeda.png"))
+    atlas.add("moeda_40", coin_image, (40, 40))
+    atlas.add("moeda_50", coin_image, (50, 50))
+    return atlas.build()
+
+menu_atlas = build_menu_atlas()
+
+# ----- Coleta de lixo: os menus são sempre "ociosos", então as coletas rodam entre os frames
+gc_policy = GCPolicy()
+
 # ----- Cores
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -99,69 +131,58 @@ class Button:
         return self.rect.collidepoint(pos)
 
 # ----- Função para tela da loja
+def store_cell_rect(slot):
+    """Retângulo da célula `slot` (0 a STORE_PAGE_SIZE - 1) na página atual"""
+    column, row = slot % STORE_COLUMNS, slot // STORE_COLUMNS
+    return pygame.Rect(STORE_GRID_X + column * STORE_CELL_STEP[0], STORE_GRID_Y + row * STORE_CELL_STEP[1],
+                       CHAR_WIDTH, CHAR_HEIGHT)
+
 def store_screen():
-    global player_data, player_config
-    
-    # Carrega imagens dos jogadores
-    elvis_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "imagens", "Elvis.png")).convert_alpha()
-    neymar_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "imagens", "Neymar.png")).convert_alpha()
-    ronaldinho_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "imagens", "Ronaldinho.png")).convert_alpha()
-    roberto_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "imagens", "Roberto Carlos.png")).convert_alpha()
-    juninho_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "imagens", "Juninho Pernambucano.png")).convert_alpha()
-    cadeado_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "imagens", "cadeado.png")).convert_alpha()
-
-    # Redimensiona as imagens para caberem na tela
-    char_width, char_height = 200, 250
-    elvis_img = pygame.transform.scale(elvis_img, (char_width, char_height))
-    neymar_img = pygame.transform.scale(neymar_img, (char_width, char_height))
-    ronaldinho_img = pygame.transform.scale(ronaldinho_img, (char_width, char_height))
-    roberto_img = pygame.transform.scale(roberto_img, (char_width, char_height))
-    juninho_img = pygame.transform.scale(juninho_img, (char_width, char_height))
-    cadeado_img = pygame.transform.scale(cadeado_img, (char_width, char_height))
-
-    # Botão de voltar
-    back_button = Button(50, 50, 200, 70, "Back", (180, 180, 180))
+    global player_config
 
-    # Dados dos personagens
-    characters = [
-        {"name": "Elvis", "img": elvis_img, "pos": None},
-        {"name": "Neymar", "img": neymar_img, "pos": None},
-        {"name": "Ronaldinho", "img": ronaldinho_img, "pos": None},
-        {"name": "Roberto Carlos", "img": roberto_img, "pos": None},
-        {"name": "Juninho Pernambucano", "img": juninho_img, "pos": None},
-    ]
-
-    # Posições
-    y_top = 140
-    y_bottom = 370
-    characters[0]["pos"] = (WIDTH//2 - 250, y_top)
-    characters[1]["pos"] = (WIDTH//2 + 50, y_top)
-    characters[2]["pos"] = (WIDTH//2 - 400, y_bottom)
-    characters[3]["pos"] = (WIDTH//2 - 100, y_bottom)
-    characters[4]["pos"] = (WIDTH//2 + 200, y_bottom)
+    # Personagens lidos do player.json (só dados; os retratos são carregados ao aparecer na tela)
+    registry = CharacterRegistry(player_config)
+    page_count = registry.page_count(STORE_PAGE_SIZE)
+    page = 0
+    price_labels = {}  # preço -> texto renderizado
+
+    # Botão de voltar e de troca de página
+    back_button = Button(50, 50, 200, 70, "Back", (180, 180, 180))
+    previous_button = Button(20, HEIGHT // 2 - 35, 50, 70, "<", (180, 180, 180))
+    next_button = Button(WIDTH - 70, HEIGHT // 2 - 35, 50, 70, ">", (180, 180, 180))
 
     running = True
     while running:
+        visible = registry.page(page, STORE_PAGE_SIZE)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.MOUSEWHEEL:
+                # Roda do mouse para cima volta uma página, para baixo avança
+                page = max(0, min(page_count - 1, page - event.y))
+            elif event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_LEFT, pygame.K_PAGEUP):
+                    page = max(0, page - 1)
+                elif event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN):
+                    page = min(page_count - 1, page + 1)
+                elif event.key == pygame.K_ESCAPE:
+                    running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if back_button.is_clicked(event.pos):
                     running = False
+                elif previous_button.is_clicked(event.pos):
+                    page = max(0, page - 1)
+                elif next_button.is_clicked(event.pos):
+                    page = min(page_count - 1, page + 1)
                 else:
-                    for char in characters:
-                        rect = pygame.Rect(char["pos"][0], char["pos"][1], char_width, char_height)
-                        if rect.collidepoint(event.pos):
-                            char_name = char["name"]
+                    for slot, character in enumerate(visible):
+                        if store_cell_rect(slot).collidepoint(event.pos):
+                            char_name = character.name
                             if char_name in player_data['unlocked']:
-                                player_data['selected'] = char_name
-                                save_player_data(player_data)
-                            elif player_data['coins'] >= player_config[char_name]["price"] and player_config[char_name]["price"] > 0:
-                                player_data['coins'] -= player_config[char_name]["price"]
-                                player_data['unlocked'].append(char_name)
-                                player_data['selected'] = char_name
-                                save_player_data(player_data)
+                                player_store.select(char_name)
+                            elif player_data['coins'] >= character.price and character.price > 0:
+                                player_store.purchase(char_name, character.price)
 
         # Fundo igual ao da tela inicial
         window.fill((0, 0, 0))
@@ -171,37 +192,48 @@ def store_screen():
         store_title = title_font.render("Character Store", True, BLACK)
         window.blit(store_title, (WIDTH // 2 - store_title.get_width() // 2, 50))
 
-        # Desenha personagens
-        for char in characters:
-            char_name = char["name"]
-            window.blit(char["img"], char["pos"])
-            
-            if player_config[char_name]["price"] > 0:
-                coin_image = pygame.image.load(os.path.join(os.path.dirname(__file__), 'imagens', 'moeda.png'))
-                coin_image = pygame.transform.scale(coin_image, (40, 40))
-                price_text = coin_font.render(str(player_config[char_name]["price"]), True, (255, 255, 0))
-                window.blit(coin_image, (char["pos"][0] + 80, char["pos"][1] + 230))
-                window.blit(price_text, (char["pos"][0] + 125, char["pos"][1] + 245))
-            
+        # Desenha retratos, preços e cadeados da página com um único blits
+        portrait_cache.begin_frame()
+        sprites = []
+        for slot, character in enumerate(visible):
+            char_name = character.name
+            x, y = store_cell_rect(slot).topleft
+            sprites.append((portrait_cache.get(character.portrait_path), (x, y)))
+
+            if character.price > 0:
+                price_text = price_labels.get(character.price)
+                if price_text is None:
+                    price_text = price_labels[character.price] = coin_font.render(str(character.price), True, (255, 255, 0))
+                sprites.append(menu_atlas.blit_item("moeda_40", (x + 80, y + 210)))
+                sprites.append((price_text, (x + 125, y + 220)))
+
             # Cadeado se não desbloqueado
             if char_name not in player_data['unlocked']:
-                window.blit(cadeado_img, char["pos"])
-            
-            # Destaque se selecionado
-            if char_name == player_data['selected']:
-                pygame.draw.rect(window, (255, 215, 0), (char["pos"][0], char["pos"][1], char_width, char_height), 5)
+                sprites.append(menu_atlas.blit_item("cadeado", (x, y)))
+        sprites.append(menu_atlas.blit_item("moeda_50", (10, 10)))
+        window.blits(sprites, doreturn=False)
+
+        # Destaque se selecionado
+        for slot, character in enumerate(visible):
+            if character.name == player_data['selected']:
+                pygame.draw.rect(window, (255, 215, 0), store_cell_rect(slot), 5)
+
+        # Página atual e botões de página
+        if page_count > 1:
+            previous_button.draw(window)
+            next_button.draw(window)
+            page_text = coin_font.render(f"{page + 1}/{page_count}", True, BLACK)
+            window.blit(page_text, (WIDTH - page_text.get_width() - 30, 60))
 
         # Botão de voltar
         back_button.draw(window)
 
         # Exibe moedas do jogador
-        coin_image = pygame.image.load(os.path.join(os.path.dirname(__file__), 'imagens', 'moeda.png'))
-        coin_image = pygame.transform.scale(coin_image, (50, 50))
-        window.blit(coin_image, (10, 10))
         coin_text = coin_font.render(str(player_data['coins']), True, (255, 255, 0))
         window.blit(coin_text, (65, 35))
 
         pygame.display.update()
+        gc_policy.end_frame(idle=True)
 
 # ----- Cria os botões
 start_button = Button(WIDTH//2 - 200, HEIGHT//2, 400, 100, "Start", GREEN)
@@ -271,58 +303,65 @@ def music_menu():
         music3_button.draw(window)
         back_button.draw(window)
         pygame.display.update()
+        gc_policy.end_frame(idle=True)
 
-# ===== Loop principal =====
-while game:
-    # ----- Trata eventos
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            game = False
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if store_button.is_clicked(event.pos):
-                store_screen()
-                # Reload player data in case it was updated in store
-                player_data = load_player_data()
-            elif start_button.is_clicked(event.pos):
-                try:
-                    # Initialize and run the game with selected player
-                    game_instance = Game()
-                    result = game_instance.run_with_player(player_data['selected'], player_config)
-                    
-                    # Update player data based on game result
-                    if result:
-                        player_data['coins'] += result.get('coins_earned', 0)
-                        player_data['total_goals'] += result.get('goals', 0)
-                        player_data['total_attempts'] += result.get('attempts', 0)
-                        save_player_data(player_data)
-                        
-                except Exception as e:
-                    print(f"Error starting game: {e}")
-            elif music_options_button.is_clicked(event.pos):
-                music_menu()
-
-    # ----- Gera saídas
-    window.fill((0, 0, 0))  # Preenche com a cor preta
-    window.blit(image, (10, 10))  # Exibe a imagem
+# ----- Função que desenha um frame do menu principal
+def draw_main_menu(surface):
+    surface.fill((0, 0, 0))  # Preenche com a cor preta
+    surface.blit(image, (10, 10))  # Exibe a imagem
 
     # ----- Exibe o texto na tela
     title_text = title_font.render("Let's play Goal Masters!", True, BLACK)
-    window.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 50))
+    surface.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 50))
 
     # ----- Desenha os botões
-    start_button.draw(window)
-    store_button.draw(window)
-    music_options_button.draw(window)
+    start_button.draw(surface)
+    store_button.draw(surface)
+    music_options_button.draw(surface)
 
     # ----- Desenhar a moeda e o contador de moedas
-    coin_image = pygame.image.load(os.path.join(os.path.dirname(__file__), 'imagens', 'moeda.png'))
-    coin_image = pygame.transform.scale(coin_image, (50, 50))
-    window.blit(coin_image, (10, 10))
+    menu_atlas.draw(surface, "moeda_50", (10, 10))
     coin_text = coin_font.render(str(player_data['coins']), True, (255, 255, 0))
-    window.blit(coin_text, (65, 35))
-
-    # ----- Atualiza estado do jogo
-    pygame.display.update()  # Mostra o novo frame para o jogador
+    surface.blit(coin_text, (65, 35))
 
-# ===== Finalização =====
-pygame.quit()
\ No newline at end of file
+# ===== Loop principal =====
+def main_menu():
+    open_data_files()
+    start_exporter()  # Métricas do gabinete para o painel da frota (http://127.0.0.1:<metrics_port>/metrics)
+    gc_policy.start()  # Assets do menu carregados: congela e passa a coletar só entre os frames
+    game = True
+    while game:
+        # ----- Trata eventos
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                game = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if store_button.is_clicked(event.pos):
+                    store_screen()
+                elif start_button.is_clicked(event.pos):
+                    try:
+                        # Initialize and run the game with selected player
+                        # Goals, coins and attempts are journaled by the store during the session
+                        game_instance = Game(player_store=player_store, analytics=shot_analytics)
+                        game_instance.run_with_player(player_data['selected'], player_config)
+
+                    except Exception as e:
+                        print(f"Error starting game: {e}")
+                elif music_options_button.is_clicked(event.pos):
+                    music_menu()
+
+        # ----- Gera saídas
+        draw_main_menu(window)
+
+        # ----- Atualiza estado do jogo
+        pygame.display.update()  # Mostra o novo frame para o jogador
+        gc_policy.end_frame(idle=True)
+
+    # ===== Finalização =====
+    gc_policy.stop()
+    player_store.close()
+    shot_analytics.close()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main_menu()
@@ -18,4 +18,5 @@ if __name__ == "__main__":
     except ImportError as e:
         print(f"Error importing menu system: {e}")
         print("Make sure you're running this script from the PyGameDesoft directory")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
+    imagem_inicial.main_menu()